@@ -0,0 +1,54 @@
+import argparse
+import sys
+from pathlib import Path
+from benchmarks.corpus import CORPUS_KINDS, DEFAULT_SEED, build_corpus, parse_size
+from benchmarks.runner import MODES, build_report, compare_results, load_report, run_benchmarks, save_report
+
+
+def _print_result(result):
+    print(f"{result['corpus']:>10} {result['size']:>10} {result['algorithm']:>4} {result['mode']:>5} "
+          f"{result['operation']:>10}: {result['throughput_mbps']:8.2f} MB/s "
+          f"ratio {result['compression_ratio']:6.2f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the compression algorithms on a reproducible corpus")
+    parser.add_argument('--sizes', default='16K,256K', help="Comma separated corpus sizes, e.g. 64K,1M,1G")
+    parser.add_argument('--kinds', default=','.join(CORPUS_KINDS), help="Comma separated corpus kinds")
+    parser.add_argument('--algorithms', default=None, help="Comma separated algorithms (default: all)")
+    parser.add_argument('--modes', default=','.join(MODES), help="Comma separated modes")
+    parser.add_argument('--repeat', type=int, default=1, help="Timed repetitions per case (best is kept)")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="Corpus seed")
+    parser.add_argument('--corpus-dir', default='.bench-corpus', help="Directory for generated corpus files")
+    parser.add_argument('--output', default=None, help="Write the JSON report to this file")
+    parser.add_argument('--baseline', default=None, help="Compare against a saved JSON report")
+    parser.add_argument('--threshold', type=float, default=10.0, help="Allowed regression in percent")
+    parser.add_argument('--no-tracemalloc', action='store_true', help="Skip the tracemalloc measurement pass")
+    parser.add_argument('--no-isolate', action='store_true', help="Run all cases in this process")
+    args = parser.parse_args()
+
+    sizes = [parse_size(size) for size in args.sizes.split(',')]
+    kinds = args.kinds.split(',')
+    algorithms = args.algorithms.split(',') if args.algorithms else None
+
+    corpus = build_corpus(Path(args.corpus_dir), kinds, sizes, args.seed)
+    results = run_benchmarks(corpus, algorithms, args.modes.split(','), args.repeat,
+                             not args.no_tracemalloc, not args.no_isolate, _print_result)
+    report = build_report(results, args.seed)
+
+    if args.output:
+        save_report(report, Path(args.output))
+        print(f"Report written to {args.output}")
+
+    if args.baseline:
+        regressions = compare_results(report, load_report(Path(args.baseline)), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.1f}%:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("No regressions against baseline.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+import random
+import zlib
+from pathlib import Path
+
+CORPUS_KINDS = ('text', 'logs', 'runs', 'random', 'compressed')
+DEFAULT_SEED = 1234
+
+_UNITS = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+_WORDS = ('the', 'quick', 'brown', 'fox', 'jumps', 'over', 'lazy', 'dog', 'file', 'compressor',
+          'data', 'stream', 'block', 'dictionary', 'phrase', 'encoding', 'run', 'length', 'byte',
+          'progress', 'tracker', 'handler', 'engine', 'archive', 'value', 'result', 'error')
+_LEVELS = ('INFO', 'INFO', 'INFO', 'DEBUG', 'WARNING', 'ERROR')
+_GENERATION_CHUNK = 64 * 1024
+
+
+def parse_size(value: str):
+    value = value.strip().upper().rstrip('B')
+    if value and value[-1] in _UNITS:
+        return int(float(value[:-1]) * _UNITS[value[-1]])
+    return int(value)
+
+
+def format_size(size):
+    for unit in ('G', 'M', 'K'):
+        if size >= _UNITS[unit] and size % _UNITS[unit] == 0:
+            return f"{size // _UNITS[unit]}{unit}"
+    return str(size)
+
+
+def _text_chunk(rng: random.Random, size):
+    words = []
+    length = 0
+    while length <= size:
+        word = rng.choice(_WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return ' '.join(words).encode('ascii')
+
+
+def _logs_chunk(rng: random.Random, size, state):
+    lines = []
+    length = 0
+    while length < size:
+        state['timestamp'] += rng.randint(0, 2000)
+        seconds, millis = divmod(state['timestamp'], 1000)
+        line = (f"2024-01-01T{seconds // 3600 % 24:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}.{millis:03d} "
+                f"{rng.choice(_LEVELS)} worker-{rng.randint(1, 8)} request={rng.randint(1000, 99999)} "
+                f"{rng.choice(_WORDS)} {rng.choice(_WORDS)} took {rng.randint(1, 500)}ms\n")
+        lines.append(line)
+        length += len(line)
+    return ''.join(lines).encode('ascii')
+
+
+def _runs_chunk(rng: random.Random, size):
+    chunk = bytearray()
+    while len(chunk) < size:
+        chunk.extend(bytes([rng.randint(0, 255)]) * rng.choice((1, 2, 4, 16, 64, 200, 1000)))
+    return bytes(chunk)
+
+
+def _compressed_chunk(rng: random.Random, size):
+    chunk = bytearray()
+    while len(chunk) < size:
+        chunk.extend(zlib.compress(_text_chunk(rng, size), 9))
+    return bytes(chunk)
+
+
+def generate(kind, size, output_file: Path, seed=DEFAULT_SEED):
+    if kind not in CORPUS_KINDS:
+        raise ValueError(f"Unknown corpus kind: {kind}")
+
+    rng = random.Random(f"{seed}:{kind}")
+    state = {'timestamp': 0}
+    written = 0
+    with open(output_file, 'wb') as f:
+        while written < size:
+            length = min(_GENERATION_CHUNK, size - written)
+            if kind == 'text':
+                chunk = _text_chunk(rng, length)
+            elif kind == 'logs':
+                chunk = _logs_chunk(rng, length, state)
+            elif kind == 'runs':
+                chunk = _runs_chunk(rng, length)
+            elif kind == 'random':
+                chunk = rng.randbytes(length)
+            else:
+                chunk = _compressed_chunk(rng, length)
+            f.write(chunk[:length])
+            written += length
+    return output_file
+
+
+def build_corpus(directory: Path, kinds=CORPUS_KINDS, sizes=(16 * 1024,), seed=DEFAULT_SEED):
+    directory.mkdir(parents=True, exist_ok=True)
+    files = []
+    for kind in kinds:
+        for size in sizes:
+            path = directory / f"{kind}-{format_size(size)}-{seed}.bin"
+            if not path.exists() or path.stat().st_size != size:
+                generate(kind, size, path, seed)
+            files.append((kind, size, path))
+    return files
@@ -0,0 +1,166 @@
+import asyncio
+import filecmp
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from core.async_engine import compress_async, decompress_async
+from core.compression_engine import CompressionEngine
+
+MODES = ('file', 'block')
+OPERATIONS = ('compress', 'decompress')
+REPORT_VERSION = 1
+
+
+def _peak_rss():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _run_operation(algorithm, mode, operation, input_file: Path, output_file: Path):
+    if mode == 'file':
+        compressor = CompressionEngine().get_compressor(input_file, algorithm)
+        if operation == 'compress':
+            compressor.compress(input_file, output_file, None)
+        else:
+            compressor.decompress(input_file, output_file, None)
+    elif mode == 'block':
+        if operation == 'compress':
+            asyncio.run(compress_async(input_file, output_file, algorithm))
+        else:
+            asyncio.run(decompress_async(input_file, output_file))
+    else:
+        raise ValueError(f"Unknown benchmark mode: {mode}")
+
+
+def _timed(function, *args, repeat=1):
+    best = float('inf')
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+
+def _traced_peak(function, *args):
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_case(algorithm, mode, corpus_file: Path, repeat=1, trace_memory=True):
+    original_size = corpus_file.stat().st_size
+    results = []
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        compressed_file = Path(work_dir) / 'compressed'
+        restored_file = Path(work_dir) / 'restored'
+        paths = {
+            'compress': (corpus_file, compressed_file),
+            'decompress': (compressed_file, restored_file)
+        }
+
+        for operation in OPERATIONS:
+            input_file, output_file = paths[operation]
+            seconds = _timed(_run_operation, algorithm, mode, operation, input_file, output_file, repeat=repeat)
+            peak_traced = _traced_peak(_run_operation, algorithm, mode, operation,
+                                       input_file, output_file) if trace_memory else None
+            results.append({
+                'algorithm': algorithm,
+                'mode': mode,
+                'operation': operation,
+                'seconds': seconds,
+                'throughput_mbps': (original_size / (1024 * 1024)) / seconds if seconds > 0 else 0.0,
+                'peak_tracemalloc': peak_traced
+            })
+
+        compressed_size = compressed_file.stat().st_size
+        if not filecmp.cmp(corpus_file, restored_file, shallow=False):
+            raise ValueError(f"Roundtrip mismatch for {algorithm}/{mode} on {corpus_file.name}")
+
+    peak_rss = _peak_rss()
+    for result in results:
+        result['original_size'] = original_size
+        result['compressed_size'] = compressed_size
+        result['compression_ratio'] = max(0, (1 - compressed_size / original_size) * 100) if original_size else 0
+        result['peak_rss'] = peak_rss
+    return results
+
+
+def _run_isolated(*args):
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        return executor.submit(run_case, *args).result()
+
+
+def run_benchmarks(corpus, algorithms=None, modes=MODES, repeat=1, trace_memory=True, isolate=True, log=None):
+    algorithms = algorithms or CompressionEngine().available_algorithms
+    results = []
+    for kind, size, path in corpus:
+        for algorithm in algorithms:
+            for mode in modes:
+                case = _run_isolated if isolate else run_case
+                for result in case(algorithm, mode, path, repeat, trace_memory):
+                    result['corpus'] = kind
+                    result['size'] = size
+                    results.append(result)
+                    if log:
+                        log(result)
+    return results
+
+
+def build_report(results, seed):
+    return {
+        'version': REPORT_VERSION,
+        'seed': seed,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.time(),
+        'results': results
+    }
+
+
+def case_key(result):
+    return result['corpus'], result['size'], result['algorithm'], result['mode'], result['operation']
+
+
+def compare_results(current: dict, baseline: dict, threshold=10.0):
+    limit = threshold / 100
+    baseline_cases = {case_key(result): result for result in baseline.get('results', [])}
+    regressions = []
+
+    for result in current.get('results', []):
+        base = baseline_cases.get(case_key(result))
+        if base is None:
+            continue
+        name = '/'.join(str(part) for part in case_key(result))
+
+        if base['throughput_mbps'] > 0 and result['throughput_mbps'] < base['throughput_mbps'] * (1 - limit):
+            regressions.append(f"{name}: throughput {result['throughput_mbps']:.2f} MB/s "
+                               f"vs baseline {base['throughput_mbps']:.2f} MB/s")
+        if base['compressed_size'] > 0 and result['compressed_size'] > base['compressed_size'] * (1 + limit):
+            regressions.append(f"{name}: compressed size {result['compressed_size']} "
+                               f"vs baseline {base['compressed_size']}")
+        if (result.get('peak_tracemalloc') is not None and base.get('peak_tracemalloc')
+                and result['peak_tracemalloc'] > base['peak_tracemalloc'] * (1 + limit)):
+            regressions.append(f"{name}: peak memory {result['peak_tracemalloc']} B "
+                               f"vs baseline {base['peak_tracemalloc']} B")
+    return regressions
+
+
+def save_report(report: dict, output_file: Path):
+    output_file.write_text(json.dumps(report, indent=2))
+
+
+def load_report(report_file: Path):
+    return json.loads(report_file.read_text())
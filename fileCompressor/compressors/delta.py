@@ -0,0 +1,272 @@
+import mmap
+import struct
+import time
+import zlib
+from pathlib import Path
+from core.interfaces.compressor import BaseCompressor
+from utils.file_handler import FileHandler
+
+MAGIC = b'FCDT'
+VERSION = 1
+
+_HEADER = struct.Struct('>4sBB')
+_REFERENCE = struct.Struct('>QIQ')
+_COPY = struct.Struct('>QQ')
+_LITERALS = struct.Struct('>II')
+_INSERT = struct.Struct('>I')
+_TRAILER = struct.Struct('>I')
+
+OP_COPY = b'C'
+OP_INSERT = b'I'
+OP_LITERALS = b'L'
+OP_END = b'E'
+
+_BASE = 257
+_MASK = 0xFFFFFFFF
+_COMPARE_SIZE = 4096
+
+
+def _window_hash(data, start, length):
+    value = 0
+    for byte in data[start:start + length]:
+        value = (value * _BASE + byte) & _MASK
+    return value
+
+
+def _map_file(file_path: Path):
+    with open(file_path, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def is_delta_stream(file_path: Path):
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class DeltaCompressor(BaseCompressor):
+    def __init__(self, reference_file: Path, codec_factory, algorithm='lzw', block_size=64,
+                 literal_block_size=64 * 1024):
+        if block_size <= 0 or literal_block_size <= 0:
+            raise ValueError("Block sizes must be positive")
+        self.reference_file = Path(reference_file)
+        self.algorithm = algorithm
+        self.block_size = block_size
+        self.literal_block_size = literal_block_size
+        self._codec_factory = codec_factory
+        self.stats = {
+            'original_size': 0,
+            'compressed_size': 0,
+            'compression_ratio': 0,
+            'time_taken': 0
+        }
+
+    def _index_reference(self, reference):
+        index = {}
+        block_size = self.block_size
+        for offset in range(0, len(reference) - block_size + 1, block_size):
+            index.setdefault(_window_hash(reference, offset, block_size), offset)
+        return index
+
+    def _match_length(self, data, position, reference, offset):
+        length = 0
+        limit = min(len(data) - position, len(reference) - offset)
+        while length < limit:
+            step = min(_COMPARE_SIZE, limit - length)
+            if data[position + length:position + length + step] == reference[offset + length:offset + length + step]:
+                length += step
+                continue
+            while data[position + length] == reference[offset + length]:
+                length += 1
+            break
+        return length
+
+    def _encode(self, data, reference, emit_copy, emit_literals, tracker):
+        block_size = self.block_size
+        index = self._index_reference(reference)
+        power = pow(_BASE, block_size - 1, 1 << 32)
+        size = len(data)
+        literal_start = 0
+        position = 0
+        window = _window_hash(data, 0, block_size) if size >= block_size else None
+
+        while window is not None:
+            offset = index.get(window)
+            if offset is not None and data[position:position + block_size] == reference[offset:offset + block_size]:
+                while position > literal_start and offset > 0 and data[position - 1] == reference[offset - 1]:
+                    position -= 1
+                    offset -= 1
+                length = self._match_length(data, position, reference, offset)
+                if position > literal_start:
+                    emit_literals(data[literal_start:position])
+                emit_copy(offset, length)
+                position += length
+                literal_start = position
+                window = _window_hash(data, position, block_size) if position + block_size <= size else None
+                if tracker:
+                    tracker.update(position)
+                continue
+
+            if position + block_size >= size:
+                break
+            window = ((window - data[position] * power) * _BASE + data[position + block_size]) & _MASK
+            position += 1
+            if tracker and not position & 0xFFFF:
+                tracker.update(position)
+
+        if literal_start < size:
+            emit_literals(data[literal_start:size])
+
+    def compress(self, input_file: Path, output_file: Path, tracker):
+        start_time = time.time()
+        codec = self._codec_factory(self.algorithm)
+        reference = _map_file(self.reference_file)
+        data = _map_file(input_file)
+
+        try:
+            with FileHandler() as fh_out:
+                fh_out.open_file(output_file, 'wb')
+                name = self.algorithm.encode('ascii')
+                fh_out.write_chunk(_HEADER.pack(MAGIC, VERSION, len(name)) + name)
+                fh_out.write_chunk(_REFERENCE.pack(len(reference), zlib.crc32(reference), len(data)))
+
+                pending_ops = []
+                literals = bytearray()
+                counters = {'copied_size': 0, 'inserted_size': 0}
+
+                def flush():
+                    if literals:
+                        compressed = codec.compress_data(bytes(literals))
+                        fh_out.write_chunk(OP_LITERALS + _LITERALS.pack(len(literals), len(compressed)) + compressed)
+                        literals.clear()
+                    if pending_ops:
+                        fh_out.write_chunk(b''.join(pending_ops))
+                        pending_ops.clear()
+
+                def emit_copy(offset, length):
+                    pending_ops.append(OP_COPY + _COPY.pack(offset, length))
+                    counters['copied_size'] += length
+
+                def emit_literals(chunk):
+                    literals.extend(chunk)
+                    pending_ops.append(OP_INSERT + _INSERT.pack(len(chunk)))
+                    counters['inserted_size'] += len(chunk)
+                    if len(literals) >= self.literal_block_size:
+                        flush()
+
+                self._encode(data, reference, emit_copy, emit_literals, tracker)
+                flush()
+                fh_out.write_chunk(OP_END + _TRAILER.pack(zlib.crc32(data)))
+        finally:
+            for mapping in (reference, data):
+                if isinstance(mapping, mmap.mmap):
+                    mapping.close()
+
+        original_size = input_file.stat().st_size
+        compressed_size = output_file.stat().st_size
+        compression_ratio = max(0, (1 - (compressed_size / original_size)) * 100) if original_size > 0 else 0
+        self.stats = {
+            'original_size': original_size,
+            'compressed_size': compressed_size,
+            'compression_ratio': compression_ratio,
+            'copied_size': counters['copied_size'],
+            'inserted_size': counters['inserted_size'],
+            'time_taken': time.time() - start_time
+        }
+        return self.stats
+
+    def decompress(self, input_file: Path, output_file: Path, tracker):
+        start_time = time.time()
+        reference = _map_file(self.reference_file)
+        decompressed_size = 0
+
+        try:
+            with FileHandler() as fh, FileHandler() as fh_out:
+                fh.open_file(input_file, 'rb')
+                fh_out.open_file(output_file, 'wb')
+
+                def read_exact(size):
+                    chunk = fh.read_chunk(size)
+                    if len(chunk) != size:
+                        raise ValueError("Invalid delta stream: unexpected end of data")
+                    return chunk
+
+                magic, version, name_length = _HEADER.unpack(read_exact(_HEADER.size))
+                if magic != MAGIC:
+                    raise ValueError("Invalid delta stream: bad magic")
+                if version != VERSION:
+                    raise ValueError(f"Unsupported delta stream version: {version}")
+                codec = self._codec_factory(read_exact(name_length).decode('ascii'))
+
+                reference_size, reference_crc, output_size = _REFERENCE.unpack(read_exact(_REFERENCE.size))
+                if reference_size != len(reference) or reference_crc != zlib.crc32(reference):
+                    raise ValueError("Reference file does not match the one used for compression")
+
+                literals = b''
+                literal_position = 0
+                checksum = 0
+                bytes_processed = _HEADER.size + name_length + _REFERENCE.size
+
+                while True:
+                    op = read_exact(1)
+                    if op == OP_END:
+                        expected_crc = _TRAILER.unpack(read_exact(_TRAILER.size))[0]
+                        break
+
+                    if op == OP_LITERALS:
+                        raw_length, compressed_length = _LITERALS.unpack(read_exact(_LITERALS.size))
+                        literals = codec.decompress_data(read_exact(compressed_length))
+                        if len(literals) != raw_length:
+                            raise ValueError("Invalid delta stream: literal block size mismatch")
+                        literal_position = 0
+                        bytes_processed += 1 + _LITERALS.size + compressed_length
+                        continue
+
+                    if op == OP_COPY:
+                        offset, length = _COPY.unpack(read_exact(_COPY.size))
+                        if offset + length > len(reference):
+                            raise ValueError("Invalid delta stream: copy outside reference")
+                        for start in range(offset, offset + length, fh_out.chunk_size * 8):
+                            chunk = reference[start:min(start + fh_out.chunk_size * 8, offset + length)]
+                            fh_out.write_chunk(chunk)
+                            checksum = zlib.crc32(chunk, checksum)
+                        bytes_processed += 1 + _COPY.size
+                    elif op == OP_INSERT:
+                        length = _INSERT.unpack(read_exact(_INSERT.size))[0]
+                        if literal_position + length > len(literals):
+                            raise ValueError("Invalid delta stream: insert past literal block")
+                        chunk = literals[literal_position:literal_position + length]
+                        literal_position += length
+                        fh_out.write_chunk(chunk)
+                        checksum = zlib.crc32(chunk, checksum)
+                        bytes_processed += 1 + _INSERT.size
+                    else:
+                        raise ValueError(f"Invalid delta stream: unknown op {op!r}")
+
+                    decompressed_size += length
+                    if tracker:
+                        tracker.update(min(bytes_processed, tracker.stats.total_bytes))
+        finally:
+            if isinstance(reference, mmap.mmap):
+                reference.close()
+
+        if decompressed_size != output_size or checksum != expected_crc:
+            raise ValueError("Delta output does not match the recorded size and checksum")
+
+        original_size = input_file.stat().st_size
+        compression_ratio = max(0, (1 - (original_size / decompressed_size)) * 100) if decompressed_size > 0 else 0
+        self.stats = {
+            'original_size': original_size,
+            'compressed_size': original_size,
+            'decompressed_size': decompressed_size,
+            'compression_ratio': compression_ratio,
+            'time_taken': time.time() - start_time
+        }
+        return self.stats
+
+    def get_compression_stats(self):
+        return self.stats.copy()
@@ -1,13 +1,79 @@
+import io
+import struct
 import time
+import zlib
 from pathlib import Path
 from core.interfaces.compressor import BaseCompressor
-from utils.bit_handler import BitHandler
-from utils.progress_tracker import ProgressTracker
+from utils.progress_tracker import OperationCancelled
 from utils.file_handler import FileHandler
+from utils.io_tuning import DEFAULT_CHUNK_SIZE
+from utils.memory_budget import MemoryBudget
+from compressors.lzw_dictionary import STREAM_MAGIC, find_dictionary
+
+
+_DICTIONARY_HEADER_SIZE = len(STREAM_MAGIC) + 9
+# Framed streams: magic and version, then frames of a code count and 16-bit codes.
+# An empty frame ends the stream and is followed by the 64-bit decoded length and the CRC32 of the input.
+FRAMED_MAGIC = b'LZWF'
+FRAMED_VERSION = 1
+_FRAME = struct.Struct('>I')
+_TRAILER = struct.Struct('>QI')
+_DATA_CHUNK_SIZE = 64 * 1024
+
+
+class _Reader:
+    def __init__(self, read):
+        self._read = read
+        self.bytes_read = 0
+
+    def read(self, size):
+        data = self._read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def take(self, size, what):
+        data = self.read(size)
+        if len(data) < size:
+            raise ValueError(f"truncated {what}")
+        return data
+
+
+class _BoundedTable:
+    # Phrases past the byte budget are kept as (prefix code, last byte) and rebuilt from their nearest cached ancestor.
+    def __init__(self, entries, max_bytes):
+        self.entries = entries
+        self.prefixes = [-1] * len(entries)
+        self.lasts = bytearray(len(entries))
+        self.cached_bytes = sum(map(len, entries))
+        self.max_bytes = max_bytes
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, code):
+        entry = self.entries[code]
+        if entry is not None:
+            return entry
+        suffix = bytearray()
+        while entry is None:
+            suffix.append(self.lasts[code])
+            code = self.prefixes[code]
+            entry = self.entries[code]
+        suffix.reverse()
+        return entry + suffix
+
+    def append(self, prefix_code, prefix, byte):
+        if self.cached_bytes + len(prefix) + 1 <= self.max_bytes:
+            self.entries.append(prefix + bytes((byte,)))
+            self.cached_bytes += len(prefix) + 1
+        else:
+            self.entries.append(None)
+        self.prefixes.append(prefix_code)
+        self.lasts.append(byte)
 
 
 class LZWCompressor(BaseCompressor):
-    def __init__(self):
+    def __init__(self, dictionary=None):
         self.stats = {
             'original_size': 0,
             'compressed_size': 0,
@@ -16,12 +82,242 @@ class LZWCompressor(BaseCompressor):
             'time_taken': 0
         }
         self.max_dict_size = 65536  # 16-bit codes
+        self.dictionary = dictionary
+        self.instrumentation = None
+        # Caps the decoder's phrase table; the 16-bit code space is part of the format and stays fixed.
+        self.max_memory = None
 
     def _initialize_dictionary(self):
-        return {bytes([i]): i for i in range(256)}
+        # Single bytes are implicit (code == byte value); longer phrases are keyed by (prefix_code << 8) | byte.
+        if self.dictionary is not None:
+            return dict(self.dictionary.encoder_table())
+        return {}
+
+    def _initialize_reverse_dictionary(self, dictionary=None):
+        if dictionary is not None:
+            return list(dictionary.decoder_table())
+        return [bytes([i]) for i in range(256)]
+
+    def _first_code(self):
+        return 256 + (len(self.dictionary) if self.dictionary is not None else 0)
+
+    def _dictionary_header(self):
+        if self.dictionary is None:
+            return b''
+        return STREAM_MAGIC + bytes([1]) + bytes.fromhex(self.dictionary.dictionary_id)
+
+    def _has_dictionary_header(self, prefix: bytes, total_size):
+        if prefix[:len(STREAM_MAGIC)] != STREAM_MAGIC:
+            return False
+        # A plain stream starting with the same bytes would need exactly 4 + 2 * count bytes.
+        return total_size != 4 + 2 * int.from_bytes(STREAM_MAGIC, 'big')
+
+    def _resolve_dictionary(self, header: bytes):
+        if header[len(STREAM_MAGIC)] != 1:
+            raise ValueError(f"Unsupported dictionary header version: {header[len(STREAM_MAGIC)]}")
+        dictionary_id = header[len(STREAM_MAGIC) + 1:_DICTIONARY_HEADER_SIZE].hex()
+        if self.dictionary is not None and self.dictionary.dictionary_id == dictionary_id:
+            return self.dictionary
+        return find_dictionary(dictionary_id)
+
+    def _encode(self, data, dictionary, next_code, code, codes):
+        max_dict_size = self.max_dict_size
+        emit = codes.append
+        for byte in data:
+            if code < 0:
+                code = byte
+                continue
+            key = (code << 8) | byte
+            found = dictionary.get(key)
+            if found is not None:
+                code = found
+            else:
+                emit(code)
+                if next_code < max_dict_size:
+                    dictionary[key] = next_code
+                    next_code += 1
+                code = byte
+        return next_code, code
+
+    def _decode(self, codes, table, previous, output):
+        max_dict_size = self.max_dict_size
+        for code in codes:
+            if code < len(table):
+                entry = table[code]
+            elif code == len(table) and previous is not None:
+                entry = previous + previous[:1]
+            else:
+                raise ValueError(f"Invalid code: {code}")
+
+            output += entry
+            if previous is not None and len(table) < max_dict_size:
+                table.append(previous + entry[:1])
+            previous = entry
+        return previous
+
+    def _reverse_table(self, dictionary=None):
+        table = self._initialize_reverse_dictionary(dictionary)
+        if self.max_memory is None:
+            return table
+        return _BoundedTable(table, MemoryBudget(self.max_memory).lzw_table_bytes())
+
+    def _decode_bounded(self, codes, table, previous, output):
+        max_dict_size = self.max_dict_size
+        previous_code, previous_entry = previous or (None, None)
+        for code in codes:
+            if code < len(table):
+                entry = table.get(code)
+            elif code == len(table) and previous_entry is not None:
+                entry = previous_entry + previous_entry[:1]
+            else:
+                raise ValueError(f"Invalid code: {code}")
+
+            output += entry
+            if previous_entry is not None and len(table) < max_dict_size:
+                table.append(previous_code, previous_entry, entry[0])
+            previous_code, previous_entry = code, entry
+        return previous_code, previous_entry
+
+    def _finish_stats(self, stats):
+        if self.instrumentation is not None:
+            stats.update(self.instrumentation.report())
+        self.stats = stats
+        return self.stats
+
+    def _encode_stream(self, read, write, batch, tracker, instrumentation=None):
+        # Frames are written as codes accumulate, so the output never needs to be seekable.
+        dictionary = self._initialize_dictionary()
+        next_code = self._first_code()
+        current_code = -1
+        codes = []
+        codes_emitted = 0
+        bytes_processed = 0
+        checksum = 0
+
+        header = self._dictionary_header() + FRAMED_MAGIC + bytes([FRAMED_VERSION])
+        write(header)
+        bytes_written = len(header)
+        while True:
+            chunk = read()
+            if not chunk:
+                break
+
+            if instrumentation is not None:
+                encode_start = instrumentation.clock()
+            next_code, current_code = self._encode(chunk, dictionary, next_code, current_code, codes)
+            if instrumentation is not None:
+                instrumentation.record('encode', instrumentation.clock() - encode_start, len(chunk))
+            if len(codes) >= batch:
+                bytes_written += self._write_frame(write, codes)
+                codes_emitted += len(codes)
+                codes.clear()
+
+            checksum = zlib.crc32(chunk, checksum)
+            bytes_processed += len(chunk)
+            if tracker:
+                if instrumentation is not None:
+                    progress_start = instrumentation.clock()
+                tracker.update(bytes_processed)
+                if instrumentation is not None:
+                    instrumentation.record('progress', instrumentation.clock() - progress_start)
+
+        if current_code >= 0:
+            codes.append(current_code)
+        if codes:
+            bytes_written += self._write_frame(write, codes)
+            codes_emitted += len(codes)
+        write(_FRAME.pack(0) + _TRAILER.pack(bytes_processed, checksum))
+        bytes_written += _FRAME.size + _TRAILER.size
+
+        if instrumentation is not None:
+            instrumentation.set_counter('codes_emitted', codes_emitted)
+            instrumentation.set_counter('dictionary_entries', next_code)
+            instrumentation.set_counter('dictionary_fills', 1 if next_code >= self.max_dict_size else 0)
+            instrumentation.set_counter('dictionary_resets', 0)
+            if codes_emitted:
+                instrumentation.set_counter('average_phrase_length', bytes_processed / codes_emitted)
+        return bytes_processed, bytes_written
+
+    def _write_frame(self, write, codes):
+        frame = _FRAME.pack(len(codes)) + struct.pack(f'>{len(codes)}H', *codes)
+        write(frame)
+        return len(frame)
+
+    def _decode_stream(self, read, write, total_size, read_size, tracker, instrumentation=None):
+        # total_size is None for pipes and sockets; magic bytes are then trusted without the size check.
+        reader = _Reader(read)
+        table = None
+        previous = None
+        decompressed_size = 0
+        num_codes = 0
+        checksum = 0
+
+        def decode_codes(count):
+            nonlocal previous, decompressed_size, num_codes, checksum
+            remaining = count
+            while remaining > 0:
+                chunk = reader.take(min(read_size, remaining * 2), "code stream")
+                codes = struct.unpack(f'>{len(chunk) // 2}H', chunk)
+                remaining -= len(codes)
+                num_codes += len(codes)
+
+                if instrumentation is not None:
+                    decode_start = instrumentation.clock()
+                output = bytearray()
+                if self.max_memory is None:
+                    previous = self._decode(codes, table, previous, output)
+                else:
+                    previous = self._decode_bounded(codes, table, previous, output)
+                if instrumentation is not None:
+                    instrumentation.record('decode', instrumentation.clock() - decode_start, len(output))
+
+                write(output)
+                checksum = zlib.crc32(output, checksum)
+                decompressed_size += len(output)
+                if tracker:
+                    if instrumentation is not None:
+                        progress_start = instrumentation.clock()
+                    tracker.update(reader.bytes_read)
+                    if instrumentation is not None:
+                        instrumentation.record('progress', instrumentation.clock() - progress_start)
 
-    def _initialize_reverse_dictionary(self):
-        return {i: bytes([i]) for i in range(256)}
+        header = reader.read(4)
+        if not header:
+            return 0, 0, 0, False
+        dictionary = None
+        if self._has_dictionary_header(header, total_size):
+            header += reader.take(_DICTIONARY_HEADER_SIZE - 4, "dictionary header")
+            dictionary = self._resolve_dictionary(header)
+            header = reader.read(4)
+        table = self._reverse_table(dictionary)
+
+        remaining_size = total_size - reader.bytes_read + len(header) if total_size is not None else None
+        if self._is_framed(header, remaining_size):
+            version = reader.take(1, "stream header")[0]
+            if version != FRAMED_VERSION:
+                raise ValueError(f"Unsupported stream version: {version}")
+            while True:
+                count = _FRAME.unpack(reader.take(_FRAME.size, "frame header"))[0]
+                if count == 0:
+                    break
+                decode_codes(count)
+            expected_size, expected_checksum = _TRAILER.unpack(reader.take(_TRAILER.size, "stream trailer"))
+            if expected_size != decompressed_size:
+                raise ValueError(f"decoded {decompressed_size} bytes, stream recorded {expected_size}")
+            if expected_checksum != checksum:
+                raise ValueError("checksum mismatch")
+            return decompressed_size, num_codes, len(table), True
+
+        if len(header) < 4:
+            raise ValueError("missing code count")
+        decode_codes(int.from_bytes(header, 'big'))
+        return decompressed_size, num_codes, len(table), False
+
+    def _is_framed(self, prefix: bytes, total_size):
+        if prefix != FRAMED_MAGIC:
+            return False
+        # Same ambiguity as the dictionary header: a count-prefixed stream would be exactly 4 + 2 * count bytes.
+        return total_size != 4 + 2 * int.from_bytes(FRAMED_MAGIC, 'big')
 
     def compress(self, input_file: Path, output_file: Path, tracker):
         start_time = time.time()
@@ -38,51 +334,42 @@ class LZWCompressor(BaseCompressor):
             }
             return self.stats
 
-        dictionary = self._initialize_dictionary()
-        next_code = 256
-        current_phrase = b''
-        compressed_data = []
-        bytes_processed = 0
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            instrumentation.reset()
 
-        with FileHandler() as fh:
+        with FileHandler(instrumentation=instrumentation) as fh, \
+                FileHandler(instrumentation=instrumentation) as fh_out:
             fh.open_file(input_file, 'rb')
-            while True:
-                byte = fh.read_chunk(1)
-                if not byte:
-                    if current_phrase:
-                        compressed_data.append(dictionary[current_phrase])
-                    break
+            fh_out.open_file(output_file, 'wb')
+            original_size, compressed_size = self._encode_stream(
+                lambda: fh.read_chunk(None), fh_out.write_chunk, max(1, fh_out.chunk_size // 2), tracker,
+                instrumentation)
 
-                phrase_plus_byte = current_phrase + byte
-                if phrase_plus_byte in dictionary:
-                    current_phrase = phrase_plus_byte
-                else:
-                    compressed_data.append(dictionary[current_phrase])
-                    if next_code < self.max_dict_size:
-                        dictionary[phrase_plus_byte] = next_code
-                        next_code += 1
-                    current_phrase = byte
+        compression_ratio = max(0, (1 - (compressed_size / original_size)) * 100) if original_size else 0
+        return self._finish_stats({
+            'original_size': original_size,
+            'compressed_size': compressed_size,
+            'compression_ratio': compression_ratio,
+            'time_taken': time.time() - start_time
+        })
 
-                bytes_processed += 1
-                if tracker:
-                    tracker.update(bytes_processed)
+    def compress_stream(self, source, sink, tracker=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        start_time = time.time()
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            instrumentation.reset()
 
-        with FileHandler() as fh:
-            fh.open_file(output_file, 'wb')
-            fh.write_chunk(len(compressed_data).to_bytes(4, 'big'))
-            for code in compressed_data:
-                fh.write_chunk(code.to_bytes(2, 'big'))
+        original_size, compressed_size = self._encode_stream(
+            lambda: source.read(chunk_size), sink.write, max(1, chunk_size // 2), tracker, instrumentation)
 
-        original_size = input_file.stat().st_size
-        compressed_size = output_file.stat().st_size
-        compression_ratio = max(0, (1 - (compressed_size / original_size)) * 100)
-        self.stats = {
+        compression_ratio = max(0, (1 - (compressed_size / original_size)) * 100) if original_size else 0
+        return self._finish_stats({
             'original_size': original_size,
             'compressed_size': compressed_size,
             'compression_ratio': compression_ratio,
             'time_taken': time.time() - start_time
-        }
-        return self.stats
+        })
 
     def decompress(self, input_file: Path, output_file: Path, tracker):
         start_time = time.time()
@@ -100,64 +387,83 @@ class LZWCompressor(BaseCompressor):
             }
             return self.stats
 
-        dictionary = self._initialize_reverse_dictionary()
-        next_code = 256
-        decompressed_data = bytearray()
-        bytes_processed = 0
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            instrumentation.reset()
 
-        with FileHandler() as fh:
+        with FileHandler(instrumentation=instrumentation) as fh:
             fh.open_file(input_file, 'rb')
-            try:
-                num_codes = int.from_bytes(fh.read_chunk(4), 'big')
-                bytes_processed += 4
-
-                if num_codes > 0:
-                    code = int.from_bytes(fh.read_chunk(2), 'big')
-                    bytes_processed += 2
-                    decompressed_data.extend(dictionary[code])
-                    old_code = code
-
-                    for i in range(num_codes - 1):
-                        code = int.from_bytes(fh.read_chunk(2), 'big')
-                        bytes_processed += 2
-
-                        if code in dictionary:
-                            entry = dictionary[code]
-                        elif code == next_code:
-                            entry = dictionary[old_code] + dictionary[old_code][:1]
-                        else:
-                            raise ValueError(f"Invalid code: {code}")
-
-                        decompressed_data.extend(entry)
+            with FileHandler(instrumentation=instrumentation) as fh_out:
+                fh_out.open_file(output_file, 'wb')
+                read_size = fh.chunk_size - (fh.chunk_size % 2) or 2
+                try:
+                    decoded = self._decode_stream(
+                        fh.read_chunk, fh_out.write_chunk, fh.file_size, read_size, tracker, instrumentation)
+                except OperationCancelled:
+                    raise
+                except Exception as e:
+                    raise ValueError(f"Error during decompression: {str(e)}")
 
-                        if next_code < self.max_dict_size:
-                            dictionary[next_code] = dictionary[old_code] + entry[:1]
-                            next_code += 1
+        return self._finish_decompress_stats(input_file.stat().st_size, decoded, start_time)
 
-                        old_code = code
-
-                        if tracker:
-                            tracker.update(bytes_processed)
-
-            except Exception as e:
-                raise ValueError(f"Error during decompression: {str(e)}")
+    def decompress_stream(self, source, sink, tracker=None, chunk_size=DEFAULT_CHUNK_SIZE):
+        start_time = time.time()
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            instrumentation.reset()
 
-        with FileHandler() as fh:
-            fh.open_file(output_file, 'wb')
-            fh.write_chunk(decompressed_data)
+        reader = _Reader(source.read)
+        try:
+            decoded = self._decode_stream(
+                reader.read, sink.write, None, chunk_size - (chunk_size % 2) or 2, tracker, instrumentation)
+        except OperationCancelled:
+            raise
+        except Exception as e:
+            raise ValueError(f"Error during decompression: {str(e)}")
+        return self._finish_decompress_stats(reader.bytes_read, decoded, start_time)
 
-        original_size = input_file.stat().st_size
-        decompressed_size = len(decompressed_data)
+    def _finish_decompress_stats(self, original_size, decoded, start_time):
+        decompressed_size, num_codes, table_size, checksum_verified = decoded
         compression_ratio = max(0, (1 - (original_size / decompressed_size)) * 100) if decompressed_size > 0 else 0
 
-        self.stats = {
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            instrumentation.set_counter('codes_decoded', num_codes)
+            instrumentation.set_counter('dictionary_entries', table_size)
+            instrumentation.set_counter('dictionary_fills', 1 if table_size >= self.max_dict_size else 0)
+            if num_codes:
+                instrumentation.set_counter('average_phrase_length', decompressed_size / num_codes)
+
+        stats = {
             'original_size': original_size,
             'compressed_size': original_size,
             'decompressed_size': decompressed_size,
             'compression_ratio': compression_ratio,
             'time_taken': time.time() - start_time
         }
-        return self.stats
+        if checksum_verified:
+            stats['checksum_verified'] = True
+        return self._finish_stats(stats)
+
+    def compress_data(self, data: bytes) -> bytes:
+        if not data:
+            return b''
+
+        output = bytearray()
+        source = io.BytesIO(data)
+        self._encode_stream(lambda: source.read(_DATA_CHUNK_SIZE), output.extend, _DATA_CHUNK_SIZE // 2, None)
+        return bytes(output)
+
+    def decompress_data(self, data: bytes) -> bytes:
+        if not data:
+            return b''
+        output = bytearray()
+        read_size = len(data) + len(data) % 2
+        try:
+            self._decode_stream(io.BytesIO(data).read, output.extend, len(data), read_size, None)
+        except ValueError as e:
+            raise ValueError(f"Error during decompression: {str(e)}")
+        return bytes(output)
 
     def get_compression_stats(self):
         return self.stats.copy()
@@ -0,0 +1,175 @@
+import hashlib
+import os
+import struct
+from collections import Counter
+from pathlib import Path
+
+MAGIC = b'LZWDICT'
+FORMAT_VERSION = 1
+STREAM_MAGIC = b'LZWD'
+DICTIONARY_SUFFIX = '.lzwdict'
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_DIRECTORY = Path.home() / '.filecompressor' / 'dictionaries'
+PATH_VARIABLE = 'FILECOMPRESSOR_DICT_PATH'
+
+_HEADER = struct.Struct('>7sB8sI')
+_ENTRY = struct.Struct('>H')
+
+_registry = {}
+_file_cache = {}
+
+
+class LZWDictionary:
+    def __init__(self, phrases, version=1):
+        self.phrases = list(phrases)
+        self.version = version
+        self._encoder_table = None
+        self._decoder_table = None
+
+        known = set()
+        for phrase in self.phrases:
+            if len(phrase) < 2 or (len(phrase) > 2 and phrase[:-1] not in known):
+                raise ValueError("Dictionary phrases must be prefix-closed and at least 2 bytes long")
+            known.add(phrase)
+
+        digest = hashlib.blake2b(digest_size=8)
+        digest.update(bytes([version]))
+        for phrase in self.phrases:
+            digest.update(_ENTRY.pack(len(phrase)) + phrase)
+        self.dictionary_id = digest.hexdigest()
+
+    def __len__(self):
+        return len(self.phrases)
+
+    def encoder_table(self):
+        if self._encoder_table is None:
+            table = {}
+            codes = {}
+            for code, phrase in enumerate(self.phrases, 256):
+                prefix = phrase[:-1]
+                prefix_code = prefix[0] if len(prefix) == 1 else codes[prefix]
+                table[(prefix_code << 8) | phrase[-1]] = code
+                codes[phrase] = code
+            self._encoder_table = table
+        return self._encoder_table
+
+    def decoder_table(self):
+        if self._decoder_table is None:
+            self._decoder_table = [bytes([i]) for i in range(256)] + self.phrases
+        return self._decoder_table
+
+    def save(self, file_path: Path):
+        with open(file_path, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, FORMAT_VERSION, bytes.fromhex(self.dictionary_id), len(self.phrases)))
+            f.write(bytes([self.version]))
+            for phrase in self.phrases:
+                f.write(_ENTRY.pack(len(phrase)) + phrase)
+        return file_path
+
+
+def _read_header(data: bytes):
+    magic, format_version, dictionary_id, count = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Invalid dictionary file: bad magic")
+    if format_version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported dictionary format version: {format_version}")
+    return dictionary_id.hex(), count
+
+
+def load_dictionary(file_path: Path):
+    file_path = Path(file_path)
+    stat = file_path.stat()
+    cache_key = (str(file_path.resolve()), stat.st_mtime_ns, stat.st_size)
+    cached = _file_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    data = file_path.read_bytes()
+    dictionary_id, count = _read_header(data)
+    position = _HEADER.size
+    version = data[position]
+    position += 1
+
+    phrases = []
+    for _ in range(count):
+        length = _ENTRY.unpack_from(data, position)[0]
+        position += _ENTRY.size
+        phrases.append(data[position:position + length])
+        position += length
+
+    dictionary = LZWDictionary(phrases, version)
+    if dictionary.dictionary_id != dictionary_id:
+        raise ValueError("Invalid dictionary file: id does not match contents")
+
+    _file_cache[cache_key] = dictionary
+    register_dictionary(dictionary)
+    return dictionary
+
+
+def register_dictionary(dictionary: LZWDictionary):
+    _registry[dictionary.dictionary_id] = dictionary
+
+
+def registered_dictionaries():
+    return list(_registry.values())
+
+
+def search_paths():
+    paths = [Path(path) for path in os.environ.get(PATH_VARIABLE, '').split(os.pathsep) if path]
+    paths.append(DEFAULT_DIRECTORY)
+    return paths
+
+
+def find_dictionary(dictionary_id):
+    dictionary = _registry.get(dictionary_id)
+    if dictionary is not None:
+        return dictionary
+
+    for directory in search_paths():
+        if not directory.is_dir():
+            continue
+        candidate = directory / f"{dictionary_id}{DICTIONARY_SUFFIX}"
+        if candidate.exists():
+            return load_dictionary(candidate)
+        for path in directory.glob(f"*{DICTIONARY_SUFFIX}"):
+            try:
+                with open(path, 'rb') as f:
+                    if _read_header(f.read(_HEADER.size))[0] == dictionary_id:
+                        return load_dictionary(path)
+            except (OSError, ValueError, struct.error):
+                continue
+
+    raise ValueError(f"Unknown LZW dictionary: {dictionary_id}")
+
+
+def train_dictionary(samples, max_entries=DEFAULT_MAX_ENTRIES, max_dict_size=65536, version=1):
+    if max_entries <= 0 or 256 + max_entries > max_dict_size:
+        raise ValueError("Dictionary size must be positive and fit in the code space")
+
+    scores = Counter()
+    for sample in samples:
+        dictionary = {bytes([i]) for i in range(256)}
+        phrase = b''
+        for i in range(len(sample)):
+            extended = phrase + sample[i:i + 1]
+            if extended in dictionary:
+                phrase = extended
+                continue
+            if len(phrase) > 1:
+                scores[phrase] += len(phrase) - 1
+            if len(dictionary) < max_dict_size:
+                dictionary.add(extended)
+            phrase = sample[i:i + 1]
+        if len(phrase) > 1:
+            scores[phrase] += len(phrase) - 1
+
+    selected = set()
+    for phrase, _ in scores.most_common():
+        missing = [phrase[:length] for length in range(2, len(phrase) + 1) if phrase[:length] not in selected]
+        if len(selected) + len(missing) > max_entries:
+            continue
+        selected.update(missing)
+        if len(selected) == max_entries:
+            break
+
+    return LZWDictionary(sorted(selected, key=lambda item: (len(item), item)), version)
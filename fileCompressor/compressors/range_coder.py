@@ -0,0 +1,445 @@
+import os
+import struct
+import tempfile
+import time
+import zlib
+from array import array
+from pathlib import Path
+from compressors.lzw import LZWCompressor
+from compressors.rle import RLECompressor
+from core.interfaces.compressor import BaseCompressor
+from utils.file_handler import FileHandler
+from utils.progress_tracker import ProgressTracker
+
+MAGIC = b'FCRC'
+VERSION = 1
+STAGES = {'rle': RLECompressor, 'lzw': LZWCompressor}
+
+_HEADER = struct.Struct('>4sBB')
+_LENGTH = struct.Struct('>Q')
+# Streams end with the CRC32 of the range-coded bytes: the input itself, or the stage stream, whose own
+# trailer covers the input. The decoder is only fed the bytes before it.
+_CHECKSUM = struct.Struct('>I')
+_TOP = 1 << 24
+_MASK = 0xFFFFFFFF
+
+
+class AdaptiveModel:
+    # Order-0 byte frequencies; the Fenwick tree gives cumulative counts and symbol search in O(log 256).
+    def __init__(self, symbols=256, increment=24, limit=1 << 16):
+        self.symbols = symbols
+        self.increment = increment
+        self.limit = limit
+        self.freq = array('I', [1] * symbols)
+        self.tree = array('I', [0] * (symbols + 1))
+        self.total = symbols
+        self.top_bit = 1 << (symbols.bit_length() - 1)
+        self._rebuild()
+
+    def _rebuild(self):
+        tree, n = self.tree, self.symbols
+        for i in range(1, n + 1):
+            tree[i] = self.freq[i - 1]
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+
+    def cumulative(self, symbol):
+        tree = self.tree
+        total = 0
+        while symbol > 0:
+            total += tree[symbol]
+            symbol &= symbol - 1
+        return total
+
+    def find(self, value):
+        tree, n = self.tree, self.symbols
+        position = 0
+        mask = self.top_bit
+        remaining = value
+        while mask:
+            index = position + mask
+            if index <= n and tree[index] <= remaining:
+                position = index
+                remaining -= tree[index]
+            mask >>= 1
+        return position, value - remaining
+
+    def rescale(self):
+        freq = self.freq
+        for i in range(self.symbols):
+            freq[i] = (freq[i] + 1) >> 1
+        self.total = sum(freq)
+        self._rebuild()
+
+    def update(self, symbol):
+        increment = self.increment
+        self.freq[symbol] += increment
+        self.total += increment
+        if self.total > self.limit:
+            self.rescale()
+            return
+        tree, n = self.tree, self.symbols
+        i = symbol + 1
+        while i <= n:
+            tree[i] += increment
+            i += i & -i
+
+
+class RangeEncoder:
+    def __init__(self):
+        self.low = 0
+        self.range = _MASK
+        self._cache = 0
+        self._cache_size = 1
+        self.output = bytearray()
+
+    def _shift_low(self):
+        low = self.low
+        if low < 0xFF000000 or low > _MASK:
+            carry = low >> 32
+            byte = self._cache
+            while True:
+                self.output.append((byte + carry) & 0xFF)
+                byte = 0xFF
+                self._cache_size -= 1
+                if not self._cache_size:
+                    break
+            self._cache = (low >> 24) & 0xFF
+        self._cache_size += 1
+        self.low = (low & 0x00FFFFFF) << 8
+
+    def encode(self, data, model: AdaptiveModel):
+        # The model's Fenwick tree is walked inline here; this loop runs once per input byte.
+        freq, tree, n, increment, limit = model.freq, model.tree, model.symbols, model.increment, model.limit
+        low, range_, total = self.low, self.range, model.total
+        for symbol in data:
+            start = 0
+            i = symbol
+            while i:
+                start += tree[i]
+                i &= i - 1
+            r = range_ // total
+            low += r * start
+            range_ = r * freq[symbol]
+            while range_ < _TOP:
+                range_ <<= 8
+                self.low = low
+                self._shift_low()
+                low = self.low
+
+            freq[symbol] += increment
+            total += increment
+            if total > limit:
+                model.total = total
+                model.rescale()
+                total = model.total
+            else:
+                i = symbol + 1
+                while i <= n:
+                    tree[i] += increment
+                    i += i & -i
+        self.low, self.range, model.total = low, range_, total
+
+    def take(self) -> bytes:
+        data = bytes(self.output)
+        self.output.clear()
+        return data
+
+    def finish(self) -> bytes:
+        for _ in range(5):
+            self._shift_low()
+        return self.take()
+
+
+class RangeDecoder:
+    def __init__(self, read):
+        self._read = read
+        self._buffer = b''
+        self._position = 0
+        self.range = _MASK
+        self.code = 0
+        for _ in range(5):
+            self.code = (self.code << 8) | self._next_byte()
+
+    def _next_byte(self):
+        if self._position >= len(self._buffer):
+            self._buffer = self._read()
+            self._position = 0
+            if not self._buffer:
+                return 0  # the encoder's flush may be shorter than the decoder's lookahead
+        byte = self._buffer[self._position]
+        self._position += 1
+        return byte
+
+    def decode(self, count, model: AdaptiveModel) -> bytes:
+        freq, tree, n, increment, limit = model.freq, model.tree, model.symbols, model.increment, model.limit
+        top_bit = model.top_bit
+        code, range_, total = self.code, self.range, model.total
+        output = bytearray(count)
+        for position in range(count):
+            r = range_ // total
+            target = code // r
+            if target >= total:
+                target = total - 1
+            symbol = 0
+            remaining = target
+            mask = top_bit
+            while mask:
+                index = symbol + mask
+                if index <= n and tree[index] <= remaining:
+                    symbol = index
+                    remaining -= tree[index]
+                mask >>= 1
+            size = freq[symbol]
+            code -= r * (target - remaining)
+            range_ = r * size
+            while range_ < _TOP:
+                code = ((code << 8) | self._next_byte()) & _MASK
+                range_ <<= 8
+            output[position] = symbol
+
+            freq[symbol] += increment
+            total += increment
+            if total > limit:
+                model.total = total
+                model.rescale()
+                total = model.total
+            else:
+                i = symbol + 1
+                while i <= n:
+                    tree[i] += increment
+                    i += i & -i
+        self.code, self.range, model.total = code, range_, total
+        return bytes(output)
+
+
+def _pack_header(stage, length) -> bytes:
+    name = (stage or '').encode('ascii')
+    return _HEADER.pack(MAGIC, VERSION, len(name)) + name + _LENGTH.pack(length)
+
+
+def _unpack_header(data: bytes):
+    if len(data) < _HEADER.size:
+        raise ValueError("Invalid compressed data: truncated header")
+    magic, version, name_length = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Invalid compressed data: not a range coded stream")
+    end = _HEADER.size + name_length + _LENGTH.size
+    if len(data) < end:
+        raise ValueError("Invalid compressed data: truncated header")
+    stage = data[_HEADER.size:_HEADER.size + name_length].decode('ascii') or None
+    if stage is not None and stage not in STAGES:
+        raise ValueError(f"Invalid compressed data: unknown stage {stage}")
+    return stage, _LENGTH.unpack_from(data, end - _LENGTH.size)[0], end
+
+
+def _check(checksum, expected):
+    if checksum != expected:
+        raise ValueError("Invalid compressed data: checksum mismatch")
+
+
+def _stage_file() -> Path:
+    # Staged streams go to the temp directory: the output may be a device such as os.devnull (verify),
+    # whose directory is not ours to write in.
+    fd, name = tempfile.mkstemp(prefix='filecompressor-', suffix='.stage')
+    os.close(fd)
+    return Path(name)
+
+
+def _stage_tracker(tracker, total_bytes):
+    # Stage outputs have their own size, so they get a tracker that shares only the stop conditions.
+    if tracker is None or total_bytes <= 0:
+        return None
+    return ProgressTracker(total_bytes, token=tracker.token, deadline=tracker.deadline)
+
+
+class RangeCoderCompressor(BaseCompressor):
+    stage = None
+
+    def __init__(self):
+        self.stats = {
+            'original_size': 0,
+            'compressed_size': 0,
+            'compression_ratio': 0,
+            'time_taken': 0
+        }
+        self.instrumentation = None
+        self.max_memory = None
+
+    def _stage_compressor(self, stage):
+        compressor = STAGES[stage]()
+        compressor.instrumentation = self.instrumentation
+        if hasattr(compressor, 'max_memory'):
+            compressor.max_memory = self.max_memory
+        return compressor
+
+    def _finish_stats(self, stats):
+        if self.instrumentation is not None:
+            stats.update(self.instrumentation.report())
+        self.stats = stats
+        return self.stats
+
+    def _encode_file(self, input_file: Path, output_file: Path, tracker, report_progress):
+        instrumentation = self.instrumentation
+        model = AdaptiveModel()
+        encoder = RangeEncoder()
+        bytes_processed = 0
+        checksum = 0
+
+        with FileHandler(instrumentation=instrumentation) as fh, \
+                FileHandler(instrumentation=instrumentation) as fh_out:
+            fh.open_file(input_file, 'rb')
+            fh_out.open_file(output_file, 'wb')
+            fh_out.write_chunk(_pack_header(self.stage, fh.file_size))
+            while True:
+                chunk = fh.read_chunk(None)
+                if not chunk:
+                    break
+                if instrumentation is not None:
+                    encode_start = instrumentation.clock()
+                encoder.encode(chunk, model)
+                if instrumentation is not None:
+                    instrumentation.record('entropy_encode', instrumentation.clock() - encode_start, len(chunk))
+                if len(encoder.output) >= fh_out.chunk_size:
+                    fh_out.write_chunk(encoder.take())
+
+                checksum = zlib.crc32(chunk, checksum)
+                bytes_processed += len(chunk)
+                if tracker:
+                    if report_progress:
+                        tracker.update(bytes_processed)
+                    else:
+                        tracker.check()
+            fh_out.write_chunk(encoder.finish())
+            fh_out.write_chunk(_CHECKSUM.pack(checksum))
+
+    def _decode_file(self, fh, output_file: Path, length, bytes_read, tracker):
+        instrumentation = self.instrumentation
+        model = AdaptiveModel()
+        consumed = [bytes_read]
+        payload_end = fh.file_size - _CHECKSUM.size
+        if payload_end < bytes_read:
+            raise ValueError("Invalid compressed data: truncated stream")
+        fh.seek(payload_end)
+        expected = _CHECKSUM.unpack(fh.read_chunk(_CHECKSUM.size))[0]
+        fh.seek(bytes_read)
+
+        def read():
+            chunk = fh.read_chunk(min(fh.chunk_size, payload_end - consumed[0]))
+            consumed[0] += len(chunk)
+            return chunk
+        decoder = RangeDecoder(read)
+        remaining = length
+        checksum = 0
+
+        with FileHandler(instrumentation=instrumentation) as fh_out:
+            fh_out.open_file(output_file, 'wb')
+            while remaining > 0:
+                count = min(fh_out.chunk_size, remaining)
+                if instrumentation is not None:
+                    decode_start = instrumentation.clock()
+                output = decoder.decode(count, model)
+                if instrumentation is not None:
+                    instrumentation.record('entropy_decode', instrumentation.clock() - decode_start, count)
+                fh_out.write_chunk(output)
+                checksum = zlib.crc32(output, checksum)
+                remaining -= count
+                if tracker:
+                    tracker.update(min(consumed[0], tracker.stats.total_bytes))
+        _check(checksum, expected)
+        return length
+
+    def compress(self, input_file: Path, output_file: Path, tracker):
+        start_time = time.time()
+        if self.instrumentation is not None:
+            self.instrumentation.reset()
+
+        if self.stage is None:
+            self._encode_file(input_file, output_file, tracker, True)
+        else:
+            staged_file = _stage_file()
+            try:
+                self._stage_compressor(self.stage).compress(input_file, staged_file, tracker)
+                self._encode_file(staged_file, output_file, tracker, False)
+            finally:
+                staged_file.unlink(missing_ok=True)
+
+        original_size = input_file.stat().st_size
+        compressed_size = output_file.stat().st_size
+        compression_ratio = max(0, (1 - (compressed_size / original_size)) * 100) if original_size > 0 else 0
+
+        return self._finish_stats({
+            'original_size': original_size,
+            'compressed_size': compressed_size,
+            'compression_ratio': compression_ratio,
+            'time_taken': time.time() - start_time
+        })
+
+    def decompress(self, input_file: Path, output_file: Path, tracker):
+        start_time = time.time()
+        if self.instrumentation is not None:
+            self.instrumentation.reset()
+
+        with FileHandler(instrumentation=self.instrumentation) as fh:
+            fh.open_file(input_file, 'rb')
+            header = fh.read_chunk(_HEADER.size)
+            header += fh.read_chunk(header[-1] + _LENGTH.size if len(header) == _HEADER.size else 0)
+            stage, length, _ = _unpack_header(header)
+
+            if stage is None:
+                decompressed_size = self._decode_file(fh, output_file, length, len(header), tracker)
+            else:
+                staged_file = _stage_file()
+                try:
+                    self._decode_file(fh, staged_file, length, len(header), tracker)
+                    fh.close_file()
+                    stage_stats = self._stage_compressor(stage).decompress(staged_file, output_file,
+                                                                           _stage_tracker(tracker, length))
+                    decompressed_size = stage_stats['decompressed_size']
+                finally:
+                    staged_file.unlink(missing_ok=True)
+
+        # Counted rather than read back from the output, which may be a sink such as os.devnull.
+        original_size = input_file.stat().st_size
+        compression_ratio = max(0, (1 - (original_size / decompressed_size)) * 100) if decompressed_size > 0 else 0
+
+        return self._finish_stats({
+            'original_size': original_size,
+            'compressed_size': original_size,
+            'decompressed_size': decompressed_size,
+            'compression_ratio': compression_ratio,
+            'checksum_verified': True,
+            'time_taken': time.time() - start_time
+        })
+
+    def get_compression_stats(self):
+        return self.stats.copy()
+
+    def compress_data(self, data: bytes) -> bytes:
+        if self.stage is not None:
+            data = STAGES[self.stage]().compress_data(data)
+        encoder = RangeEncoder()
+        encoder.encode(data, AdaptiveModel())
+        return _pack_header(self.stage, len(data)) + encoder.finish() + _CHECKSUM.pack(zlib.crc32(data))
+
+    def decompress_data(self, data: bytes) -> bytes:
+        stage, length, offset = _unpack_header(data)
+        if len(data) < offset + _CHECKSUM.size:
+            raise ValueError("Invalid compressed data: truncated stream")
+        chunks = [data[offset:-_CHECKSUM.size]]
+        decoder = RangeDecoder(lambda: chunks.pop() if chunks else b'')
+        output = decoder.decode(length, AdaptiveModel())
+        _check(zlib.crc32(output), _CHECKSUM.unpack(data[-_CHECKSUM.size:])[0])
+        if stage is not None:
+            output = self._stage_compressor(stage).decompress_data(output)
+        return output
+
+
+class RLERangeCompressor(RangeCoderCompressor):
+    stage = 'rle'
+
+
+class LZWRangeCompressor(RangeCoderCompressor):
+    stage = 'lzw'
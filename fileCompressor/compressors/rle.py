@@ -1,10 +1,36 @@
+import re
+import struct
 import time
+import zlib
 from pathlib import Path
 from core.interfaces.compressor import BaseCompressor
-from utils.bit_handler import BitHandler
-from utils.progress_tracker import ProgressTracker
 from utils.file_handler import FileHandler
 
+_RUN_PATTERN = re.compile(rb'(.)\1*', re.DOTALL)
+# Files start with a header whose first pair has a zero count, which no run has, so it cannot be mistaken for
+# data or collide with another format's magic. It is padded to an even length to keep the runs pair-aligned.
+MAGIC = b'\x00RLE'
+VERSION = 1
+_HEADER = struct.Struct('>4sBx')
+# Files end with the CRC32 of the input. A zero count never occurs in a run, so the marker cannot be mistaken
+# for one, and files written before the trailer existed still decode.
+_TRAILER = struct.Struct('>2sI')
+TRAILER_MARKER = b'\x00C'
+
+
+def _split_header(data):
+    if not data.startswith(MAGIC):
+        return data
+    if len(data) < _HEADER.size or data[len(MAGIC)] != VERSION:
+        raise ValueError("Invalid compressed data: unsupported RLE header")
+    return data[_HEADER.size:]
+
+
+def _split_trailer(data):
+    if len(data) >= _TRAILER.size and data[-_TRAILER.size:-_TRAILER.size + 2] == TRAILER_MARKER:
+        return data[:-_TRAILER.size], _TRAILER.unpack(data[-_TRAILER.size:])[1]
+    return data, None
+
 
 class RLECompressor(BaseCompressor):
     def __init__(self):
@@ -14,6 +40,35 @@ class RLECompressor(BaseCompressor):
             'compression_ratio': 0,
             'time_taken': 0
         }
+        self.instrumentation = None
+
+    def _encode_runs(self, data, run_byte, run_length, output, histogram=None):
+        for match in _RUN_PATTERN.finditer(data):
+            byte = data[match.start()]
+            length = match.end() - match.start()
+            if byte == run_byte:
+                run_length += length
+            else:
+                if run_byte is not None:
+                    self._emit_run(output, run_byte, run_length, histogram)
+                run_byte = byte
+                run_length = length
+        return run_byte, run_length
+
+    def _emit_run(self, output, byte, length, histogram=None):
+        while length > 0:
+            count = min(length, 255)
+            output.append(count)
+            output.append(byte)
+            if histogram is not None:
+                histogram[count.bit_length()] += 1
+            length -= count
+
+    def _finish_stats(self, stats):
+        if self.instrumentation is not None:
+            stats.update(self.instrumentation.report())
+        self.stats = stats
+        return self.stats
 
     def compress(self, input_file: Path, output_file: Path, tracker):
         start_time = time.time()
@@ -30,58 +85,66 @@ class RLECompressor(BaseCompressor):
             }
             return self.stats
 
-        bit_handler = BitHandler()
+        instrumentation = self.instrumentation
+        histogram = None
+        if instrumentation is not None:
+            instrumentation.reset()
+            histogram = instrumentation.histogram('run_length')
+
         bytes_processed = 0
+        run_byte = None
+        run_length = 0
+        checksum = 0
 
-        with FileHandler() as fh:
+        with FileHandler(instrumentation=instrumentation) as fh:
             fh.open_file(input_file, 'rb')
-            with FileHandler() as fh_out:
+            with FileHandler(instrumentation=instrumentation) as fh_out:
                 fh_out.open_file(output_file, 'wb')
-                prev_byte = None
-                count = 0
+                fh_out.write_chunk(_HEADER.pack(MAGIC, VERSION))
 
                 while True:
-                    byte = fh.read_chunk(1)
-                    if not byte:
+                    chunk = fh.read_chunk(None)
+                    if not chunk:
                         break
 
-                    bytes_processed += 1
-                    if tracker:
-                        tracker.update(bytes_processed)
+                    if instrumentation is not None:
+                        encode_start = instrumentation.clock()
+                    output = bytearray()
+                    run_byte, run_length = self._encode_runs(chunk, run_byte, run_length, output, histogram)
+                    if instrumentation is not None:
+                        instrumentation.record('encode', instrumentation.clock() - encode_start, len(chunk))
 
-                    if byte == prev_byte:
-                        count += 1
-                        if count == 255:
-                            fh_out.write_chunk(bit_handler.write_byte(count))
-                            fh_out.write_chunk(bit_handler.write_byte(ord(prev_byte)))
-                            count = 0
-                    else:
-                        if prev_byte is not None:
-                            fh_out.write_chunk(bit_handler.write_byte(count))
-                            fh_out.write_chunk(bit_handler.write_byte(ord(prev_byte)))
-                        prev_byte = byte
-                        count = 1
+                    if output:
+                        fh_out.write_chunk(output)
 
-                if prev_byte is not None:
-                    fh_out.write_chunk(bit_handler.write_byte(count))
-                    fh_out.write_chunk(bit_handler.write_byte(ord(prev_byte)))
+                    checksum = zlib.crc32(chunk, checksum)
+                    bytes_processed += len(chunk)
+                    if tracker:
+                        if instrumentation is not None:
+                            progress_start = instrumentation.clock()
+                        tracker.update(bytes_processed)
+                        if instrumentation is not None:
+                            instrumentation.record('progress', instrumentation.clock() - progress_start)
 
-                final_bits = bit_handler.flush_bits()
-                if final_bits:
-                    fh_out.write_chunk(final_bits)
+                if run_byte is not None:
+                    output = bytearray()
+                    self._emit_run(output, run_byte, run_length, histogram)
+                    fh_out.write_chunk(output)
+                fh_out.write_chunk(_TRAILER.pack(TRAILER_MARKER, checksum))
 
         original_size = input_file.stat().st_size
         compressed_size = output_file.stat().st_size
         compression_ratio = max(0, (1 - (compressed_size / original_size)) * 100)
 
-        self.stats = {
+        if instrumentation is not None:
+            instrumentation.set_counter('runs_emitted', sum(histogram))
+
+        return self._finish_stats({
             'original_size': original_size,
             'compressed_size': compressed_size,
             'compression_ratio': compression_ratio,
             'time_taken': time.time() - start_time
-        }
-
-        return self.stats
+        })
 
     def decompress(self, input_file: Path, output_file: Path, tracker):
         start_time = time.time()
@@ -99,52 +162,107 @@ class RLECompressor(BaseCompressor):
             }
             return self.stats
 
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            instrumentation.reset()
+
         bytes_processed = 0
-        with FileHandler() as fh:
+        decompressed_size = 0
+        pending = b''
+        checksum = 0
+
+        with FileHandler(instrumentation=instrumentation) as fh:
             fh.open_file(input_file, 'rb')
-            decompressed_data = bytearray()
+            with FileHandler(instrumentation=instrumentation) as fh_out:
+                fh_out.open_file(output_file, 'wb')
+                expected = None
+                remaining = fh.file_size
+                if remaining >= _TRAILER.size and remaining % 2 == 0:
+                    fh.seek(remaining - _TRAILER.size)
+                    _, expected = _split_trailer(fh.read_chunk(_TRAILER.size))
+                    fh.seek(0)
+                    if expected is not None:
+                        remaining -= _TRAILER.size
+                if remaining >= _HEADER.size:
+                    header = fh.read_chunk(_HEADER.size)
+                    if header.startswith(MAGIC):
+                        _split_header(header)
+                        remaining -= _HEADER.size
+                    else:
+                        fh.seek(0)
 
-            try:
-                while True:
-                    count_chunk = fh.read_chunk(1)
-                    if not count_chunk:
+                while remaining > 0:
+                    chunk = fh.read_chunk(min(fh.chunk_size, remaining))
+                    if not chunk:
                         break
+                    remaining -= len(chunk)
 
-                    byte_chunk = fh.read_chunk(1)
-                    if not byte_chunk:
-                        raise ValueError("Invalid compressed data: missing byte after count")
-
-                    bytes_processed += 2
+                    data = pending + chunk
+                    usable = len(data) - (len(data) % 2)
+                    pending = data[usable:]
 
-                    count = int.from_bytes(count_chunk, byteorder='big')
-                    byte = int.from_bytes(byte_chunk, byteorder='big')
+                    if instrumentation is not None:
+                        decode_start = instrumentation.clock()
+                    try:
+                        output = self.decompress_data(data[:usable])
+                    except ValueError as e:
+                        raise ValueError(f"Invalid compressed data: {str(e)}")
+                    if instrumentation is not None:
+                        instrumentation.record('decode', instrumentation.clock() - decode_start, len(output))
 
-                    if count < 1 or count > 255:
-                        raise ValueError("Invalid compressed data: count out of range")
-                    if byte < 0 or byte > 255:
-                        raise ValueError("Invalid compressed data: byte out of range")
+                    fh_out.write_chunk(output)
+                    checksum = zlib.crc32(output, checksum)
+                    decompressed_size += len(output)
 
-                    decompressed_data.extend([byte] * count)
-
-            except Exception as e:
-                raise ValueError(f"Invalid compressed data: {str(e)}")
+                    bytes_processed += len(chunk)
+                    if tracker:
+                        if instrumentation is not None:
+                            progress_start = instrumentation.clock()
+                        tracker.update(bytes_processed)
+                        if instrumentation is not None:
+                            instrumentation.record('progress', instrumentation.clock() - progress_start)
 
-        with FileHandler() as fh_out:
-            fh_out.open_file(output_file, 'wb')
-            fh_out.write_chunk(decompressed_data)
+                if pending:
+                    raise ValueError("Invalid compressed data: missing byte after count")
+                if expected is not None and checksum != expected:
+                    raise ValueError("Invalid compressed data: checksum mismatch")
 
         original_size = input_file.stat().st_size
-        decompressed_size = len(decompressed_data)
         compression_ratio = max(0, (1 - (original_size / decompressed_size)) * 100) if decompressed_size > 0 else 0
 
-        self.stats = {
+        stats = {
             'original_size': original_size,
             'compressed_size': original_size,
             'decompressed_size': decompressed_size,
             'compression_ratio': compression_ratio,
             'time_taken': time.time() - start_time
         }
-        return self.stats
+        if expected is not None:
+            stats['checksum_verified'] = True
+        return self._finish_stats(stats)
+
+    def compress_data(self, data: bytes) -> bytes:
+        output = bytearray()
+        run_byte, run_length = self._encode_runs(data, None, 0, output)
+        if run_byte is not None:
+            self._emit_run(output, run_byte, run_length)
+        return bytes(output)
+
+    def decompress_data(self, data: bytes) -> bytes:
+        if len(data) % 2 != 0:
+            raise ValueError("Invalid compressed data: missing byte after count")
+        data, expected = _split_trailer(data)
+        data = _split_header(data)
+
+        result = bytearray()
+        for i in range(0, len(data), 2):
+            count = data[i]
+            if count < 1:
+                raise ValueError("Invalid compressed data: count out of range")
+            result.extend(data[i + 1:i + 2] * count)
+        if expected is not None and zlib.crc32(result) != expected:
+            raise ValueError("Invalid compressed data: checksum mismatch")
+        return bytes(result)
 
     def get_compression_stats(self):
         return self.stats.copy()
@@ -0,0 +1,167 @@
+import struct
+import time
+from pathlib import Path
+from core.interfaces.compressor import BaseCompressor
+from core.block_format import END_OF_STREAM, BlockReader, check_block, pack_block
+from utils.file_handler import FileHandler
+from utils.sparse import data_extents
+
+MAGIC = b'FCSP'
+VERSION = 1
+
+_HEADER = struct.Struct('>4sBB')
+_SIZE = struct.Struct('>Q')
+_EXTENT = struct.Struct('>QQ')
+
+
+def is_sparse_stream(file_path: Path, algorithms):
+    try:
+        with open(file_path, 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return False
+            magic, version, name_length = _HEADER.unpack(header)
+            return magic == MAGIC and version == VERSION and \
+                f.read(name_length).decode('ascii', 'replace') in algorithms
+    except OSError:
+        return False
+
+
+class SparseReader:
+    def __init__(self, source):
+        self._source = source
+        self._blocks = BlockReader(source)
+        self.algorithm = None
+        self.output_size = 0
+
+    @property
+    def offset(self):
+        return self._blocks.offset
+
+    def _read_exact(self, size):
+        chunk = self._source.read_chunk(size)
+        if len(chunk) != size:
+            raise ValueError("Invalid sparse stream: unexpected end of data")
+        self._blocks.offset += size
+        return chunk
+
+    def read_header(self):
+        magic, version, name_length = _HEADER.unpack(self._read_exact(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError("Invalid sparse stream: bad magic")
+        if version != VERSION:
+            raise ValueError(f"Unsupported sparse stream version: {version}")
+        self.algorithm = self._read_exact(name_length).decode('ascii')
+        self.output_size = _SIZE.unpack(self._read_exact(_SIZE.size))[0]
+        return self.algorithm, self.output_size
+
+    def extents(self):
+        position = 0
+        while True:
+            offset, length = _EXTENT.unpack(self._read_exact(_EXTENT.size))
+            if length == 0:
+                return
+            if offset < position or offset + length > self.output_size:
+                raise ValueError("Invalid sparse stream: extent out of order")
+            # The caller must consume the block iterator before asking for the next extent.
+            yield offset, length, iter(self._blocks)
+            position = offset + length
+
+
+class SparseCompressor(BaseCompressor):
+    def __init__(self, codec_factory, algorithm='lzw', block_size=1024 * 1024):
+        if block_size <= 0:
+            raise ValueError("Block size must be positive")
+        self.algorithm = algorithm
+        self.block_size = block_size
+        self._codec_factory = codec_factory
+        self.stats = {
+            'original_size': 0,
+            'compressed_size': 0,
+            'compression_ratio': 0,
+            'time_taken': 0
+        }
+
+    def compress(self, input_file: Path, output_file: Path, tracker):
+        start_time = time.time()
+        codec = self._codec_factory(self.algorithm)
+        original_size = input_file.stat().st_size
+        data_size = 0
+
+        with FileHandler() as fh, FileHandler() as fh_out:
+            fh.open_file(input_file, 'rb')
+            fh_out.open_file(output_file, 'wb')
+            name = self.algorithm.encode('ascii')
+            fh_out.write_chunk(_HEADER.pack(MAGIC, VERSION, len(name)) + name + _SIZE.pack(original_size))
+
+            # Holes are never read: only the data extents reported by the filesystem are encoded.
+            for offset, length in data_extents(input_file):
+                fh_out.write_chunk(_EXTENT.pack(offset, length))
+                fh.seek(offset)
+                remaining = length
+                while remaining > 0:
+                    raw = fh.read_chunk(min(self.block_size, remaining))
+                    if not raw:
+                        raise ValueError("Input file shrank during compression")
+                    fh_out.write_chunk(pack_block(raw, codec.compress_data(raw)))
+                    remaining -= len(raw)
+                    if tracker:
+                        tracker.update(offset + length - remaining)
+                fh_out.write_chunk(END_OF_STREAM)
+                data_size += length
+
+            fh_out.write_chunk(_EXTENT.pack(original_size, 0))
+
+        compressed_size = output_file.stat().st_size
+        self.stats = {
+            'original_size': original_size,
+            'compressed_size': compressed_size,
+            'compression_ratio': max(0, (1 - (compressed_size / original_size)) * 100) if original_size > 0 else 0,
+            'data_size': data_size,
+            'hole_size': original_size - data_size,
+            'time_taken': time.time() - start_time
+        }
+        return self.stats
+
+    def decompress(self, input_file: Path, output_file: Path, tracker):
+        start_time = time.time()
+        data_size = 0
+
+        with FileHandler() as fh, FileHandler() as fh_out:
+            fh.open_file(input_file, 'rb')
+            fh_out.open_file(output_file, 'wb')
+            reader = SparseReader(fh)
+            algorithm, output_size = reader.read_header()
+            codec = self._codec_factory(algorithm)
+
+            for offset, length, blocks in reader.extents():
+                # Seeking past the end leaves the skipped range as a hole.
+                fh_out.seek(offset)
+                written = 0
+                for raw_length, checksum, compressed in blocks:
+                    raw = codec.decompress_data(compressed)
+                    check_block(raw, raw_length, checksum)
+                    fh_out.write_chunk(raw)
+                    written += len(raw)
+                    if tracker:
+                        tracker.update(min(reader.offset, tracker.stats.total_bytes))
+                if written != length:
+                    raise ValueError("Invalid sparse stream: extent size mismatch")
+                data_size += length
+
+            fh_out.truncate(output_size)
+
+        original_size = input_file.stat().st_size
+        self.stats = {
+            'original_size': original_size,
+            'compressed_size': original_size,
+            'decompressed_size': output_size,
+            'compression_ratio': max(0, (1 - (original_size / output_size)) * 100) if output_size > 0 else 0,
+            'data_size': data_size,
+            'hole_size': output_size - data_size,
+            'time_taken': time.time() - start_time
+        }
+        return self.stats
+
+    def get_compression_stats(self):
+        return self.stats.copy()
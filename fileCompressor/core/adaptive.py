@@ -0,0 +1,84 @@
+import random
+from pathlib import Path
+from utils.metrics_log import file_magic, file_type, size_bucket
+
+OBJECTIVES = ('throughput', 'ratio', 'weighted')
+
+
+def file_signature(file_path: Path):
+    return file_type(file_path), file_magic(file_path), size_bucket(Path(file_path).stat().st_size)
+
+
+class AdaptiveSelector:
+    def __init__(self, metrics_log=None, objective='weighted', ratio_weight=0.5, epsilon=0.05, rng=None):
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective: {objective}. Choose from: {', '.join(OBJECTIVES)}")
+        if not 0 <= epsilon <= 1 or not 0 <= ratio_weight <= 1:
+            raise ValueError("epsilon and ratio_weight must be between 0 and 1")
+        self.metrics_log = metrics_log
+        self.objective = objective
+        self.ratio_weight = ratio_weight
+        self.epsilon = epsilon
+        self._rng = rng or random.Random()
+        # signature -> {algorithm: [operations, ratio_sum, throughput_sum]}, loaded from the log on first use
+        self._arms = None
+        self._best = {}
+
+    def _model(self):
+        if self._arms is None:
+            self._arms = {}
+            records = self.metrics_log.records() if self.metrics_log is not None else ()
+            for record in records:
+                if record.get('operation') != 'compress' or record.get('algorithm', 'auto') == 'auto' or \
+                        record.get('cancelled') or record.get('cache_hit'):
+                    continue
+                signature = (record.get('file_type', ''), record.get('magic', ''), record.get('size_bucket', ''))
+                self._add(signature, record['algorithm'], record.get('compression_ratio', 0),
+                          record.get('throughput', 0))
+            for signature in self._arms:
+                self._best[signature] = self._rank(signature)
+        return self._arms
+
+    def _add(self, signature, algorithm, ratio, throughput):
+        arm = self._arms.setdefault(signature, {}).setdefault(algorithm, [0, 0.0, 0.0])
+        arm[0] += 1
+        arm[1] += ratio
+        arm[2] += throughput
+
+    def _score(self, arm, max_throughput):
+        operations, ratio_sum, throughput_sum = arm
+        ratio, throughput = ratio_sum / operations, throughput_sum / operations
+        if self.objective == 'ratio':
+            return ratio
+        if self.objective == 'throughput':
+            return throughput
+        speed = throughput / max_throughput if max_throughput > 0 else 0.0
+        return self.ratio_weight * ratio / 100 + (1 - self.ratio_weight) * speed
+
+    def _rank(self, signature):
+        arms = self._arms[signature]
+        max_throughput = max(arm[2] / arm[0] for arm in arms.values())
+        return max(sorted(arms), key=lambda algorithm: self._score(arms[algorithm], max_throughput))
+
+    def best(self, signature):
+        self._model()
+        return self._best.get(signature)
+
+    def choose(self, file_path: Path, candidates):
+        signature = file_signature(file_path)
+        arms = self._model().get(signature, {})
+        candidates = list(candidates)
+        if candidates and self._rng.random() < self.epsilon:
+            untried = [algorithm for algorithm in candidates if algorithm not in arms]
+            return self._rng.choice(untried or candidates)
+
+        best = self._best.get(signature)
+        return best if best in candidates else None
+
+    def observe(self, file_path: Path, algorithm, stats):
+        time_taken = stats.get('time_taken', 0)
+        throughput = stats.get('original_size', 0) / time_taken / 1024 ** 2 if time_taken > 0 else 0.0
+        signature = file_signature(file_path)
+        self._model()
+        self._add(signature, algorithm, stats.get('compression_ratio', 0), throughput)
+        self._best[signature] = self._rank(signature)
@@ -0,0 +1,233 @@
+import os
+import shutil
+import struct
+import tempfile
+import time
+import zlib
+from pathlib import Path
+from core.compression_engine import CompressionEngine
+from core import solid_archive
+from core.solid_archive import SolidArchive, iter_input_files
+from utils.file_handler import FileHandler
+from utils.progress_tracker import ProgressTracker
+
+MAGIC = b'FCAR'
+VERSION = 1
+
+_HEADER = struct.Struct('>4sB')
+_TRAILER = struct.Struct('>QII4s')
+_ENTRY = struct.Struct('>HBQQQdII')
+
+
+def _entry_tracker(tracker, entry):
+    # Codecs report compressed bytes read, while the caller's tracker counts the entry's original bytes.
+    if tracker is None or entry['compressed_size'] <= 0:
+        return None
+    scale = tracker.stats.total_bytes / entry['compressed_size']
+    codec_tracker = ProgressTracker(entry['compressed_size'], token=tracker.token, deadline=tracker.deadline)
+    codec_tracker.add_listener(lambda stats: tracker.update(
+        min(int(stats.bytes_processed * scale), tracker.stats.total_bytes)))
+    return codec_tracker
+
+
+def _temp_path(directory: Path):
+    fd, path = tempfile.mkstemp(dir=directory, prefix='.archive-', suffix='.tmp')
+    os.close(fd)
+    return Path(path)
+
+
+def _file_crc(file_path: Path):
+    checksum = 0
+    with FileHandler() as fh:
+        fh.open_file(file_path, 'rb')
+        while True:
+            chunk = fh.read_chunk(fh.chunk_size * 8)
+            if not chunk:
+                break
+            checksum = zlib.crc32(chunk, checksum)
+    return checksum
+
+
+def _copy_range(source, destination, length, chunk_size=1024 * 1024):
+    while length > 0:
+        chunk = source.read(min(chunk_size, length))
+        if not chunk:
+            raise ValueError("Invalid archive: entry data is truncated")
+        destination.write(chunk)
+        length -= len(chunk)
+
+
+class Archive:
+    def __init__(self, archive_file: Path, engine=None):
+        self.archive_file = Path(archive_file)
+        self._engine = engine or CompressionEngine()
+        self.entries = {}
+        self._directory_offset = _HEADER.size
+        if self.archive_file.exists():
+            self._read_directory()
+        else:
+            with open(self.archive_file, 'wb') as f:
+                f.write(_HEADER.pack(MAGIC, VERSION))
+            self._write_directory()
+
+    def _read_directory(self):
+        with open(self.archive_file, 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size or f.seek(0, 2) < _HEADER.size + _TRAILER.size:
+                raise ValueError("Invalid archive: file too short")
+            magic, version = _HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError("Invalid archive: bad magic")
+            if version != VERSION:
+                raise ValueError(f"Unsupported archive version: {version}")
+
+            f.seek(-_TRAILER.size, 2)
+            directory_offset, directory_length, count, trailer_magic = _TRAILER.unpack(f.read(_TRAILER.size))
+            if trailer_magic != MAGIC:
+                raise ValueError("Invalid archive: missing central directory")
+            f.seek(directory_offset)
+            directory = f.read(directory_length)
+
+        position = 0
+        for _ in range(count):
+            name_length, algorithm_length, offset, compressed_size, size, mtime, mode, crc = \
+                _ENTRY.unpack_from(directory, position)
+            position += _ENTRY.size
+            name = directory[position:position + name_length].decode('utf-8')
+            position += name_length
+            algorithm = directory[position:position + algorithm_length].decode('ascii')
+            position += algorithm_length
+            self.entries[name] = {
+                'name': name,
+                'algorithm': algorithm,
+                'offset': offset,
+                'compressed_size': compressed_size,
+                'size': size,
+                'mtime': mtime,
+                'mode': mode,
+                'crc32': crc
+            }
+        self._directory_offset = directory_offset
+
+    def _write_directory(self, f=None):
+        directory = bytearray()
+        for entry in self.entries.values():
+            name = entry['name'].encode('utf-8')
+            algorithm = entry['algorithm'].encode('ascii')
+            directory.extend(_ENTRY.pack(len(name), len(algorithm), entry['offset'], entry['compressed_size'],
+                                         entry['size'], entry['mtime'], entry['mode'], entry['crc32']))
+            directory.extend(name + algorithm)
+        trailer = _TRAILER.pack(self._directory_offset, len(directory), len(self.entries), MAGIC)
+
+        if f is None:
+            with open(self.archive_file, 'r+b') as f:
+                self._write_directory(f)
+            return
+        f.seek(self._directory_offset)
+        f.write(bytes(directory) + trailer)
+        f.truncate()
+
+    def list(self):
+        return list(self.entries.values())
+
+    def add_file(self, input_file: Path, name=None, algorithm=None, tracker=None):
+        start_time = time.time()
+        name = name or input_file.name
+        if name in self.entries:
+            raise ValueError(f"Duplicate archive entry: {name}")
+
+        compressor = self._engine.get_compressor(input_file, algorithm)
+        temp_file = _temp_path(self.archive_file.parent)
+        try:
+            stats = compressor.compress(input_file, temp_file, tracker)
+            stat = input_file.stat()
+            entry = {
+                'name': name,
+                'algorithm': self._engine.algorithm_name(compressor),
+                'offset': self._directory_offset,
+                'compressed_size': temp_file.stat().st_size,
+                'size': stat.st_size,
+                'mtime': stat.st_mtime,
+                'mode': stat.st_mode & 0o7777,
+                'crc32': _file_crc(input_file)
+            }
+
+            # New data overwrites the old central directory; existing entries are never moved.
+            with open(self.archive_file, 'r+b') as f, open(temp_file, 'rb') as data:
+                f.seek(self._directory_offset)
+                shutil.copyfileobj(data, f)
+                self.entries[name] = entry
+                self._directory_offset = f.tell()
+                self._write_directory(f)
+        finally:
+            temp_file.unlink(missing_ok=True)
+
+        stats['time_taken'] = time.time() - start_time
+        return stats
+
+    def add_files(self, inputs, algorithm=None):
+        start_time = time.time()
+        original_size = 0
+        compressed_size = 0
+        added = 0
+        for path, name in iter_input_files(inputs):
+            self.add_file(path, name, algorithm)
+            original_size += self.entries[name]['size']
+            compressed_size += self.entries[name]['compressed_size']
+            added += 1
+
+        return {
+            'original_size': original_size,
+            'compressed_size': compressed_size,
+            'compression_ratio': max(0, (1 - compressed_size / original_size) * 100) if original_size else 0,
+            'files': added,
+            'time_taken': time.time() - start_time
+        }
+
+    def extract(self, name, output_file: Path, tracker=None):
+        start_time = time.time()
+        entry = self.entries.get(name)
+        if entry is None:
+            raise ValueError(f"No such archive entry: {name}")
+
+        compressor = self._engine.get_compressor(None, entry['algorithm'])
+        temp_file = _temp_path(Path(output_file).parent)
+        try:
+            with open(self.archive_file, 'rb') as f, open(temp_file, 'wb') as data:
+                f.seek(entry['offset'])
+                _copy_range(f, data, entry['compressed_size'])
+            stats = compressor.decompress(temp_file, output_file, _entry_tracker(tracker, entry))
+
+            if output_file.stat().st_size != entry['size'] or _file_crc(output_file) != entry['crc32']:
+                raise ValueError(f"Archive entry {name} failed its checksum")
+        except BaseException:
+            Path(output_file).unlink(missing_ok=True)
+            raise
+        finally:
+            temp_file.unlink(missing_ok=True)
+
+        os.chmod(output_file, entry['mode'])
+        os.utime(output_file, (entry['mtime'], entry['mtime']))
+
+        stats['time_taken'] = time.time() - start_time
+        return stats
+
+    def extract_all(self, directory: Path):
+        directory = Path(directory)
+        for name in self.entries:
+            output_file = directory / name
+            if directory.resolve() not in output_file.resolve().parents:
+                raise ValueError(f"Unsafe archive entry name: {name}")
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+            self.extract(name, output_file)
+        return len(self.entries)
+
+
+def open_archive(archive_file: Path, engine=None):
+    with open(archive_file, 'rb') as f:
+        magic = f.read(4)
+    if magic == solid_archive.MAGIC:
+        return SolidArchive(archive_file, engine)
+    if magic == MAGIC:
+        return Archive(archive_file, engine)
+    raise ValueError(f"Not an archive: {archive_file}")
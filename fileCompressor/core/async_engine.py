@@ -0,0 +1,303 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+from core.block_format import BlockParser, BlockReader, END_OF_STREAM, check_block, pack_block, pack_header
+from core.compression_engine import compress_block, decompress_block
+from utils.file_handler import FileHandler
+from utils.io_tuning import tuned_block_size
+from utils.memory_budget import MemoryBudget
+
+DEFAULT_BLOCK_SIZE = 256 * 1024
+DEFAULT_MAX_PENDING = 4
+
+
+def create_executor(kind='thread', max_workers=None, max_memory=None) -> Executor:
+    if max_memory is not None:
+        max_workers = MemoryBudget(max_memory).workers(max_workers)
+    if kind == 'thread':
+        return ThreadPoolExecutor(max_workers=max_workers)
+    if kind == 'process':
+        return ProcessPoolExecutor(max_workers=max_workers)
+    raise ValueError(f"Unknown executor kind: {kind}")
+
+
+def _cancel_pending(pending):
+    for future in pending:
+        future.cancel()
+    pending.clear()
+
+
+class _BlockPipeline:
+    def __init__(self, function, algorithm, executor, max_pending, options=(), instrumentation=None, stage=None):
+        if max_pending <= 0:
+            raise ValueError("Max pending blocks must be positive")
+        self._function = function
+        self._algorithm = algorithm
+        # Extra positional arguments for the block function, e.g. the dictionary id and memory budget.
+        self._options = options
+        self._executor = executor
+        self._max_pending = max_pending
+        self._pending = deque()
+        self._instrumentation = instrumentation
+        self._stage = stage
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def submit(self, data: bytes, *context):
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, self._function, self._algorithm, data, *self._options)
+        self._pending.append((future, data, context))
+
+    async def collect(self, drain=False):
+        results = []
+        try:
+            while self._pending and (drain or len(self._pending) >= self._max_pending):
+                future, data, context = self._pending[0]
+                if self._instrumentation is None:
+                    result = await future
+                else:
+                    # Workers report nothing back, so the stage time is how long the writer waited on them.
+                    wait_start = self._instrumentation.clock()
+                    result = await future
+                    self._instrumentation.record(self._stage, self._instrumentation.clock() - wait_start,
+                                                 len(data))
+                self._pending.popleft()
+                results.append((data, result, context))
+        except BaseException:
+            self.cancel()
+            raise
+        return results
+
+    def cancel(self):
+        _cancel_pending([future for future, _, _ in self._pending])
+        self._pending.clear()
+
+
+async def compress_async(input_file: Path, output_file: Path, algorithm='lzw', executor: Optional[Executor] = None,
+                         block_size=None, max_pending=DEFAULT_MAX_PENDING, max_memory=None, tracker=None,
+                         dictionary_id=None, instrumentation=None):
+    start_time = time.time()
+    bytes_processed = 0
+    if block_size is None:
+        block_size = tuned_block_size(input_file, DEFAULT_BLOCK_SIZE)
+    if max_memory is not None:
+        block_size, max_pending = MemoryBudget(max_memory).parallel_plan(block_size, max_pending)
+    pipeline = _BlockPipeline(compress_block, algorithm, executor, max_pending, (dictionary_id, max_memory),
+                              instrumentation, 'encode')
+
+    try:
+        with FileHandler(block_size, instrumentation) as fh, FileHandler(instrumentation=instrumentation) as fh_out:
+            fh.open_file(input_file, 'rb')
+            fh_out.open_file(output_file, 'wb')
+            fh_out.write_chunk(pack_header(algorithm, block_size))
+
+            while True:
+                data = fh.read_chunk(block_size)
+                if not data:
+                    break
+                pipeline.submit(data)
+                for raw, compressed, _ in await pipeline.collect():
+                    fh_out.write_chunk(pack_block(raw, compressed))
+                    bytes_processed += len(raw)
+                    if tracker:
+                        tracker.update(bytes_processed)
+
+            for raw, compressed, _ in await pipeline.collect(drain=True):
+                fh_out.write_chunk(pack_block(raw, compressed))
+                bytes_processed += len(raw)
+                if tracker:
+                    tracker.update(bytes_processed)
+            fh_out.write_chunk(END_OF_STREAM)
+    except BaseException:
+        pipeline.cancel()
+        output_file.unlink(missing_ok=True)
+        raise
+
+    original_size = input_file.stat().st_size
+    compressed_size = output_file.stat().st_size
+    compression_ratio = max(0, (1 - (compressed_size / original_size)) * 100) if original_size > 0 else 0
+    stats = {
+        'original_size': original_size,
+        'compressed_size': compressed_size,
+        'compression_ratio': compression_ratio,
+        'time_taken': time.time() - start_time
+    }
+    if instrumentation is not None:
+        stats.update(instrumentation.report())
+    return stats
+
+
+async def decompress_async(input_file: Path, output_file: Path, executor: Optional[Executor] = None,
+                           max_pending=DEFAULT_MAX_PENDING, max_memory=None, tracker=None, instrumentation=None):
+    start_time = time.time()
+    decompressed_size = 0
+
+    try:
+        with FileHandler(instrumentation=instrumentation) as fh, \
+                FileHandler(instrumentation=instrumentation) as fh_out:
+            fh.open_file(input_file, 'rb')
+            fh_out.open_file(output_file, 'wb')
+            reader = BlockReader(fh)
+            algorithm, block_size = reader.read_header()
+            if max_memory is not None:
+                max_pending = MemoryBudget(max_memory).max_pending(max(block_size, 1), max_pending)
+            # Blocks name their own dictionary in their header, so only the memory budget is passed on.
+            pipeline = _BlockPipeline(decompress_block, algorithm, executor, max_pending, (None, max_memory),
+                                      instrumentation, 'decode')
+
+            try:
+                for raw_length, checksum, compressed in reader:
+                    pipeline.submit(compressed, raw_length, checksum, reader.offset)
+                    for _, raw, (length, crc, offset) in await pipeline.collect():
+                        check_block(raw, length, crc)
+                        fh_out.write_chunk(raw)
+                        decompressed_size += len(raw)
+                        if tracker:
+                            tracker.update(min(offset, tracker.stats.total_bytes))
+
+                for _, raw, (length, crc, offset) in await pipeline.collect(drain=True):
+                    check_block(raw, length, crc)
+                    fh_out.write_chunk(raw)
+                    decompressed_size += len(raw)
+                    if tracker:
+                        tracker.update(min(offset, tracker.stats.total_bytes))
+            except BaseException:
+                pipeline.cancel()
+                raise
+    except BaseException:
+        output_file.unlink(missing_ok=True)
+        raise
+
+    original_size = input_file.stat().st_size
+    compression_ratio = max(0, (1 - (original_size / decompressed_size)) * 100) if decompressed_size > 0 else 0
+    stats = {
+        'original_size': original_size,
+        'compressed_size': original_size,
+        'decompressed_size': decompressed_size,
+        'compression_ratio': compression_ratio,
+        'time_taken': time.time() - start_time
+    }
+    if instrumentation is not None:
+        stats.update(instrumentation.report())
+    return stats
+
+
+class AsyncCompressionStream:
+    def __init__(self, algorithm='lzw', executor: Optional[Executor] = None,
+                 block_size=DEFAULT_BLOCK_SIZE, max_pending=DEFAULT_MAX_PENDING, max_memory=None):
+        if block_size <= 0:
+            raise ValueError("Block size must be positive")
+        if max_memory is not None:
+            block_size, max_pending = MemoryBudget(max_memory).parallel_plan(block_size, max_pending)
+        self._algorithm = algorithm
+        self._block_size = block_size
+        self._pipeline = _BlockPipeline(compress_block, algorithm, executor, max_pending)
+        self._buffer = bytearray()
+        self._header_sent = False
+        self._closed = False
+
+    async def write(self, data: bytes) -> bytes:
+        if self._closed:
+            raise ValueError("Stream is closed")
+        self._buffer.extend(data)
+        output = bytearray()
+        while len(self._buffer) >= self._block_size:
+            block = bytes(self._buffer[:self._block_size])
+            del self._buffer[:self._block_size]
+            self._pipeline.submit(block)
+            output.extend(await self._emit(drain=False))
+        return bytes(output)
+
+    async def close(self) -> bytes:
+        if self._closed:
+            return b''
+        if self._buffer:
+            self._pipeline.submit(bytes(self._buffer))
+            self._buffer.clear()
+        output = await self._emit(drain=True)
+        if not self._header_sent:
+            output = pack_header(self._algorithm, self._block_size) + output
+            self._header_sent = True
+        self._closed = True
+        return output + END_OF_STREAM
+
+    def cancel(self):
+        self._pipeline.cancel()
+        self._buffer.clear()
+        self._closed = True
+
+    async def _emit(self, drain):
+        output = bytearray()
+        for raw, compressed, _ in await self._pipeline.collect(drain=drain):
+            if not self._header_sent:
+                output.extend(pack_header(self._algorithm, self._block_size))
+                self._header_sent = True
+            output.extend(pack_block(raw, compressed))
+        return bytes(output)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            self.cancel()
+
+
+class AsyncDecompressionStream:
+    def __init__(self, executor: Optional[Executor] = None, max_pending=DEFAULT_MAX_PENDING, max_memory=None):
+        self._executor = executor
+        self._max_pending = max_pending
+        self._budget = MemoryBudget(max_memory) if max_memory is not None else None
+        self._parser = BlockParser()
+        self._pipeline = None
+
+    @property
+    def finished(self):
+        return self._parser.finished and (self._pipeline is None or self._pipeline.pending == 0)
+
+    async def write(self, data: bytes) -> bytes:
+        blocks = self._parser.feed(data)
+        if self._pipeline is None and self._parser.algorithm is not None:
+            if self._budget is not None:
+                self._max_pending = self._budget.max_pending(max(self._parser.block_size, 1), self._max_pending)
+            self._pipeline = _BlockPipeline(decompress_block, self._parser.algorithm,
+                                            self._executor, self._max_pending)
+
+        output = bytearray()
+        for raw_length, checksum, compressed in blocks:
+            self._pipeline.submit(compressed, raw_length, checksum)
+            output.extend(await self._emit(drain=False))
+        if self._parser.finished:
+            output.extend(await self._emit(drain=True))
+        return bytes(output)
+
+    async def close(self) -> bytes:
+        output = await self._emit(drain=True)
+        if not self._parser.finished:
+            raise ValueError("Invalid block stream: missing end of stream")
+        return output
+
+    def cancel(self):
+        if self._pipeline is not None:
+            self._pipeline.cancel()
+
+    async def _emit(self, drain):
+        if self._pipeline is None:
+            return b''
+        output = bytearray()
+        for _, raw, (raw_length, checksum) in await self._pipeline.collect(drain=drain):
+            check_block(raw, raw_length, checksum)
+            output.extend(raw)
+        return bytes(output)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            self.cancel()
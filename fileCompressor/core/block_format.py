@@ -0,0 +1,127 @@
+import struct
+import zlib
+from pathlib import Path
+
+MAGIC = b'FCBK'
+VERSION = 1
+
+_HEADER = struct.Struct('>4sBB')
+_BLOCK_SIZE_FIELD = struct.Struct('>I')
+_BLOCK = struct.Struct('>III')
+
+END_OF_STREAM = _BLOCK.pack(0, 0, 0)
+
+
+def pack_header(algorithm: str, block_size) -> bytes:
+    name = algorithm.encode('ascii')
+    return _HEADER.pack(MAGIC, VERSION, len(name)) + name + _BLOCK_SIZE_FIELD.pack(block_size)
+
+
+def pack_block(raw: bytes, compressed: bytes) -> bytes:
+    return _BLOCK.pack(len(raw), len(compressed), zlib.crc32(raw)) + compressed
+
+
+def is_block_stream(file_path: Path, algorithms=None):
+    try:
+        with open(file_path, 'rb') as f:
+            if algorithms is None:
+                return f.read(len(MAGIC)) == MAGIC
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                return False
+            magic, version, name_length = _HEADER.unpack(header)
+            return magic == MAGIC and version == VERSION and \
+                f.read(name_length).decode('ascii', 'replace') in algorithms
+    except OSError:
+        return False
+
+
+class BlockReader:
+    def __init__(self, source):
+        self._source = source
+        self.algorithm = None
+        self.block_size = 0
+        self.offset = 0
+
+    def _read_exact(self, size):
+        data = self._source.read_chunk(size)
+        if len(data) != size:
+            raise ValueError("Invalid block stream: unexpected end of data")
+        self.offset += size
+        return data
+
+    def read_header(self):
+        magic, version, name_length = _HEADER.unpack(self._read_exact(_HEADER.size))
+        if magic != MAGIC:
+            raise ValueError("Invalid block stream: bad magic")
+        if version != VERSION:
+            raise ValueError(f"Unsupported block stream version: {version}")
+
+        self.algorithm = self._read_exact(name_length).decode('ascii')
+        self.block_size = _BLOCK_SIZE_FIELD.unpack(self._read_exact(_BLOCK_SIZE_FIELD.size))[0]
+        return self.algorithm, self.block_size
+
+    def read_block(self):
+        raw_length, compressed_length, checksum = _BLOCK.unpack(self._read_exact(_BLOCK.size))
+        if raw_length == 0 and compressed_length == 0:
+            return None
+        return raw_length, checksum, self._read_exact(compressed_length)
+
+    def __iter__(self):
+        while True:
+            block = self.read_block()
+            if block is None:
+                return
+            yield block
+
+
+class BlockParser:
+    def __init__(self):
+        self._buffer = bytearray()
+        self.algorithm = None
+        self.block_size = 0
+        self.finished = False
+
+    def feed(self, data: bytes):
+        if self.finished and data:
+            raise ValueError("Invalid block stream: data after end of stream")
+        self._buffer.extend(data)
+        blocks = []
+
+        if self.algorithm is None:
+            if len(self._buffer) < _HEADER.size:
+                return blocks
+            magic, version, name_length = _HEADER.unpack_from(self._buffer)
+            if magic != MAGIC:
+                raise ValueError("Invalid block stream: bad magic")
+            if version != VERSION:
+                raise ValueError(f"Unsupported block stream version: {version}")
+            header_size = _HEADER.size + name_length + _BLOCK_SIZE_FIELD.size
+            if len(self._buffer) < header_size:
+                return blocks
+            self.algorithm = bytes(self._buffer[_HEADER.size:_HEADER.size + name_length]).decode('ascii')
+            self.block_size = _BLOCK_SIZE_FIELD.unpack_from(self._buffer, header_size - _BLOCK_SIZE_FIELD.size)[0]
+            del self._buffer[:header_size]
+
+        while not self.finished and len(self._buffer) >= _BLOCK.size:
+            raw_length, compressed_length, checksum = _BLOCK.unpack_from(self._buffer)
+            if raw_length == 0 and compressed_length == 0:
+                self.finished = True
+                del self._buffer[:_BLOCK.size]
+                break
+            end = _BLOCK.size + compressed_length
+            if len(self._buffer) < end:
+                break
+            blocks.append((raw_length, checksum, bytes(self._buffer[_BLOCK.size:end])))
+            del self._buffer[:end]
+
+        if self.finished and self._buffer:
+            raise ValueError("Invalid block stream: data after end of stream")
+        return blocks
+
+
+def check_block(raw: bytes, raw_length, checksum):
+    if len(raw) != raw_length:
+        raise ValueError(f"Block size mismatch: expected {raw_length}, got {len(raw)}")
+    if zlib.crc32(raw) != checksum:
+        raise ValueError("Block checksum mismatch")
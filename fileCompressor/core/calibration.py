@@ -0,0 +1,76 @@
+import asyncio
+import os
+import random
+import time
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Optional
+from core.async_engine import compress_async
+from utils.io_tuning import get_tuning, measure_io, mount_point
+
+CHUNK_SIZES = (4 * 1024, 8 * 1024, 64 * 1024, 256 * 1024, 1024 ** 2)
+BLOCK_SIZES = (64 * 1024, 256 * 1024, 1024 ** 2, 4 * 1024 ** 2)
+_WORDS = (b'the', b'quick', b'brown', b'fox', b'jumps', b'over', b'lazy', b'dog', b'block', b'chunk',
+          b'mount', b'file', b'2024-01-01', b'INFO', b'ERROR', b'\n')
+
+
+def _write_sample(sample_file: Path, size, seed=1234):
+    rng = random.Random(seed)
+    with open(sample_file, 'wb') as f:
+        written = 0
+        while written < size:
+            chunk = b' '.join(rng.choice(_WORDS) for _ in range(8192))[:size - written]
+            f.write(chunk)
+            written += len(chunk)
+
+
+def measure_blocks(directory: Path, block_size, algorithm='lzw', sample_size=4 * 1024 ** 2,
+                   executor: Optional[Executor] = None):
+    sample_file = Path(directory) / f".block_calibration.{os.getpid()}"
+    output_file = sample_file.with_suffix('.out')
+    try:
+        _write_sample(sample_file, sample_size)
+        start_time = time.perf_counter()
+        asyncio.run(compress_async(sample_file, output_file, algorithm, executor, block_size=block_size))
+        time_taken = time.perf_counter() - start_time
+    finally:
+        sample_file.unlink(missing_ok=True)
+        output_file.unlink(missing_ok=True)
+    return {
+        'block_size': block_size,
+        'compress_mbps': sample_size / time_taken / 1024 ** 2 if time_taken > 0 else 0.0
+    }
+
+
+def calibrate(directory: Path, chunk_sizes=CHUNK_SIZES, block_sizes=BLOCK_SIZES, algorithm='lzw',
+              io_sample_size=16 * 1024 ** 2, block_sample_size=4 * 1024 ** 2, executor: Optional[Executor] = None,
+              tuning=None, log=None):
+    directory = Path(directory)
+    if not directory.is_dir():
+        raise ValueError(f"Not a directory: {directory}")
+    tuning = tuning or get_tuning()
+
+    io_results = []
+    for chunk_size in chunk_sizes:
+        io_results.append(measure_io(directory, chunk_size, io_sample_size))
+        if log:
+            log(io_results[-1])
+    block_results = []
+    for block_size in block_sizes:
+        block_results.append(measure_blocks(directory, block_size, algorithm, block_sample_size, executor))
+        if log:
+            log(block_results[-1])
+
+    # The chunk size wins on the time to write and read back the sample, so neither direction dominates.
+    best_io = min(io_results, key=lambda r: 1 / max(r['write_mbps'], 1e-9) + 1 / max(r['read_mbps'], 1e-9))
+    best_block = max(block_results, key=lambda r: r['compress_mbps'])
+    parameters = {
+        'chunk_size': best_io['chunk_size'],
+        'block_size': best_block['block_size'],
+        'read_mbps': best_io['read_mbps'],
+        'write_mbps': best_io['write_mbps'],
+        'compress_mbps': best_block['compress_mbps']
+    }
+    mount = mount_point(directory)
+    tuning.store(mount, parameters)
+    return mount, parameters
@@ -0,0 +1,136 @@
+import json
+import os
+import time
+from pathlib import Path
+from core.block_format import END_OF_STREAM, pack_block, pack_header
+from utils.file_handler import FileHandler
+
+CHECKPOINT_VERSION = 1
+DEFAULT_BLOCK_SIZE = 4 * 1024 * 1024
+DEFAULT_CHECKPOINT_INTERVAL = 16
+
+
+def partial_path(output_file: Path):
+    return output_file.with_name(f"{output_file.name}.partial")
+
+
+def checkpoint_path(output_file: Path):
+    return output_file.with_name(f"{output_file.name}.checkpoint")
+
+
+def _input_fingerprint(input_file: Path):
+    stat = input_file.stat()
+    return {'input_size': stat.st_size, 'input_mtime_ns': stat.st_mtime_ns}
+
+
+def _write_checkpoint(path: Path, checkpoint):
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temp_path.write_text(json.dumps(checkpoint))
+    os.replace(temp_path, path)
+
+
+def load_checkpoint(output_file: Path):
+    path = checkpoint_path(output_file)
+    if not path.exists():
+        raise ValueError(f"No checkpoint found for {output_file}")
+    checkpoint = json.loads(path.read_text())
+    if checkpoint.get('version') != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version: {checkpoint.get('version')}")
+    return checkpoint
+
+
+def _usable_checkpoint(input_file: Path, output_file: Path, algorithm, block_size):
+    try:
+        checkpoint = load_checkpoint(output_file)
+    except (ValueError, OSError):
+        return None
+    if checkpoint['input'] != str(input_file.resolve()) or checkpoint['algorithm'] != algorithm or \
+            checkpoint['block_size'] != block_size or checkpoint['fingerprint'] != _input_fingerprint(input_file):
+        return None
+    partial = partial_path(output_file)
+    if not partial.exists() or partial.stat().st_size < checkpoint['output_offset']:
+        return None
+    return checkpoint
+
+
+def compress_resumable(input_file: Path, output_file: Path, codec, algorithm, tracker=None,
+                       block_size=DEFAULT_BLOCK_SIZE, checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL):
+    if block_size <= 0 or checkpoint_interval <= 0:
+        raise ValueError("Block size and checkpoint interval must be positive")
+    start_time = time.time()
+    input_file = Path(input_file)
+    output_file = Path(output_file)
+    partial = partial_path(output_file)
+    checkpoint_file = checkpoint_path(output_file)
+
+    # Every block is compressed on its own, so a block boundary is a restart point with no codec state to save.
+    checkpoint = _usable_checkpoint(input_file, output_file, algorithm, block_size)
+    resumed_from = checkpoint['input_offset'] if checkpoint else 0
+    if checkpoint is None:
+        checkpoint = {
+            'version': CHECKPOINT_VERSION,
+            'input': str(input_file.resolve()),
+            'output': str(output_file.resolve()),
+            'algorithm': algorithm,
+            'block_size': block_size,
+            'fingerprint': _input_fingerprint(input_file),
+            'input_offset': 0,
+            'output_offset': 0,
+            'blocks': 0
+        }
+        with FileHandler() as fh_out:
+            fh_out.open_file(partial, 'wb')
+            fh_out.write_chunk(pack_header(algorithm, block_size))
+        checkpoint['output_offset'] = partial.stat().st_size
+        # Written before the first block so an early interruption can still be resumed.
+        _write_checkpoint(checkpoint_file, checkpoint)
+
+    with FileHandler() as fh, open(partial, 'r+b') as out:
+        fh.open_file(input_file, 'rb')
+        fh.seek(checkpoint['input_offset'])
+        out.seek(checkpoint['output_offset'])
+        out.truncate()
+
+        while True:
+            raw = fh.read_chunk(block_size)
+            if not raw:
+                break
+            out.write(pack_block(raw, codec.compress_data(raw)))
+            checkpoint['input_offset'] += len(raw)
+            checkpoint['blocks'] += 1
+
+            if checkpoint['blocks'] % checkpoint_interval == 0:
+                out.flush()
+                os.fsync(out.fileno())
+                checkpoint['output_offset'] = out.tell()
+                _write_checkpoint(checkpoint_file, checkpoint)
+            if tracker:
+                tracker.update(checkpoint['input_offset'])
+
+        out.write(END_OF_STREAM)
+        out.flush()
+        os.fsync(out.fileno())
+
+    os.replace(partial, output_file)
+    checkpoint_file.unlink(missing_ok=True)
+
+    original_size = input_file.stat().st_size
+    compressed_size = output_file.stat().st_size
+    return {
+        'original_size': original_size,
+        'compressed_size': compressed_size,
+        'compression_ratio': max(0, (1 - (compressed_size / original_size)) * 100) if original_size > 0 else 0,
+        'resumed_from': resumed_from,
+        'time_taken': time.time() - start_time
+    }
+
+
+def resume_compression(output_file: Path, codec_factory, tracker=None):
+    checkpoint = load_checkpoint(output_file)
+    input_file = Path(checkpoint['input'])
+    if not input_file.exists():
+        raise ValueError(f"Input file no longer exists: {input_file}")
+    if checkpoint['fingerprint'] != _input_fingerprint(input_file):
+        raise ValueError(f"Input file changed since the checkpoint was written: {input_file}")
+    return compress_resumable(input_file, output_file, codec_factory(checkpoint['algorithm']),
+                              checkpoint['algorithm'], tracker, checkpoint['block_size'])
@@ -1,24 +1,292 @@
+import time
 from pathlib import Path
-from compressors.rle import RLECompressor
-from compressors.lzw import LZWCompressor
+from compressors.delta import DeltaCompressor
+from compressors.lzw_dictionary import find_dictionary
+from compressors.sparse import SparseCompressor, is_sparse_stream
+from core.block_format import BlockReader, check_block, is_block_stream
+from core.checkpoint import DEFAULT_BLOCK_SIZE, compress_resumable
+from core.registry import default_registry
+from utils.file_handler import FileHandler
+from utils.instrumentation import Instrumentation
+from utils.memory_budget import MemoryBudget, PeakMemory
+from utils.progress_tracker import OperationCancelled
+from utils.result_cache import clone_file
+from utils.sparse import has_holes
+
+MAGIC_PREFIX_SIZE = 16
 
 
 class CompressionEngine:
-    def __init__(self):
-        self._algorithms = {
-            'rle': RLECompressor,
-            'lzw': LZWCompressor
-        }
+    def __init__(self, instrument=False, cache=None, lzw_dictionary=None, checkpoint_threshold=1024 ** 3,
+                 registry=None, metrics_log=None, metrics=None, selector=None, max_memory=None, executor=None):
+        # Algorithms are looked up by name; their modules are imported on first use.
+        self.registry = registry or default_registry
+        self.instrument = instrument
+        self.cache = cache
+        self.lzw_dictionary = lzw_dictionary
+        # Inputs at least this large are written as checkpointed block streams that `resume` can continue.
+        self.checkpoint_threshold = checkpoint_threshold
+        self.metrics_log = metrics_log
+        # Live counters for long-running processes (utils.metrics_registry.CompressionMetrics).
+        self.metrics = metrics
+        # Picks the algorithm for compressions that do not name one (core.adaptive.AdaptiveSelector).
+        self.selector = selector
+        self.max_memory = max_memory
+        # When set, plain files in block-parallel algorithms are written as block streams split across it.
+        self.executor = executor
+
+    @property
+    def max_memory(self):
+        return self.budget.max_memory if self.budget is not None else None
+
+    @max_memory.setter
+    def max_memory(self, value):
+        # Block sizes, LZW table memory and delta index granularity are derived from this budget.
+        self.budget = MemoryBudget(value) if value is not None else None
 
     @property
     def available_algorithms(self):
-        return list(self._algorithms.keys())
+        return self.registry.names()
 
-    def get_compressor(self, file_path: Path, algorithm):
+    def select_algorithm(self, file_path: Path, algorithm):
         if algorithm:
-            if algorithm not in self._algorithms:
-                raise ValueError(f"Unknown compression algorithm: {algorithm}")
-            return self._algorithms[algorithm]()
+            return algorithm
+        return 'lzw' if file_path.stat().st_size > 1024 * 1024 else 'rle'
+
+    def choose_algorithm(self, input_file: Path):
+        if self.selector is not None:
+            algorithm = self.selector.choose(input_file, self.registry.names('streaming'))
+            if algorithm:
+                return algorithm
+        return self.select_algorithm(input_file, None)
+
+    def detect_algorithm(self, input_file: Path, algorithm=None):
+        # Every codec now writes a magic that no other format can start with, so it names the codec outright.
+        # Files from before RLE and LZW had one fall back to the explicit choice, the extension and the size
+        # heuristic.
+        with open(input_file, 'rb') as f:
+            prefix = f.read(MAGIC_PREFIX_SIZE)
+        return self.registry.detect(prefix) or algorithm or self.registry.for_extension(Path(input_file).suffix) \
+            or self.select_algorithm(input_file, None)
+
+    def get_compressor(self, file_path: Path, algorithm):
+        algorithm = self.select_algorithm(file_path, algorithm)
+        compressor = self.registry.load(algorithm)()
+
+        if self.lzw_dictionary is not None and algorithm == 'lzw':
+            compressor.dictionary = self.lzw_dictionary
+        if self.instrument:
+            compressor.instrumentation = Instrumentation()
+        if self.budget is not None and hasattr(compressor, 'max_memory'):
+            compressor.max_memory = self.budget.max_memory
+        return compressor
+
+    def algorithm_name(self, compressor):
+        return self.registry.name_of(compressor) or type(compressor).__name__
+
+    def _cache_parameters(self, compressor):
+        parameters = {}
+        for name, value in vars(compressor).items():
+            if name in ('stats', 'instrumentation', 'max_memory'):
+                continue
+            if isinstance(value, (int, float, str, bool)):
+                parameters[name] = value
+            elif hasattr(value, 'dictionary_id'):
+                parameters[name] = value.dictionary_id
+        return parameters
+
+    def _codec(self, algorithm):
+        return self.get_compressor(None, algorithm)
+
+    def _stop(self, error: OperationCancelled, output_file: Path, start_time):
+        output_file.unlink(missing_ok=True)
+        error.stats = {
+            'cancelled': True,
+            'reason': error.reason,
+            'bytes_processed': error.bytes_processed,
+            'total_size': error.total_bytes,
+            'time_taken': time.time() - start_time
+        }
+
+    def _record(self, operation, algorithm, mode, input_file: Path, stats):
+        if self.metrics_log is None:
+            return
+        try:
+            self.metrics_log.record(operation, algorithm, mode, input_file, stats)
+        except OSError:
+            pass  # metrics are best effort and must never fail the operation
+
+    def _run(self, operation, run, input_file: Path, output_file: Path, algorithm, tracker):
+        start_time = time.time()
+        if self.metrics is not None:
+            self.metrics.in_flight.inc(operation=operation)
+            if tracker is not None:
+                tracker.add_listener(self.metrics.progress_listener(operation))
+        try:
+            if self.budget is None:
+                stats, algorithm, mode = run()
+            else:
+                with PeakMemory() as peak:
+                    stats, algorithm, mode = run()
+                if peak.peak is not None:
+                    stats['peak_memory'] = peak.peak
+        except OperationCancelled as e:
+            self._stop(e, output_file, start_time)
+            self._record(operation, algorithm, None, input_file, e.stats)
+            if self.metrics is not None:
+                self.metrics.error(operation, algorithm, e.reason)
+            raise
+        except Exception as e:
+            if self.metrics is not None:
+                self.metrics.error(operation, algorithm, type(e).__name__)
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.in_flight.inc(-1, operation=operation)
+        if operation == 'compress' and self.selector is not None and not stats.get('cache_hit'):
+            self.selector.observe(input_file, algorithm, stats)
+        self._record(operation, algorithm, mode, input_file, stats)
+        if self.metrics is not None:
+            self.metrics.observe(operation, algorithm, stats)
+        return stats
+
+    def compress_file(self, input_file: Path, output_file: Path, algorithm, tracker=None, reference=None,
+                      sparse=None):
+        return self._run('compress',
+                         lambda: self._compress_file(input_file, output_file, algorithm, tracker, reference, sparse),
+                         input_file, output_file, algorithm, tracker)
+
+    def decompress_file(self, input_file: Path, output_file: Path, algorithm, tracker=None, reference=None):
+        return self._run('decompress',
+                         lambda: self._decompress_file(input_file, output_file, algorithm, tracker, reference),
+                         input_file, output_file, algorithm, tracker)
+
+    def _compress_file(self, input_file: Path, output_file: Path, algorithm, tracker, reference, sparse):
+        if algorithm is None and self.selector is not None:
+            algorithm = self.selector.choose(input_file, self.registry.names('streaming'))
+        if reference is not None:
+            algorithm = algorithm or 'lzw'
+            if self.budget is None:
+                compressor = DeltaCompressor(reference, self._codec, algorithm)
+            else:
+                compressor = DeltaCompressor(reference, self._codec, algorithm,
+                                             self.budget.delta_block_size(reference.stat().st_size, 64),
+                                             self.budget.block_size(64 * 1024))
+            return compressor.compress(input_file, output_file, tracker), algorithm, 'delta'
+
+        if sparse is None:
+            sparse = has_holes(input_file)
+        if sparse:
+            algorithm = algorithm or 'lzw'
+            block_size = 1024 * 1024 if self.budget is None else self.budget.block_size(1024 * 1024)
+            compressor = SparseCompressor(self._codec, algorithm, block_size)
+            return compressor.compress(input_file, output_file, tracker), algorithm, 'sparse'
+
+        if self.checkpoint_threshold is not None and input_file.stat().st_size >= self.checkpoint_threshold:
+            algorithm = algorithm or 'lzw'
+            block_size = DEFAULT_BLOCK_SIZE if self.budget is None else self.budget.block_size(DEFAULT_BLOCK_SIZE)
+            stats = compress_resumable(input_file, output_file, self._codec(algorithm), algorithm, tracker,
+                                       block_size)
+            return stats, algorithm, 'blocks'
+
+        algorithm = self.select_algorithm(input_file, algorithm)
+        compressor = self.get_compressor(input_file, algorithm)
+        mode = 'blocks' if self.executor is not None and algorithm in self.registry.names('block_parallel') else 'file'
+        if self.cache is None:
+            return self._compress_plain(input_file, output_file, algorithm, compressor, tracker, mode), algorithm, mode
+
+        start_time = time.time()
+        parameters = self._cache_parameters(compressor)
+        if mode == 'blocks':
+            parameters['blocks'] = True
+        key = self.cache.make_key(self.cache.content_hash(input_file), self.algorithm_name(compressor), parameters)
+        cached = self.cache.lookup(key)
+        if cached is not None:
+            cached_file, stats = cached
+            clone_file(cached_file, output_file)
+            stats['time_taken'] = time.time() - start_time
+            stats['cache_hit'] = True
+            return stats, algorithm, mode
+
+        stats = self._compress_plain(input_file, output_file, algorithm, compressor, tracker, mode)
+        self.cache.store(key, output_file, stats)
+        stats['cache_hit'] = False
+        return stats, algorithm, mode
+
+    def _compress_plain(self, input_file: Path, output_file: Path, algorithm, compressor, tracker, mode):
+        if mode == 'file':
+            return compressor.compress(input_file, output_file, tracker)
+
+        # Imported here: the async engine imports this module, and asyncio is only needed in parallel mode.
+        import asyncio
+        from core.async_engine import compress_async
+
+        dictionary = getattr(compressor, 'dictionary', None)
+        return asyncio.run(compress_async(input_file, output_file, algorithm, self.executor,
+                                          max_memory=self.max_memory, tracker=tracker,
+                                          dictionary_id=dictionary.dictionary_id if dictionary else None,
+                                          instrumentation=getattr(compressor, 'instrumentation', None)))
+
+    def _decompress_blocks(self, input_file: Path, output_file: Path, tracker):
+        import asyncio
+        from core.async_engine import decompress_async
+
+        instrumentation = Instrumentation() if self.instrument else None
+        return asyncio.run(decompress_async(input_file, output_file, self.executor, max_memory=self.max_memory,
+                                            tracker=tracker, instrumentation=instrumentation))
+
+    def _decompress_file(self, input_file: Path, output_file: Path, algorithm, tracker, reference):
+        if reference is not None:
+            compressor = DeltaCompressor(reference, self._codec)
+            return compressor.decompress(input_file, output_file, tracker), algorithm, 'delta'
+
+        if is_sparse_stream(input_file, self.available_algorithms):
+            return SparseCompressor(self._codec).decompress(input_file, output_file, tracker), algorithm, 'sparse'
+        if is_block_stream(input_file, self.available_algorithms):
+            if self.executor is not None:
+                return self._decompress_blocks(input_file, output_file, tracker), algorithm, 'blocks'
+            return self._decompress_block_stream(input_file, output_file, tracker), algorithm, 'blocks'
+
+        algorithm = self.detect_algorithm(input_file, algorithm)
+        compressor = self.get_compressor(input_file, algorithm)
+        return compressor.decompress(input_file, output_file, tracker), algorithm, 'file'
+
+    def _decompress_block_stream(self, input_file: Path, output_file: Path, tracker=None):
+        start_time = time.time()
+        decompressed_size = 0
+
+        with FileHandler() as fh, FileHandler() as fh_out:
+            fh.open_file(input_file, 'rb')
+            fh_out.open_file(output_file, 'wb')
+            reader = BlockReader(fh)
+            codec = self._codec(reader.read_header()[0])
+            for raw_length, checksum, compressed in reader:
+                raw = codec.decompress_data(compressed)
+                check_block(raw, raw_length, checksum)
+                fh_out.write_chunk(raw)
+                decompressed_size += len(raw)
+                if tracker:
+                    tracker.update(min(reader.offset, tracker.stats.total_bytes))
+
+        original_size = input_file.stat().st_size
+        return {
+            'original_size': original_size,
+            'compressed_size': original_size,
+            'decompressed_size': decompressed_size,
+            'compression_ratio': max(0, (1 - (original_size / decompressed_size)) * 100) if decompressed_size else 0,
+            'time_taken': time.time() - start_time
+        }
+
+
+def _block_codec(algorithm, dictionary_id, max_memory):
+    # Runs in pool workers, so the session's dictionary and memory budget arrive as plain arguments.
+    dictionary = find_dictionary(dictionary_id) if dictionary_id is not None else None
+    return CompressionEngine(lzw_dictionary=dictionary, max_memory=max_memory).get_compressor(None, algorithm)
+
+
+def compress_block(algorithm, data: bytes, dictionary_id=None, max_memory=None) -> bytes:
+    return _block_codec(algorithm, dictionary_id, max_memory).compress_data(data)
+
 
-        file_size = file_path.stat().st_size
-        return self._algorithms['lzw']() if file_size > 1024 * 1024 else self._algorithms['rle']()
+def decompress_block(algorithm, data: bytes, dictionary_id=None, max_memory=None) -> bytes:
+    return _block_codec(algorithm, dictionary_id, max_memory).decompress_data(data)
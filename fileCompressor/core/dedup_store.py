@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from core.compression_engine import CompressionEngine
+from utils.chunker import ContentDefinedChunker
+from utils.file_handler import FileHandler
+
+MANIFEST_VERSION = 1
+
+
+def _chunk_digest(chunk: bytes):
+    return hashlib.blake2b(chunk, digest_size=20).hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes):
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temp_path.write_bytes(data)
+    os.replace(temp_path, path)
+
+
+class DedupStore:
+    def __init__(self, directory: Path, algorithm='lzw', chunker=None):
+        self.directory = Path(directory)
+        self.algorithm = algorithm
+        self.chunker = chunker or ContentDefinedChunker()
+        self._engine = CompressionEngine()
+        self._chunks_dir = self.directory / 'chunks'
+        self._manifests_dir = self.directory / 'manifests'
+        self._chunks_dir.mkdir(parents=True, exist_ok=True)
+        self._manifests_dir.mkdir(parents=True, exist_ok=True)
+
+    def _chunk_path(self, digest):
+        return self._chunks_dir / digest[:2] / digest
+
+    def _manifest_path(self, name):
+        if not name or '/' in name or '\\' in name or name.startswith('.'):
+            raise ValueError(f"Invalid manifest name: {name}")
+        return self._manifests_dir / f"{name}.json"
+
+    def manifests(self):
+        return sorted(path.stem for path in self._manifests_dir.glob('*.json'))
+
+    def load_manifest(self, name):
+        path = self._manifest_path(name)
+        if not path.exists():
+            raise ValueError(f"Unknown manifest: {name}")
+        manifest = json.loads(path.read_text())
+        if manifest.get('version') != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported manifest version: {manifest.get('version')}")
+        return manifest
+
+    def store_file(self, input_file: Path, name=None, tracker=None):
+        start_time = time.time()
+        name = name or input_file.name
+        compressor = self._engine.get_compressor(input_file, self.algorithm)
+        header = self.algorithm.encode('ascii') + b'\0'
+
+        chunks = []
+        new_chunks = 0
+        stored_size = 0
+        bytes_processed = 0
+
+        with FileHandler() as fh:
+            fh.open_file(input_file, 'rb')
+            for chunk in self.chunker.iter_file(fh):
+                digest = _chunk_digest(chunk)
+                chunks.append([digest, len(chunk)])
+
+                path = self._chunk_path(digest)
+                if not path.exists():
+                    path.parent.mkdir(exist_ok=True)
+                    data = header + compressor.compress_data(chunk)
+                    _write_atomic(path, data)
+                    new_chunks += 1
+                    stored_size += len(data)
+
+                bytes_processed += len(chunk)
+                if tracker:
+                    tracker.update(bytes_processed)
+
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'name': name,
+            'size': bytes_processed,
+            'mtime': input_file.stat().st_mtime,
+            'algorithm': self.algorithm,
+            'chunks': chunks
+        }
+        _write_atomic(self._manifest_path(name), json.dumps(manifest).encode('utf-8'))
+
+        return {
+            'original_size': bytes_processed,
+            'compressed_size': stored_size,
+            'compression_ratio': max(0, (1 - stored_size / bytes_processed) * 100) if bytes_processed else 0,
+            'chunks': len(chunks),
+            'new_chunks': new_chunks,
+            'time_taken': time.time() - start_time
+        }
+
+    def read_chunk(self, digest, size):
+        path = self._chunk_path(digest)
+        if not path.exists():
+            raise ValueError(f"Missing chunk: {digest}")
+
+        algorithm, _, compressed = path.read_bytes().partition(b'\0')
+        compressor = self._engine.get_compressor(None, algorithm.decode('ascii'))
+        chunk = compressor.decompress_data(compressed)
+        if len(chunk) != size or _chunk_digest(chunk) != digest:
+            raise ValueError(f"Corrupted chunk: {digest}")
+        return chunk
+
+    def restore_file(self, name, output_file: Path, tracker=None):
+        start_time = time.time()
+        manifest = self.load_manifest(name)
+        bytes_processed = 0
+
+        with FileHandler() as fh_out:
+            fh_out.open_file(output_file, 'wb')
+            for digest, size in manifest['chunks']:
+                fh_out.write_chunk(self.read_chunk(digest, size))
+                bytes_processed += size
+                if tracker:
+                    tracker.update(bytes_processed)
+
+        if manifest.get('mtime'):
+            os.utime(output_file, (manifest['mtime'], manifest['mtime']))
+
+        return {
+            'original_size': manifest['size'],
+            'decompressed_size': bytes_processed,
+            'chunks': len(manifest['chunks']),
+            'time_taken': time.time() - start_time
+        }
+
+    def remove(self, name):
+        self._manifest_path(name).unlink()
+
+    def collect_garbage(self):
+        referenced = set()
+        for name in self.manifests():
+            referenced.update(digest for digest, _ in self.load_manifest(name)['chunks'])
+
+        removed = 0
+        freed = 0
+        for path in self._chunks_dir.glob('*/*'):
+            if path.name.startswith('.'):
+                continue
+            if path.name not in referenced:
+                freed += path.stat().st_size
+                path.unlink()
+                removed += 1
+        return {'removed_chunks': removed, 'freed_size': freed, 'live_chunks': len(referenced)}
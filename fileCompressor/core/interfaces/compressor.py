@@ -14,3 +14,9 @@ class BaseCompressor(ABC):
     @abstractmethod
     def get_compression_stats(self):
         pass
+
+    def compress_data(self, data: bytes) -> bytes:
+        raise NotImplementedError(f"{type(self).__name__} does not support in-memory compression")
+
+    def decompress_data(self, data: bytes) -> bytes:
+        raise NotImplementedError(f"{type(self).__name__} does not support in-memory decompression")
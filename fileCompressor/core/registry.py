@@ -0,0 +1,109 @@
+import importlib
+from dataclasses import dataclass, field
+
+ENTRY_POINT_GROUP = 'filecompressor.algorithms'
+CAPABILITIES = ('streaming', 'block_parallel', 'in_memory')
+
+
+@dataclass
+class AlgorithmSpec:
+    name: str
+    import_path: str
+    capabilities: frozenset = field(default_factory=lambda: frozenset(('streaming', 'in_memory')))
+    extension: str = ''
+    # Leading bytes of the algorithm's file output; formats without one are only recognised by extension.
+    magics: tuple = ()
+
+    def supports(self, capability):
+        return capability in self.capabilities
+
+
+BUILTIN_ALGORITHMS = (
+    AlgorithmSpec('rle', 'compressors.rle:RLECompressor', frozenset(CAPABILITIES), '.rle', (b'\x00RLE\x01',)),
+    AlgorithmSpec('lzw', 'compressors.lzw:LZWCompressor', frozenset(CAPABILITIES), '.lzw', (b'LZWF\x01', b'LZWD\x01')),
+    AlgorithmSpec('range', 'compressors.range_coder:RangeCoderCompressor', frozenset(CAPABILITIES), '.range',
+                  (b'FCRC\x01\x00',)),
+    AlgorithmSpec('rle-range', 'compressors.range_coder:RLERangeCompressor', frozenset(CAPABILITIES), '.rle-range',
+                  (b'FCRC\x01\x03rle',)),
+    AlgorithmSpec('lzw-range', 'compressors.range_coder:LZWRangeCompressor', frozenset(CAPABILITIES), '.lzw-range',
+                  (b'FCRC\x01\x03lzw',)),
+)
+
+
+class AlgorithmRegistry:
+    def __init__(self, specs=BUILTIN_ALGORITHMS, discover=True):
+        self._specs = {}
+        self._classes = {}
+        self._discovered = not discover
+        for spec in specs:
+            self.register(spec)
+
+    def register(self, spec: AlgorithmSpec):
+        unknown = set(spec.capabilities) - set(CAPABILITIES)
+        if unknown:
+            raise ValueError(f"Unknown capabilities for {spec.name}: {', '.join(sorted(unknown))}")
+        self._specs[spec.name] = spec
+        self._classes.pop(spec.name, None)
+
+    def _discover(self):
+        # Entry points are only listed here; the plugin module is imported when the algorithm is first used.
+        # importlib.metadata itself is slow to import, so it is loaded only when discovery actually runs.
+        from importlib import metadata
+        self._discovered = True
+        for entry_point in metadata.entry_points(group=ENTRY_POINT_GROUP):
+            if entry_point.name in self._specs:
+                continue
+            capabilities = frozenset(entry_point.extras) or frozenset(('streaming', 'in_memory'))
+            try:
+                self.register(AlgorithmSpec(entry_point.name, f"{entry_point.module}:{entry_point.attr}", capabilities))
+            except ValueError:
+                continue
+
+    def names(self, capability=None):
+        if not self._discovered:
+            self._discover()
+        return [name for name, spec in self._specs.items() if capability is None or spec.supports(capability)]
+
+    def spec(self, name):
+        if name not in self._specs and not self._discovered:
+            self._discover()
+        if name not in self._specs:
+            raise ValueError(f"Unknown compression algorithm: {name}")
+        return self._specs[name]
+
+    def detect(self, prefix: bytes):
+        detected, matched = None, 0
+        for name in self.names():
+            for magic in self._specs[name].magics:
+                if len(magic) > matched and prefix.startswith(magic):
+                    detected, matched = name, len(magic)
+        return detected
+
+    def for_extension(self, suffix):
+        for name in self.names():
+            if self._specs[name].extension and self._specs[name].extension == suffix:
+                return name
+        return None
+
+    def load(self, name):
+        compressor_class = self._classes.get(name)
+        if compressor_class is None:
+            module_name, _, attribute = self.spec(name).import_path.partition(':')
+            try:
+                compressor_class = getattr(importlib.import_module(module_name), attribute)
+            except (ImportError, AttributeError) as e:
+                raise ValueError(f"Failed to load compression algorithm {name}: {str(e)}")
+            self._classes[name] = compressor_class
+        return compressor_class
+
+    def is_loaded(self, name):
+        return name in self._classes
+
+    def name_of(self, compressor):
+        for name, compressor_class in self._classes.items():
+            if type(compressor) is compressor_class:
+                return name
+        return None
+
+
+default_registry = AlgorithmRegistry()
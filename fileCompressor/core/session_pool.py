@@ -0,0 +1,107 @@
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from compressors.lzw_dictionary import register_dictionary, registered_dictionaries
+from core.compression_engine import CompressionEngine
+from utils.memory_budget import MemoryBudget
+
+DEFAULT_IDLE_TIMEOUT = 120.0
+
+
+def _preload(dictionaries):
+    # Runs once per worker, so later blocks find the codec modules imported and the dictionaries registered.
+    for dictionary in dictionaries:
+        register_dictionary(dictionary)
+    engine = CompressionEngine()
+    for algorithm in engine.available_algorithms:
+        engine.get_compressor(None, algorithm)
+
+
+def _worker_pid():
+    return os.getpid()
+
+
+class SessionPool(Executor):
+    # A process pool for an interactive session: started on first use, kept warm between commands
+    # and shut down after idle_timeout seconds without work.
+    def __init__(self, max_workers=None, idle_timeout=DEFAULT_IDLE_TIMEOUT, max_memory=None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.idle_timeout = idle_timeout
+        self.max_memory = max_memory
+        self.starts = 0
+        self._executor = None
+        self._dictionary_ids = None
+        self._in_flight = 0
+        self._timer = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self._executor is not None
+
+    @property
+    def workers(self):
+        if self.max_memory is None:
+            return self.max_workers
+        return MemoryBudget(self.max_memory).workers(self.max_workers)
+
+    def submit(self, fn, /, *args, **kwargs):
+        with self._lock:
+            self._cancel_timer()
+            executor = self._ensure_executor()
+            self._in_flight += 1
+        try:
+            future = executor.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._done(None)
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def warm_up(self):
+        # Blocks until the workers have started and preloaded; returns the pids that answered.
+        futures = [self.submit(_worker_pid) for _ in range(self.workers)]
+        return sorted({future.result() for future in futures})
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        with self._lock:
+            self._cancel_timer()
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def _ensure_executor(self):
+        dictionaries = registered_dictionaries()
+        dictionary_ids = sorted(dictionary.dictionary_id for dictionary in dictionaries)
+        if self._executor is not None and self._in_flight == 0 and dictionary_ids != self._dictionary_ids:
+            # Dictionaries loaded since the workers started are only picked up by a fresh pool.
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_preload,
+                                                 initargs=(dictionaries,))
+            self._dictionary_ids = dictionary_ids
+            self.starts += 1
+        return self._executor
+
+    def _done(self, future):
+        with self._lock:
+            self._in_flight -= 1
+            if self._in_flight == 0 and self._executor is not None and self.idle_timeout is not None:
+                self._timer = threading.Timer(self.idle_timeout, self._idle)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _idle(self):
+        with self._lock:
+            if self._in_flight or self._timer is not threading.current_thread():
+                return
+            self._timer = None
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
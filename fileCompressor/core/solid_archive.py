@@ -0,0 +1,250 @@
+import bisect
+import os
+import struct
+import time
+from pathlib import Path
+from core.compression_engine import CompressionEngine
+from utils.file_handler import FileHandler
+
+MAGIC = b'FCSL'
+VERSION = 1
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+
+_HEADER = struct.Struct('>4sBB')
+_TRAILER = struct.Struct('>QI4s')
+_COUNTS = struct.Struct('>II')
+_FILE_ENTRY = struct.Struct('>HQQd')
+_BLOCK_ENTRY = struct.Struct('>QIQI')
+
+
+def iter_input_files(paths):
+    for path in paths:
+        path = Path(path)
+        if path.is_dir():
+            for child in sorted(path.rglob('*')):
+                if child.is_file():
+                    yield child, child.relative_to(path.parent).as_posix()
+        elif path.is_file():
+            yield path, path.name
+        else:
+            raise ValueError(f"File not found: {path}")
+
+
+class SolidArchiveWriter:
+    def __init__(self, output_file: Path, algorithm='lzw', block_size=DEFAULT_BLOCK_SIZE, engine=None):
+        if block_size <= 0:
+            raise ValueError("Block size must be positive")
+        self.output_file = Path(output_file)
+        self.algorithm = algorithm
+        self.block_size = block_size
+        # One codec for the whole archive: with LZW every block starts from the engine's shared dictionary.
+        self._codec = (engine or CompressionEngine()).get_compressor(None, algorithm)
+        self._files = []
+        self._blocks = []
+        self._names = set()
+        self._buffer = bytearray()
+        self._stream_offset = 0
+        self._block_start = 0
+        self._fh = FileHandler()
+        self._fh.open_file(self.output_file, 'wb')
+        name = algorithm.encode('ascii')
+        header = _HEADER.pack(MAGIC, VERSION, len(name)) + name
+        self._fh.write_chunk(header)
+        self._archive_offset = len(header)
+
+    @property
+    def original_size(self):
+        return self._stream_offset
+
+    def add_file(self, input_file: Path, name=None):
+        name = name or input_file.name
+        if name in self._names:
+            raise ValueError(f"Duplicate archive entry: {name}")
+        self._names.add(name)
+
+        offset = self._stream_offset
+        with FileHandler() as fh:
+            fh.open_file(input_file, 'rb')
+            while True:
+                chunk = fh.read_chunk(self.block_size)
+                if not chunk:
+                    break
+                self._append(chunk)
+
+        self._files.append((name, offset, self._stream_offset - offset, input_file.stat().st_mtime))
+
+    def _append(self, data: bytes):
+        view = memoryview(data)
+        while view:
+            take = min(len(view), self.block_size - len(self._buffer))
+            self._buffer.extend(view[:take])
+            self._stream_offset += take
+            view = view[take:]
+            if len(self._buffer) >= self.block_size:
+                self._flush_block()
+
+    def _flush_block(self):
+        if not self._buffer:
+            return
+        compressed = self._codec.compress_data(bytes(self._buffer))
+        self._fh.write_chunk(compressed)
+        self._blocks.append((self._archive_offset, len(compressed), self._block_start, len(self._buffer)))
+        self._archive_offset += len(compressed)
+        self._block_start += len(self._buffer)
+        self._buffer.clear()
+
+    def close(self):
+        if not self._fh.is_open:
+            return
+        self._flush_block()
+
+        index = bytearray(_COUNTS.pack(len(self._files), len(self._blocks)))
+        for name, offset, size, mtime in self._files:
+            encoded = name.encode('utf-8')
+            index.extend(_FILE_ENTRY.pack(len(encoded), offset, size, mtime) + encoded)
+        for block in self._blocks:
+            index.extend(_BLOCK_ENTRY.pack(*block))
+
+        # Entry names share long prefixes, so the index goes through the archive codec as well.
+        index = self._codec.compress_data(bytes(index))
+        self._fh.write_chunk(index + _TRAILER.pack(self._archive_offset, len(index), MAGIC))
+        self._fh.close_file()
+
+    def abort(self):
+        self._fh.close_file()
+        self.output_file.unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
+
+
+class SolidArchive:
+    def __init__(self, archive_file: Path, engine=None):
+        self.archive_file = Path(archive_file)
+        self._engine = engine or CompressionEngine()
+        self.entries = {}
+        self._blocks = []
+        self._block_starts = []
+        self._last_block = (None, b'')
+        self._read_index()
+
+    def _read_index(self):
+        with open(self.archive_file, 'rb') as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size or f.seek(0, 2) < _HEADER.size + _TRAILER.size:
+                raise ValueError("Invalid solid archive: file too short")
+            magic, version, name_length = _HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError("Invalid solid archive: bad magic")
+            if version != VERSION:
+                raise ValueError(f"Unsupported solid archive version: {version}")
+            f.seek(_HEADER.size)
+            self.algorithm = f.read(name_length).decode('ascii')
+
+            f.seek(-_TRAILER.size, 2)
+            index_offset, index_length, trailer_magic = _TRAILER.unpack(f.read(_TRAILER.size))
+            if trailer_magic != MAGIC:
+                raise ValueError("Invalid solid archive: missing index")
+            f.seek(index_offset)
+            index = self._engine.get_compressor(None, self.algorithm).decompress_data(f.read(index_length))
+
+        file_count, block_count = _COUNTS.unpack_from(index)
+        position = _COUNTS.size
+        for _ in range(file_count):
+            name_length, offset, size, mtime = _FILE_ENTRY.unpack_from(index, position)
+            position += _FILE_ENTRY.size
+            name = index[position:position + name_length].decode('utf-8')
+            position += name_length
+            self.entries[name] = {'name': name, 'offset': offset, 'size': size, 'mtime': mtime}
+        for _ in range(block_count):
+            block = _BLOCK_ENTRY.unpack_from(index, position)
+            position += _BLOCK_ENTRY.size
+            self._blocks.append(block)
+            self._block_starts.append(block[2])
+
+    def list(self):
+        return list(self.entries.values())
+
+    @property
+    def blocks(self):
+        return list(self._blocks)
+
+    def _read_range(self, offset, size):
+        # Each block is a restart point, so only the blocks overlapping the range are decoded.
+        codec = self._engine.get_compressor(None, self.algorithm)
+        first = max(0, bisect.bisect_right(self._block_starts, offset) - 1)
+        end = offset + size
+        with open(self.archive_file, 'rb') as f:
+            for number in range(first, len(self._blocks)):
+                archive_offset, compressed_length, block_start, block_length = self._blocks[number]
+                if block_start >= end:
+                    break
+                # Neighbouring small files usually share a block; keep the last one decoded.
+                cached_number, block = self._last_block
+                if cached_number != number:
+                    f.seek(archive_offset)
+                    block = codec.decompress_data(f.read(compressed_length))
+                    if len(block) != block_length:
+                        raise ValueError("Invalid solid archive: block size mismatch")
+                    self._last_block = (number, block)
+                yield block[max(0, offset - block_start):min(block_length, end - block_start)]
+
+    def extract(self, name, output_file: Path, tracker=None):
+        start_time = time.time()
+        entry = self.entries.get(name)
+        if entry is None:
+            raise ValueError(f"No such archive entry: {name}")
+
+        written = 0
+        with FileHandler() as fh_out:
+            fh_out.open_file(output_file, 'wb')
+            for chunk in self._read_range(entry['offset'], entry['size']):
+                fh_out.write_chunk(chunk)
+                written += len(chunk)
+                if tracker:
+                    tracker.update(written)
+
+        if written != entry['size']:
+            raise ValueError(f"Invalid solid archive: {name} is truncated")
+        os.utime(output_file, (entry['mtime'], entry['mtime']))
+
+        return {
+            'original_size': entry['size'],
+            'decompressed_size': written,
+            'time_taken': time.time() - start_time
+        }
+
+    def extract_all(self, directory: Path):
+        directory = Path(directory)
+        for name in self.entries:
+            output_file = directory / name
+            if directory.resolve() not in output_file.resolve().parents:
+                raise ValueError(f"Unsafe archive entry name: {name}")
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+            self.extract(name, output_file)
+        return len(self.entries)
+
+
+def create_solid_archive(output_file: Path, inputs, algorithm='lzw', block_size=DEFAULT_BLOCK_SIZE, engine=None):
+    start_time = time.time()
+    with SolidArchiveWriter(output_file, algorithm, block_size, engine) as writer:
+        count = 0
+        for path, name in iter_input_files(inputs):
+            writer.add_file(path, name)
+            count += 1
+
+    original_size = writer.original_size
+    compressed_size = Path(output_file).stat().st_size
+    return {
+        'original_size': original_size,
+        'compressed_size': compressed_size,
+        'compression_ratio': max(0, (1 - compressed_size / original_size) * 100) if original_size else 0,
+        'files': count,
+        'time_taken': time.time() - start_time
+    }
@@ -0,0 +1,164 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+from compressors.delta import DeltaCompressor, is_delta_stream
+from compressors.sparse import SparseReader, is_sparse_stream
+from core import archive, solid_archive
+from core.block_format import BlockReader, check_block, is_block_stream
+from core.compression_engine import CompressionEngine, decompress_block
+from utils.file_handler import FileHandler
+
+DEFAULT_MAX_PENDING = 8
+
+
+def _verify_block(algorithm, compressed: bytes, raw_length, checksum):
+    # Decoded data never leaves the worker; only its length comes back.
+    raw = decompress_block(algorithm, compressed)
+    check_block(raw, raw_length, checksum)
+    return len(raw)
+
+
+def _verify_range(algorithm, file_path, offset, length, raw_length, checksum=None):
+    with open(file_path, 'rb') as f:
+        f.seek(offset)
+        compressed = f.read(length)
+    if len(compressed) != length:
+        raise ValueError("Compressed data is truncated")
+    raw = decompress_block(algorithm, compressed)
+    if checksum is None:
+        if len(raw) != raw_length:
+            raise ValueError(f"Block size mismatch: expected {raw_length}, got {len(raw)}")
+    else:
+        check_block(raw, raw_length, checksum)
+    return len(raw)
+
+
+def _run_jobs(executor: Executor, jobs, max_pending):
+    pending = deque()
+    total = 0
+    count = 0
+    try:
+        for function, *args in jobs:
+            pending.append(executor.submit(function, *args))
+            count += 1
+            if len(pending) >= max_pending:
+                total += pending.popleft().result()
+        while pending:
+            total += pending.popleft().result()
+    except BaseException:
+        for future in pending:
+            future.cancel()
+        raise
+    return total, count
+
+
+def _block_stream_jobs(input_file: Path):
+    with FileHandler() as fh:
+        fh.open_file(input_file, 'rb')
+        reader = BlockReader(fh)
+        algorithm, _ = reader.read_header()
+        for raw_length, checksum, compressed in reader:
+            yield _verify_block, algorithm, compressed, raw_length, checksum
+
+
+def _sparse_stream_jobs(input_file: Path):
+    with FileHandler() as fh:
+        fh.open_file(input_file, 'rb')
+        reader = SparseReader(fh)
+        algorithm, _ = reader.read_header()
+        for _, length, blocks in reader.extents():
+            declared = 0
+            for raw_length, checksum, compressed in blocks:
+                declared += raw_length
+                yield _verify_block, algorithm, compressed, raw_length, checksum
+            if declared != length:
+                raise ValueError("Invalid sparse stream: extent size mismatch")
+
+
+def _archive_jobs(entries, archive_file: Path):
+    for entry in entries:
+        yield (_verify_range, entry['algorithm'], str(archive_file), entry['offset'], entry['compressed_size'],
+               entry['size'], entry['crc32'])
+
+
+def _solid_archive_jobs(archive_file: Path, algorithm, blocks):
+    for offset, compressed_length, _, block_length in blocks:
+        yield _verify_range, algorithm, str(archive_file), offset, compressed_length, block_length
+
+
+def _stream_kind(input_file: Path, engine):
+    if is_block_stream(input_file, engine.available_algorithms):
+        return 'blocks'
+    if is_sparse_stream(input_file, engine.available_algorithms):
+        return 'sparse'
+    if is_delta_stream(input_file):
+        return 'delta'
+    with open(input_file, 'rb') as f:
+        magic = f.read(4)
+    if magic == archive.MAGIC:
+        return 'archive'
+    if magic == solid_archive.MAGIC:
+        return 'solid'
+    return 'plain'
+
+
+def verify_file(input_file: Path, algorithm=None, reference: Optional[Path] = None,
+                executor: Optional[Executor] = None, max_pending=DEFAULT_MAX_PENDING, engine=None):
+    start_time = time.time()
+    input_file = Path(input_file)
+    engine = engine or CompressionEngine()
+
+    kind = _stream_kind(input_file, engine)
+    if kind in ('delta', 'plain'):
+        return _verify_sequential(input_file, kind, algorithm, reference, engine, start_time)
+
+    checksum_verified = True
+    if kind == 'blocks':
+        jobs = _block_stream_jobs(input_file)
+    elif kind == 'sparse':
+        jobs = _sparse_stream_jobs(input_file)
+    elif kind == 'archive':
+        jobs = _archive_jobs(archive.Archive(input_file, engine).list(), input_file)
+    else:
+        solid = solid_archive.SolidArchive(input_file, engine)
+        jobs = _solid_archive_jobs(input_file, solid.algorithm, solid.blocks)
+        checksum_verified = False
+
+    owns_executor = executor is None
+    executor = executor or ProcessPoolExecutor()
+    try:
+        decompressed_size, blocks = _run_jobs(executor, jobs, max_pending)
+    finally:
+        if owns_executor:
+            executor.shutdown(cancel_futures=True)
+
+    return {
+        'original_size': input_file.stat().st_size,
+        'decompressed_size': decompressed_size,
+        'blocks': blocks,
+        'checksum_verified': checksum_verified,
+        'time_taken': time.time() - start_time
+    }
+
+
+def _verify_sequential(input_file: Path, kind, algorithm, reference, engine, start_time):
+    # Single-stream formats are decoded on the calling thread straight into the null device.
+    if kind == 'delta':
+        if reference is None:
+            raise ValueError("Delta streams can only be verified against their reference file")
+        compressor = DeltaCompressor(reference, lambda name: engine.get_compressor(None, name))
+    else:
+        compressor = engine.get_compressor(input_file, engine.detect_algorithm(input_file, algorithm))
+
+    stats = compressor.decompress(input_file, Path(os.devnull), None)
+    return {
+        'original_size': stats['original_size'],
+        'decompressed_size': stats['decompressed_size'],
+        'blocks': 1,
+        # Plain RLE, LZW and range coded files end with a CRC32; older RLE/LZW files do not.
+        'checksum_verified': kind == 'delta' or stats.get('checksum_verified', False),
+        'time_taken': time.time() - start_time
+    }
@@ -0,0 +1,47 @@
+import argparse
+from service.server import CompressionServer
+from utils.memory_budget import parse_memory
+from utils.metrics_registry import CompressionMetrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the local compression server")
+    parser.add_argument('--socket', help="Unix domain socket path to listen on")
+    parser.add_argument('--host', default='127.0.0.1', help="Localhost address to listen on")
+    parser.add_argument('--port', type=int, default=7878, help="TCP port to listen on")
+    parser.add_argument('--workers', type=int, default=None, help="Number of worker processes")
+    parser.add_argument('--max-memory', type=parse_memory, default=None,
+                        help="Memory budget for all workers, e.g. 2G; sizes the pool and caps request payloads")
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help="Expose Prometheus metrics on this localhost port")
+    parser.add_argument('--metrics-file', default=None, help="Dump Prometheus metrics to this file periodically")
+    parser.add_argument('--metrics-interval', type=float, default=15.0, help="Seconds between metrics dumps")
+    args = parser.parse_args()
+
+    metrics = CompressionMetrics() if args.metrics_port is not None or args.metrics_file else None
+    exporter = dumper = None
+    if args.metrics_port is not None:
+        exporter = metrics.registry.serve(args.metrics_port)
+        print(f"Metrics available at http://127.0.0.1:{args.metrics_port}/metrics")
+    if args.metrics_file:
+        dumper = metrics.registry.dump_every(args.metrics_file, args.metrics_interval)
+
+    address = args.socket if args.socket else (args.host, args.port)
+    server = CompressionServer(address, workers=args.workers, metrics=metrics, max_memory=args.max_memory)
+    try:
+        print(f"Compression server listening on {address}")
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServer stopped.")
+    finally:
+        server.stop()
+        if exporter is not None:
+            exporter.shutdown()
+            exporter.server_close()
+        if dumper is not None:
+            dumper.set()
+            metrics.registry.dump(args.metrics_file)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+import itertools
+import os
+import socket
+from concurrent.futures import Executor
+from typing import Optional
+from service.protocol import ProtocolError, pack_frame, recv_frame
+from service.server import handle_request
+
+
+class ServiceError(Exception):
+    pass
+
+
+class _BaseClient:
+    def __init__(self):
+        self.last_stats = {}
+        self._ids = itertools.count(1)
+
+    def compress(self, data: bytes, algorithm='lzw', timeout: Optional[float] = None) -> bytes:
+        return self._call('compress', algorithm, data, timeout)
+
+    def decompress(self, data: bytes, algorithm='lzw', timeout: Optional[float] = None) -> bytes:
+        return self._call('decompress', algorithm, data, timeout)
+
+    def ping(self):
+        self._call('ping', None, b'')
+        return True
+
+    def _call(self, operation, algorithm, payload, timeout=None):
+        header = {'op': operation, 'algorithm': algorithm, 'id': next(self._ids)}
+        if timeout is not None:
+            header['timeout'] = timeout
+        response, result = self._exchange(header, payload)
+        if response.get('status') != 'ok':
+            self.last_stats = response.get('stats', {})
+            raise ServiceError(response.get('error', 'Unknown server error'))
+        self.last_stats = response.get('stats', {})
+        return result
+
+    def _exchange(self, header, payload):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class CompressionClient(_BaseClient):
+    def __init__(self, address, timeout: Optional[float] = 30.0):
+        super().__init__()
+        if isinstance(address, (str, os.PathLike)):
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            address = os.fspath(address)
+        else:
+            self._socket = socket.socket(socket.AF_INET6 if ':' in address[0] else socket.AF_INET,
+                                         socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        try:
+            self._socket.connect(address)
+        except OSError:
+            self._socket.close()
+            raise
+
+    def _exchange(self, header, payload):
+        self._socket.sendall(pack_frame(header, payload))
+        frame = recv_frame(self._socket)
+        if frame is None:
+            raise ProtocolError("Server closed the connection")
+        return frame
+
+    def close(self):
+        self._socket.close()
+
+
+class LocalCompressionClient(_BaseClient):
+    def __init__(self, executor: Optional[Executor] = None):
+        super().__init__()
+        self._executor = executor
+
+    def _submit(self, function, *args):
+        if self._executor is None:
+            return function(*args)
+        return self._executor.submit(function, *args).result()
+
+    def _exchange(self, header, payload):
+        return handle_request(header, payload, self._submit)
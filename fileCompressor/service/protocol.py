@@ -0,0 +1,53 @@
+import json
+import struct
+
+MAX_HEADER_SIZE = 64 * 1024
+MAX_PAYLOAD_SIZE = 1024 * 1024 * 1024
+
+_FRAME = struct.Struct('>II')
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def pack_frame(header: dict, payload: bytes = b'') -> bytes:
+    encoded = json.dumps(header).encode('utf-8')
+    return _FRAME.pack(len(encoded), len(payload)) + encoded + payload
+
+
+def _recv_exact(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(min(size - len(data), 1024 * 1024))
+        if not chunk:
+            if not data:
+                return None
+            raise ProtocolError("Connection closed in the middle of a frame")
+        data.extend(chunk)
+    return bytes(data)
+
+
+def recv_frame(sock):
+    prefix = _recv_exact(sock, _FRAME.size)
+    if prefix is None:
+        return None
+
+    header_size, payload_size = _FRAME.unpack(prefix)
+    if header_size > MAX_HEADER_SIZE:
+        raise ProtocolError(f"Header too large: {header_size} bytes")
+    if payload_size > MAX_PAYLOAD_SIZE:
+        raise ProtocolError(f"Payload too large: {payload_size} bytes")
+
+    header_data = _recv_exact(sock, header_size) if header_size else b''
+    payload = _recv_exact(sock, payload_size) if payload_size else b''
+    if header_data is None or payload is None:
+        raise ProtocolError("Connection closed in the middle of a frame")
+
+    try:
+        header = json.loads(header_data.decode('utf-8'))
+    except ValueError as e:
+        raise ProtocolError(f"Invalid frame header: {str(e)}")
+    if not isinstance(header, dict):
+        raise ProtocolError("Invalid frame header: expected an object")
+    return header, payload
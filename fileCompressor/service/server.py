@@ -0,0 +1,218 @@
+import os
+import socketserver
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Optional
+from core.compression_engine import CompressionEngine
+from service.protocol import ProtocolError, pack_frame, recv_frame
+from utils.memory_budget import MemoryBudget
+from utils.progress_tracker import OperationCancelled
+
+OPERATIONS = ('compress', 'decompress')
+LOCAL_HOSTS = ('127.0.0.1', 'localhost', '::1')
+
+
+def _warm_up():
+    engine = CompressionEngine()
+    for algorithm in engine.available_algorithms:
+        engine.get_compressor(None, algorithm)
+    return os.getpid()
+
+
+def run_request(operation, algorithm, payload: bytes, deadline=None, max_memory=None):
+    start_time = time.time()
+    # A request whose budget ran out while queued is dropped instead of occupying a worker.
+    if deadline is not None and start_time >= deadline:
+        raise OperationCancelled('deadline exceeded', 0, len(payload))
+    compressor = CompressionEngine(max_memory=max_memory).get_compressor(None, algorithm)
+
+    if operation == 'compress':
+        result = compressor.compress_data(payload)
+        original_size, compressed_size = len(payload), len(result)
+    else:
+        result = compressor.decompress_data(payload)
+        original_size, compressed_size = len(result), len(payload)
+
+    compression_ratio = max(0, (1 - (compressed_size / original_size)) * 100) if original_size > 0 else 0
+    stats = {
+        'original_size': original_size,
+        'compressed_size': compressed_size,
+        'compression_ratio': compression_ratio,
+        'time_taken': time.time() - start_time,
+        'worker_pid': os.getpid()
+    }
+    return result, stats
+
+
+def handle_request(header: dict, payload: bytes, submit, metrics=None, budget=None):
+    operation = header.get('op')
+    response = {'id': header.get('id')}
+
+    if operation == 'ping':
+        response['status'] = 'ok'
+        return response, b''
+
+    if operation not in OPERATIONS:
+        response.update(status='error', error=f"Invalid operation: {operation}")
+        if metrics is not None:
+            metrics.error('invalid', None, 'invalid operation')
+        return response, b''
+
+    algorithm = header.get('algorithm') or 'lzw'
+    if algorithm not in CompressionEngine().available_algorithms:
+        response.update(status='error', error=f"Unknown compression algorithm: {algorithm}")
+        if metrics is not None:
+            metrics.error(operation, algorithm, 'unknown algorithm')
+        return response, b''
+
+    if budget is not None and len(payload) > budget['max_payload']:
+        response.update(status='error', error=f"Payload of {len(payload)} bytes exceeds the memory budget "
+                                              f"of {budget['max_payload']} bytes per request")
+        if metrics is not None:
+            metrics.error(operation, algorithm, 'memory budget')
+        return response, b''
+
+    received_time = time.time()
+    timeout = header.get('timeout')
+    deadline = received_time + timeout if timeout is not None else None
+    max_memory = budget['max_memory'] if budget is not None else None
+    try:
+        result, stats = submit(run_request, operation, algorithm, payload, deadline, max_memory)
+    except OperationCancelled as e:
+        response.update(status='cancelled', error=str(e), stats={
+            'cancelled': True,
+            'reason': e.reason,
+            'bytes_processed': e.bytes_processed,
+            'total_size': e.total_bytes,
+            'queue_time': time.time() - received_time
+        })
+        if metrics is not None:
+            metrics.error(operation, algorithm, e.reason)
+        return response, b''
+    except Exception as e:
+        response.update(status='error', error=str(e))
+        if metrics is not None:
+            metrics.error(operation, algorithm, type(e).__name__)
+        return response, b''
+
+    stats['queue_time'] = max(0.0, time.time() - received_time - stats['time_taken'])
+    response.update(status='ok', stats=stats)
+    if metrics is not None:
+        # Worker stats are in payload terms: decompression reads compressed_size and writes original_size.
+        if operation == 'decompress':
+            stats = dict(stats, decompressed_size=stats['original_size'])
+        metrics.observe(operation, algorithm, stats)
+    return response, result
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        while True:
+            try:
+                frame = recv_frame(self.request)
+            except (ProtocolError, OSError) as e:
+                try:
+                    self.request.sendall(pack_frame({'status': 'error', 'error': str(e)}))
+                except OSError:
+                    pass
+                return
+
+            if frame is None:
+                return
+
+            header, payload = frame
+            owner = self.server.owner
+            response, result = handle_request(header, payload, owner.submit, owner.metrics, owner.budget)
+            self.request.sendall(pack_frame(response, result))
+
+
+class _ThreadingTCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socketserver, 'UnixStreamServer'):
+    class _ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+
+class CompressionServer:
+    def __init__(self, address, workers=None, executor: Optional[Executor] = None, metrics=None, max_memory=None):
+        self._address = address
+        self.metrics = metrics
+        self._workers = workers or os.cpu_count() or 1
+        self.budget = None
+        if max_memory is not None:
+            # The pool is sized so every worker can hold its largest admitted request at once.
+            memory_budget = MemoryBudget(max_memory)
+            self._workers = memory_budget.workers(self._workers)
+            self.budget = {'max_memory': max_memory // self._workers,
+                           'max_payload': memory_budget.max_payload(self._workers)}
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._server = None
+        self._thread = None
+
+    @property
+    def address(self):
+        if self._server is None:
+            return self._address
+        return self._server.server_address
+
+    @property
+    def is_running(self):
+        return self._server is not None
+
+    def submit(self, function, *args):
+        return self._executor.submit(function, *args).result()
+
+    def start(self):
+        if self.is_running:
+            return
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers)
+        for future in [self._executor.submit(_warm_up) for _ in range(self._workers)]:
+            future.result()
+
+        if isinstance(self._address, (str, os.PathLike)):
+            if os.path.exists(self._address):
+                os.unlink(self._address)
+            self._server = _ThreadingUnixServer(os.fspath(self._address), _RequestHandler)
+        else:
+            host, port = self._address
+            if host not in LOCAL_HOSTS:
+                raise ValueError(f"Server must listen on localhost, got: {host}")
+            self._server = _ThreadingTCPServer((host, port), _RequestHandler)
+        self._server.owner = self
+
+    def serve_forever(self):
+        self.start()
+        self._server.serve_forever()
+
+    def serve_in_background(self):
+        self.start()
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            if self._thread is not None:
+                self._server.shutdown()
+            self._server.server_close()
+            if isinstance(self._address, (str, os.PathLike)) and os.path.exists(self._address):
+                os.unlink(self._address)
+            self._server = None
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self.serve_in_background()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
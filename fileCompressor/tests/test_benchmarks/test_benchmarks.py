@@ -0,0 +1,57 @@
+import unittest
+from pathlib import Path
+from benchmarks.corpus import CORPUS_KINDS, build_corpus, format_size, generate, parse_size
+from benchmarks.runner import compare_results, run_benchmarks
+
+
+class TestBenchmarks(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(__file__).parent / "test_files_bench"
+        self.test_dir.mkdir(exist_ok=True)
+
+    def tearDown(self):
+        for file in self.test_dir.glob("*"):
+            file.unlink()
+        self.test_dir.rmdir()
+
+    def test_parse_and_format_size(self):
+        self.assertEqual(parse_size('64K'), 64 * 1024)
+        self.assertEqual(parse_size('1MB'), 1024 * 1024)
+        self.assertEqual(parse_size('2g'), 2 * 1024 ** 3)
+        self.assertEqual(parse_size('100'), 100)
+        self.assertEqual(format_size(1024 * 1024), '1M')
+        self.assertEqual(format_size(1000), '1000')
+
+    def test_corpus_is_deterministic(self):
+        for kind in CORPUS_KINDS:
+            with self.subTest(kind=kind):
+                first = generate(kind, 5000, self.test_dir / f"{kind}-a.bin", seed=7).read_bytes()
+                second = generate(kind, 5000, self.test_dir / f"{kind}-b.bin", seed=7).read_bytes()
+                other = generate(kind, 5000, self.test_dir / f"{kind}-c.bin", seed=8).read_bytes()
+                self.assertEqual(len(first), 5000)
+                self.assertEqual(first, second)
+                self.assertNotEqual(first, other)
+
+    def test_run_benchmarks(self):
+        corpus = build_corpus(self.test_dir, ('runs',), (2048,))
+        results = run_benchmarks(corpus, ['rle'], ['file'], isolate=False)
+
+        self.assertEqual([result['operation'] for result in results], ['compress', 'decompress'])
+        for result in results:
+            self.assertGreater(result['throughput_mbps'], 0)
+            self.assertGreater(result['compression_ratio'], 0)
+            self.assertGreater(result['peak_tracemalloc'], 0)
+
+    def test_compare_results(self):
+        base = {'corpus': 'text', 'size': 10, 'algorithm': 'lzw', 'mode': 'file', 'operation': 'compress',
+                'throughput_mbps': 10.0, 'compressed_size': 100, 'peak_tracemalloc': 1000}
+        baseline = {'results': [base]}
+
+        self.assertEqual(compare_results({'results': [dict(base, throughput_mbps=9.5)]}, baseline, 10), [])
+        self.assertEqual(len(compare_results({'results': [dict(base, throughput_mbps=8.0)]}, baseline, 10)), 1)
+        self.assertEqual(len(compare_results({'results': [dict(base, compressed_size=150)]}, baseline, 10)), 1)
+        self.assertEqual(len(compare_results({'results': [dict(base, peak_tracemalloc=2000)]}, baseline, 10)), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
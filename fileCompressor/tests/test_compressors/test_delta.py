@@ -0,0 +1,75 @@
+import os
+import unittest
+from pathlib import Path
+from compressors.delta import DeltaCompressor, is_delta_stream
+from core.compression_engine import CompressionEngine
+
+
+class TestDeltaCompressor(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(__file__).parent / "test_files_delta"
+        self.test_dir.mkdir(exist_ok=True)
+        self.engine = CompressionEngine()
+
+        self.old_data = os.urandom(200 * 1024)
+        self.new_data = (self.old_data[:50000] + b'inserted text ' * 100 + self.old_data[50000:120000]
+                         + self.old_data[150000:] + os.urandom(3000))
+        self.reference_file = self.create_file("old.bin", self.old_data)
+        self.input_file = self.create_file("new.bin", self.new_data)
+
+    def tearDown(self):
+        for file in self.test_dir.glob("*"):
+            file.unlink()
+        self.test_dir.rmdir()
+
+    def create_file(self, name, content: bytes):
+        path = self.test_dir / name
+        path.write_bytes(content)
+        return path
+
+    def roundtrip(self, input_file, algorithm='lzw'):
+        compressor = DeltaCompressor(self.reference_file, self.engine._codec, algorithm, block_size=32)
+        compressed_file = self.test_dir / "out.delta"
+        output_file = self.test_dir / "restored.bin"
+
+        stats = compressor.compress(input_file, compressed_file, None)
+        self.assertTrue(is_delta_stream(compressed_file))
+        DeltaCompressor(self.reference_file, self.engine._codec).decompress(compressed_file, output_file, None)
+        self.assertEqual(output_file.read_bytes(), input_file.read_bytes())
+        return stats
+
+    def test_roundtrip_mostly_copies(self):
+        for algorithm in ('rle', 'lzw'):
+            with self.subTest(algorithm=algorithm):
+                stats = self.roundtrip(self.input_file, algorithm)
+                self.assertLess(stats['compressed_size'], 10000)
+                self.assertLess(stats['inserted_size'], 6000)
+                self.assertEqual(stats['copied_size'], 174800)
+
+    def test_unrelated_and_empty_inputs(self):
+        stats = self.roundtrip(self.create_file("random.bin", os.urandom(5000)))
+        self.assertEqual(stats['copied_size'], 0)
+        self.roundtrip(self.create_file("empty.bin", b''))
+        self.roundtrip(self.create_file("tiny.bin", b'abc'))
+
+    def test_wrong_reference_rejected(self):
+        compressed_file = self.test_dir / "out.delta"
+        DeltaCompressor(self.reference_file, self.engine._codec).compress(self.input_file, compressed_file, None)
+
+        other_reference = self.create_file("other.bin", os.urandom(1000))
+        with self.assertRaises(ValueError):
+            DeltaCompressor(other_reference, self.engine._codec).decompress(
+                compressed_file, self.test_dir / "restored.bin", None)
+
+    def test_engine_reference_mode(self):
+        compressed_file = self.test_dir / "out.delta"
+        output_file = self.test_dir / "restored.bin"
+
+        self.engine.compress_file(self.input_file, compressed_file, None, reference=self.reference_file)
+        self.engine.decompress_file(compressed_file, output_file, None, reference=self.reference_file)
+
+        self.assertEqual(output_file.read_bytes(), self.new_data)
+
+
+if __name__ == "__main__":
+    unittest.main()
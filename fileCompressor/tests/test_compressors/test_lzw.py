@@ -1,7 +1,11 @@
+import io
 import unittest
 import os
+import struct
+import threading
 from pathlib import Path
-from compressors.lzw import LZWCompressor
+from compressors.lzw import FRAMED_MAGIC, LZWCompressor
+from utils.instrumentation import Instrumentation
 
 
 class TestLZWCompressor(unittest.TestCase):
@@ -76,6 +80,89 @@ class TestLZWCompressor(unittest.TestCase):
         self.assertEqual(empty_file.stat().st_size, 0)
         self.assertEqual(decompressed_file.stat().st_size, 0)
 
+    def test_compress_data_matches_file_format(self):
+        compressed_file = self.test_dir / "small.lzw"
+        data = self.small_text_file.read_bytes()
+
+        self.compressor.compress(self.small_text_file, compressed_file, None)
+
+        self.assertEqual(self.compressor.compress_data(data), compressed_file.read_bytes())
+        self.assertEqual(self.compressor.decompress_data(compressed_file.read_bytes()), data)
+
+    def test_compress_data_binary_roundtrip(self):
+        data = self.binary_file.read_bytes()
+        self.assertEqual(self.compressor.decompress_data(self.compressor.compress_data(data)), data)
+        self.assertEqual(self.compressor.compress_data(b''), b'')
+
+    def test_decompress_data_truncated(self):
+        with self.assertRaises(ValueError):
+            self.compressor.decompress_data(b'\x00\x00\x00\x05\x00\x41')
+
+    def test_instrumentation(self):
+        compressed_file = self.test_dir / "small.lzw"
+        decompressed_file = self.test_dir / "small_decompressed.txt"
+        self.compressor.instrumentation = Instrumentation()
+
+        stats = self.compressor.compress(self.small_text_file, compressed_file, None)
+        # Magic and version, one frame header, then the end frame with its 64-bit length and CRC32.
+        codes = (compressed_file.stat().st_size - 5 - 4 - 16) // 2
+        self.assertEqual(stats['counters']['codes_emitted'], codes)
+        self.assertAlmostEqual(stats['counters']['average_phrase_length'], 175 / codes)
+        self.assertEqual(stats['stages']['read']['bytes'], 175)
+        self.assertIn('encode', stats['stages'])
+
+        stats = self.compressor.decompress(compressed_file, decompressed_file, None)
+        self.assertEqual(stats['counters']['codes_decoded'], codes)
+        self.assertEqual(stats['stages']['decode']['bytes'], 175)
+
+    def test_truncated_file(self):
+        compressed_file = self.test_dir / "truncated.lzw"
+        compressed_file.write_bytes(b'\x00\x00\x00\x05\x00\x41')
+
+        with self.assertRaises(ValueError):
+            self.compressor.decompress(compressed_file, self.test_dir / "out.txt", None)
+
+    def test_stream_to_unseekable_output(self):
+        data = self.small_text_file.read_bytes() * 200 + self.binary_file.read_bytes()
+        read_fd, write_fd = os.pipe()
+        results = {}
+
+        def produce():
+            with open(write_fd, 'wb') as sink:
+                results['seekable'] = sink.seekable()
+                results['stats'] = self.compressor.compress_stream(io.BytesIO(data), sink, chunk_size=4096)
+
+        producer = threading.Thread(target=produce)
+        producer.start()
+        output = io.BytesIO()
+        with open(read_fd, 'rb') as source:
+            decoded = LZWCompressor().decompress_stream(source, output)
+        producer.join()
+        stats = results['stats']
+        self.assertFalse(results['seekable'])
+
+        self.assertEqual(output.getvalue(), data)
+        self.assertEqual(stats['original_size'], len(data))
+        self.assertEqual(decoded['original_size'], stats['compressed_size'])
+        self.assertEqual(self.compressor.compress_data(data)[:5], FRAMED_MAGIC + b'\x01')
+
+    def test_decodes_count_prefixed_streams(self):
+        legacy = (3).to_bytes(4, 'big') + struct.pack('>3H', 97, 98, 256)
+        self.assertEqual(self.compressor.decompress_data(legacy), b'abab')
+
+        compressed_file = self.test_dir / "legacy.lzw"
+        compressed_file.write_bytes(legacy)
+        self.compressor.decompress(compressed_file, self.test_dir / "legacy.txt", None)
+        self.assertEqual((self.test_dir / "legacy.txt").read_bytes(), b'abab')
+
+    def test_framed_stream_checks_terminator(self):
+        stream = self.compressor.compress_data(b"frames " * 1000)
+        length, checksum = struct.unpack('>QI', stream[-12:])
+        for damaged in (stream[:-16], stream[:-1], stream[:-12] + struct.pack('>QI', 1, checksum),
+                        stream[:-12] + struct.pack('>QI', length, checksum ^ 1)):
+            with self.assertRaises(ValueError):
+                self.compressor.decompress_data(damaged)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,85 @@
+import json
+import os
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from compressors import lzw_dictionary
+from compressors.lzw import LZWCompressor
+from compressors.lzw_dictionary import LZWDictionary, find_dictionary, load_dictionary, train_dictionary
+
+
+def _message(i):
+    return json.dumps({'id': i, 'type': 'order', 'status': 'shipped', 'customer': f'customer-{i % 7}',
+                       'items': [{'sku': f'SKU-{i % 13}', 'quantity': i % 3 + 1}]}).encode('utf-8')
+
+
+class TestLZWDictionary(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(__file__).parent / "test_files_dict"
+        self.test_dir.mkdir(exist_ok=True)
+        self.dictionary = train_dictionary([_message(i) for i in range(200)], max_entries=1024)
+        lzw_dictionary._registry.clear()
+        lzw_dictionary._file_cache.clear()
+
+    def tearDown(self):
+        for file in self.test_dir.glob("*"):
+            file.unlink()
+        self.test_dir.rmdir()
+        lzw_dictionary._registry.clear()
+        lzw_dictionary._file_cache.clear()
+
+    def test_training_is_prefix_closed_and_bounded(self):
+        self.assertLessEqual(len(self.dictionary), 1024)
+        phrases = set(self.dictionary.phrases)
+        for phrase in self.dictionary.phrases:
+            if len(phrase) > 2:
+                self.assertIn(phrase[:-1], phrases)
+
+    def test_invalid_phrases_rejected(self):
+        with self.assertRaises(ValueError):
+            LZWDictionary([b'abc'])
+
+    def test_save_and_load(self):
+        path = self.dictionary.save(self.test_dir / "orders.lzwdict")
+        loaded = load_dictionary(path)
+
+        self.assertEqual(loaded.dictionary_id, self.dictionary.dictionary_id)
+        self.assertEqual(loaded.phrases, self.dictionary.phrases)
+        self.assertIs(load_dictionary(path), loaded)
+
+    def test_small_message_ratio_improves(self):
+        message = _message(1000)
+        plain = LZWCompressor().compress_data(message)
+        seeded = LZWCompressor(self.dictionary).compress_data(message)
+
+        self.assertLess(len(seeded), len(plain))
+        self.assertEqual(LZWCompressor(self.dictionary).decompress_data(seeded), message)
+
+    def test_file_roundtrip_with_dictionary(self):
+        input_file = self.test_dir / "message.json"
+        compressed_file = self.test_dir / "message.lzw"
+        output_file = self.test_dir / "message.out"
+        input_file.write_bytes(b''.join(_message(i) for i in range(500, 520)) + os.urandom(100))
+
+        LZWCompressor(self.dictionary).compress(input_file, compressed_file, None)
+        self.assertEqual(compressed_file.read_bytes()[:4], b'LZWD')
+        self.assertEqual(LZWCompressor(self.dictionary).compress_data(input_file.read_bytes()),
+                         compressed_file.read_bytes())
+
+        LZWCompressor(self.dictionary).decompress(compressed_file, output_file, None)
+        self.assertEqual(output_file.read_bytes(), input_file.read_bytes())
+
+    def test_decoder_finds_dictionary_by_id(self):
+        compressed = LZWCompressor(self.dictionary).compress_data(_message(1))
+
+        with patch.object(lzw_dictionary, 'search_paths', return_value=[self.test_dir]):
+            with self.assertRaises(ValueError):
+                LZWCompressor().decompress_data(compressed)
+
+            self.dictionary.save(self.test_dir / "renamed.lzwdict")
+            self.assertEqual(LZWCompressor().decompress_data(compressed), _message(1))
+            self.assertEqual(find_dictionary(self.dictionary.dictionary_id).phrases, self.dictionary.phrases)
+
+
+if __name__ == "__main__":
+    unittest.main()
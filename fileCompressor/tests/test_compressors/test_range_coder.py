@@ -0,0 +1,118 @@
+import random
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from compressors.range_coder import AdaptiveModel, RangeCoderCompressor
+from core.compression_engine import CompressionEngine
+from core.verify import verify_file
+from utils.progress_tracker import CancellationToken, OperationCancelled, ProgressTracker
+
+
+class TestRangeCoder(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(__file__).parent / "test_files_range_coder"
+        self.test_dir.mkdir(exist_ok=True)
+        self.engine = CompressionEngine(instrument=True)
+        self.input_file = self.test_dir / "input.txt"
+        rng = random.Random(7)
+        words = [b'alpha', b'beta', b'gamma', b'\n', b'delta', b'aaaaaaaaaaaa']
+        self.input_file.write_bytes(b' '.join(rng.choice(words) for _ in range(6000)))
+
+    def tearDown(self):
+        for file in self.test_dir.glob("*"):
+            file.unlink()
+        self.test_dir.rmdir()
+
+    def test_model_cumulative_frequencies(self):
+        model = AdaptiveModel(symbols=10, increment=5, limit=60)
+        for symbol in (3, 3, 7, 0, 9, 3, 3, 3):
+            model.update(symbol)
+            self.assertEqual(model.total, sum(model.freq))
+            for s in range(10):
+                start = model.cumulative(s)
+                self.assertEqual(start, sum(model.freq[:s]))
+                self.assertEqual(model.find(start), (s, start))
+                self.assertEqual(model.find(start + model.freq[s] - 1), (s, start))
+        self.assertLessEqual(model.total, 60)
+
+    def test_file_round_trip(self):
+        for algorithm in ('range', 'rle-range', 'lzw-range'):
+            with self.subTest(algorithm=algorithm):
+                compressed_file = self.test_dir / f"input.{algorithm}"
+                output_file = self.test_dir / f"output.{algorithm}.txt"
+                tracker = ProgressTracker(self.input_file.stat().st_size)
+                stats = self.engine.compress_file(self.input_file, compressed_file, algorithm, tracker)
+                self.assertEqual(tracker.stats.bytes_processed, self.input_file.stat().st_size)
+                self.assertIn('entropy_encode', stats['stages'])
+                compressor = self.engine.get_compressor(None, algorithm)
+                compressor.get_compression_stats()['original_size'] = -1
+                self.assertEqual(compressor.get_compression_stats()['original_size'], 0)
+
+                tracker = ProgressTracker(compressed_file.stat().st_size)
+                stats = self.engine.decompress_file(compressed_file, output_file, algorithm, tracker)
+                self.assertEqual(output_file.read_bytes(), self.input_file.read_bytes())
+                self.assertEqual(stats['decompressed_size'], self.input_file.stat().st_size)
+                self.assertTrue(stats['checksum_verified'])
+                self.assertEqual(verify_file(compressed_file, algorithm)['decompressed_size'],
+                                 self.input_file.stat().st_size)
+                self.assertEqual(sorted(f.name for f in self.test_dir.glob(".*")), [])
+
+        range_size = (self.test_dir / "input.range").stat().st_size
+        lzw_range_size = (self.test_dir / "input.lzw-range").stat().st_size
+        self.engine.compress_file(self.input_file, self.test_dir / "input.lzw", 'lzw')
+        self.assertLess(range_size, self.input_file.stat().st_size * 0.6)
+        self.assertLess(lzw_range_size, (self.test_dir / "input.lzw").stat().st_size)
+
+    def test_in_memory_and_invalid_data(self):
+        compressor = RangeCoderCompressor()
+        for data in (b'', b'x', bytes(range(256)) * 40, b'\xff' * 5000):
+            self.assertEqual(compressor.decompress_data(compressor.compress_data(data)), data)
+
+        lzw_stream = self.engine.get_compressor(None, 'lzw-range').compress_data(b'banana' * 100)
+        self.assertEqual(compressor.decompress_data(lzw_stream), b'banana' * 100)
+        with self.assertRaises(ValueError):
+            compressor.decompress_data(b'FCRX\x01\x00' + bytes(8))
+
+    def test_corruption_detected(self):
+        for algorithm in ('range', 'rle-range', 'lzw-range'):
+            with self.subTest(algorithm=algorithm):
+                compressed_file = self.test_dir / f"input.{algorithm}"
+                self.engine.compress_file(self.input_file, compressed_file, algorithm)
+                data = bytearray(compressed_file.read_bytes())
+                data[len(data) // 2] ^= 0x10
+                compressed_file.write_bytes(bytes(data))
+
+                with self.assertRaises(ValueError):
+                    self.engine.decompress_file(compressed_file, self.test_dir / "output.txt", algorithm)
+                with self.assertRaises(ValueError):
+                    verify_file(compressed_file, algorithm)
+                with self.assertRaises(ValueError):
+                    self.engine.get_compressor(None, algorithm).decompress_data(bytes(data))
+
+    def test_stage_files_stay_out_of_output_directory(self):
+        stage_dir = Path(__file__).parent / "test_files_range_coder_stage"
+        stage_dir.mkdir()
+        self.addCleanup(stage_dir.rmdir)
+        compressed_file = self.test_dir / "input.rle-range"
+        self.engine.compress_file(self.input_file, compressed_file, 'rle-range')
+        with patch.object(tempfile, 'tempdir', str(stage_dir)), \
+                patch.object(tempfile, 'mkstemp', wraps=tempfile.mkstemp) as mkstemp:
+            # verify decodes into os.devnull, so a stage file next to the output would land in /dev.
+            stats = verify_file(compressed_file, 'rle-range')
+        self.assertTrue(stats['checksum_verified'])
+        self.assertEqual(stats['decompressed_size'], self.input_file.stat().st_size)
+        mkstemp.assert_called_once()
+        self.assertEqual(list(stage_dir.iterdir()), [])
+
+    def test_cancel_removes_stage_files(self):
+        token = CancellationToken()
+        token.cancel()
+        tracker = ProgressTracker(self.input_file.stat().st_size, token=token)
+        with self.assertRaises(OperationCancelled):
+            self.engine.compress_file(self.input_file, self.test_dir / "input.rle-range", 'rle-range', tracker)
+        self.assertEqual(sorted(f.name for f in self.test_dir.iterdir()), ['input.txt'])
+
+
+if __name__ == '__main__':
+    unittest.main()
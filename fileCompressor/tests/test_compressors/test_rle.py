@@ -1,7 +1,10 @@
 import unittest
 from pathlib import Path
 import os
+import struct
+import zlib
 from compressors.rle import RLECompressor
+from utils.instrumentation import Instrumentation
 
 
 class TestRLECompressor(unittest.TestCase):
@@ -97,6 +100,78 @@ class TestRLECompressor(unittest.TestCase):
                     result = f.read()
                 self.assertEqual(result, data)
 
+    def test_compress_data_matches_file_format(self):
+        data = b'AAAAABBBCC' + bytes(range(50)) + b'Z' * 600
+        input_file = self.create_test_file("input.txt", data)
+        compressed_file = self.test_dir / "compressed.rle"
+        output_file = self.test_dir / "output.txt"
+
+        compressed_file.write_bytes(self.rle_compressor.compress_data(data))
+        self.rle_compressor.decompress(compressed_file, output_file, None)
+
+        self.assertEqual(output_file.read_bytes(), data)
+        self.assertEqual(self.rle_compressor.decompress_data(compressed_file.read_bytes()), data)
+
+    def test_decompress_data_invalid(self):
+        with self.assertRaises(ValueError):
+            self.rle_compressor.decompress_data(b'\x01A\x02')
+        with self.assertRaises(ValueError):
+            self.rle_compressor.decompress_data(b'\x00A')
+
+    def test_trailer_checksum(self):
+        test_data = b'A' * 300 + b'BC' * 50
+        input_file = self.create_test_file("input.txt", test_data)
+        compressed_file = self.test_dir / "compressed.rle"
+        output_file = self.test_dir / "output.txt"
+
+        self.rle_compressor.compress(input_file, compressed_file, None)
+        stats = self.rle_compressor.decompress(compressed_file, output_file, None)
+        self.assertTrue(stats['checksum_verified'])
+        self.assertEqual(self.rle_compressor.decompress_data(compressed_file.read_bytes()), test_data)
+
+        data = bytearray(compressed_file.read_bytes())
+        data[1] ^= 0x01
+        compressed_file.write_bytes(bytes(data))
+        with self.assertRaises(ValueError):
+            self.rle_compressor.decompress(compressed_file, output_file, None)
+        with self.assertRaises(ValueError):
+            self.rle_compressor.decompress_data(bytes(data))
+
+    def test_exact_run_of_255(self):
+        test_data = b'A' * 255 + b'B' * 510
+        input_file = self.create_test_file("input.txt", test_data)
+        compressed_file = self.test_dir / "compressed.rle"
+        output_file = self.test_dir / "output.txt"
+
+        self.rle_compressor.compress(input_file, compressed_file, None)
+        self.rle_compressor.decompress(compressed_file, output_file, None)
+
+        self.assertEqual(compressed_file.read_bytes(),
+                         b'\x00RLE\x01\x00\xffA\xffB\xffB\x00C' + struct.pack('>I', zlib.crc32(test_data)))
+        self.assertEqual(output_file.read_bytes(), test_data)
+
+    def test_headerless_stream(self):
+        compressed_file = self.test_dir / "legacy.rle"
+        output_file = self.test_dir / "output.txt"
+        compressed_file.write_bytes(b'\x03A\x02B')
+
+        stats = self.rle_compressor.decompress(compressed_file, output_file, None)
+        self.assertEqual(output_file.read_bytes(), b'AAABB')
+        self.assertNotIn('checksum_verified', stats)
+
+    def test_instrumentation(self):
+        input_file = self.create_test_file("input.txt", b'A' * 20000 + b'BC' * 100)
+        compressed_file = self.test_dir / "compressed.rle"
+        self.rle_compressor.instrumentation = Instrumentation()
+
+        stats = self.rle_compressor.compress(input_file, compressed_file, None)
+
+        self.assertEqual(stats['stages']['read']['bytes'], 20200)
+        self.assertEqual(stats['stages']['encode']['bytes'], 20200)
+        self.assertEqual(stats['stages']['write']['bytes'], compressed_file.stat().st_size)
+        self.assertEqual(stats['counters']['runs_emitted'], (compressed_file.stat().st_size - 12) // 2)
+        self.assertEqual(stats['histograms']['run_length']['1'], 200)
+
 
 if __name__ == '__main__':
     unittest.main()
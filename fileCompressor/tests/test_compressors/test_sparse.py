@@ -0,0 +1,96 @@
+import os
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from core.compression_engine import CompressionEngine
+from compressors.sparse import SparseCompressor, is_sparse_stream
+from utils.sparse import data_extents, has_holes
+
+
+class TestSparseCompressor(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(__file__).parent / "test_files_sparse"
+        self.test_dir.mkdir(exist_ok=True)
+        self.engine = CompressionEngine()
+        self.input_file = self.test_dir / "disk.img"
+        self.payload = b'superblock ' * 1000
+        with open(self.input_file, 'wb') as f:
+            f.truncate(64 * 1024 * 1024)
+            f.seek(8 * 1024 * 1024)
+            f.write(self.payload)
+            f.seek(40 * 1024 * 1024)
+            f.write(os.urandom(5000))
+
+    def tearDown(self):
+        for file in self.test_dir.glob("*"):
+            file.unlink()
+        self.test_dir.rmdir()
+
+    def test_data_extents_cover_all_data(self):
+        extents = list(data_extents(self.input_file))
+        data = self.input_file.read_bytes()
+        covered = bytearray(len(data))
+        for offset, length in extents:
+            covered[offset:offset + length] = data[offset:offset + length]
+        self.assertEqual(bytes(covered), data)
+
+        if has_holes(self.input_file):
+            self.assertLess(sum(length for _, length in extents), 1024 * 1024)
+
+    def test_round_trip_recreates_holes(self):
+        compressed_file = self.test_dir / "disk.sparse"
+        output_file = self.test_dir / "restored.img"
+
+        stats = self.engine.compress_file(self.input_file, compressed_file, 'lzw', sparse=True)
+        self.assertTrue(is_sparse_stream(compressed_file, self.engine.available_algorithms))
+        self.assertEqual(stats['data_size'] + stats['hole_size'], stats['original_size'])
+
+        self.engine.decompress_file(compressed_file, output_file, None)
+        self.assertEqual(output_file.stat().st_size, self.input_file.stat().st_size)
+        with open(output_file, 'rb') as f:
+            f.seek(8 * 1024 * 1024)
+            self.assertEqual(f.read(len(self.payload)), self.payload)
+        self.assertEqual(output_file.read_bytes(), self.input_file.read_bytes())
+
+        if has_holes(self.input_file):
+            self.assertLess(stats['compressed_size'], 1024 * 1024)
+            self.assertTrue(has_holes(output_file))
+
+    def test_holes_are_not_read(self):
+        if not has_holes(self.input_file):
+            self.skipTest("filesystem does not report holes")
+        compressor = SparseCompressor(self.engine._codec, 'rle')
+        with patch('utils.file_handler.FileHandler.read_chunk', autospec=True,
+                   side_effect=lambda handler, size: handler._current_file.read(size)) as read_chunk:
+            compressor.compress(self.input_file, self.test_dir / "disk.sparse", None)
+
+        self.assertLess(sum(call.args[1] for call in read_chunk.call_args_list), 1024 * 1024)
+
+    def test_file_without_holes(self):
+        plain_file = self.test_dir / "plain.txt"
+        plain_file.write_bytes(b'no holes here\n' * 500)
+        compressed_file = self.test_dir / "plain.sparse"
+        output_file = self.test_dir / "plain.out"
+
+        stats = SparseCompressor(self.engine._codec, 'rle').compress(plain_file, compressed_file, None)
+        self.assertEqual(stats['hole_size'], 0)
+        SparseCompressor(self.engine._codec).decompress(compressed_file, output_file, None)
+        self.assertEqual(output_file.read_bytes(), plain_file.read_bytes())
+
+    def test_compressed_filesystem_is_not_sparse(self):
+        # Transparent compression also leaves fewer allocated blocks than bytes, but SEEK_HOLE finds no hole.
+        plain_file = self.test_dir / "plain.txt"
+        plain_file.write_bytes(b'no holes here\n' * 500)
+        stat = os.stat(plain_file)
+        compressed_stat = os.stat_result(stat[:10] + (stat.st_size,) * 3, {'st_blocks': 1})
+        with patch('utils.sparse.os.stat', return_value=compressed_stat):
+            self.assertFalse(has_holes(plain_file))
+
+    def test_plain_streams_are_not_sparse(self):
+        plain_file = self.test_dir / "plain.txt"
+        plain_file.write_bytes(b'FCSP' * 10)
+        self.assertFalse(is_sparse_stream(plain_file, self.engine.available_algorithms))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import random
+import unittest
+from pathlib import Path
+from core.adaptive import AdaptiveSelector, file_signature
+from core.compression_engine import CompressionEngine
+from utils.metrics_log import MetricsLog
+
+
+class TestAdaptiveSelector(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(__file__).parent / "test_files_adaptive"
+        self.test_dir.mkdir(exist_ok=True)
+        self.log = MetricsLog(self.test_dir / "metrics.jsonl")
+        self.input_file = self.test_dir / "input.txt"
+        self.input_file.write_bytes(b"adaptive " * 3000)
+
+    def tearDown(self):
+        for file in self.test_dir.glob("*"):
+            file.unlink()
+        self.test_dir.rmdir()
+
+    def _log(self, algorithm, ratio, throughput, file_path=None):
+        file_type, magic, bucket = file_signature(file_path or self.input_file)
+        self.log.append({'operation': 'compress', 'algorithm': algorithm, 'mode': 'file', 'file_type': file_type,
+                         'magic': magic, 'size_bucket': bucket, 'compression_ratio': ratio,
+                         'throughput': throughput})
+
+    def test_objectives(self):
+        self._log('rle', 10.0, 50.0)
+        self._log('lzw', 60.0, 5.0)
+        self._log('lzw', 70.0, 7.0)
+
+        candidates = ['rle', 'lzw']
+        self.assertEqual(AdaptiveSelector(self.log, 'ratio', epsilon=0).choose(self.input_file, candidates), 'lzw')
+        self.assertEqual(AdaptiveSelector(self.log, 'throughput', epsilon=0).choose(self.input_file, candidates),
+                         'rle')
+        weighted = AdaptiveSelector(self.log, 'weighted', ratio_weight=0.9, epsilon=0)
+        self.assertEqual(weighted.choose(self.input_file, candidates), 'lzw')
+        self.assertIsNone(weighted.choose(self.input_file, ['rle-plugin']))
+
+        other_file = self.test_dir / "other.bin"
+        other_file.write_bytes(b"\x00\x01" * 10)
+        self.assertIsNone(weighted.choose(other_file, candidates))
+
+        with self.assertRaises(ValueError):
+            AdaptiveSelector(self.log, 'smallest')
+
+    def test_exploration_prefers_untried(self):
+        self._log('rle', 10.0, 50.0)
+        selector = AdaptiveSelector(self.log, 'throughput', epsilon=1.0, rng=random.Random(0))
+        self.assertEqual(selector.choose(self.input_file, ['rle', 'lzw']), 'lzw')
+
+    def test_engine_learns_from_outcomes(self):
+        selector = AdaptiveSelector(self.log, 'ratio', epsilon=0)
+        engine = CompressionEngine(metrics_log=self.log, selector=selector)
+        engine.compress_file(self.input_file, self.test_dir / "a.rle", 'rle')
+        engine.compress_file(self.input_file, self.test_dir / "a.lzw", 'lzw')
+
+        signature = file_signature(self.input_file)
+        self.assertEqual(selector.best(signature), 'lzw')
+        self.assertEqual(engine.choose_algorithm(self.input_file), 'lzw')
+        engine.compress_file(self.input_file, self.test_dir / "auto.out", None)
+        self.assertEqual(list(self.log.records())[-1]['algorithm'], 'lzw')
+
+        # A fresh selector rebuilds the same model from the log without double counting.
+        reloaded = AdaptiveSelector(self.log, 'ratio', epsilon=0)
+        self.assertEqual(reloaded.best(signature), 'lzw')
+        self.assertEqual(reloaded._model()[signature]['lzw'][0], selector._model()[signature]['lzw'][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
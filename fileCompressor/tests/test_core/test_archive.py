@@ -0,0 +1,110 @@
+import os
+import unittest
+from pathlib import Path
+from core.archive import Archive, open_archive
+from core.solid_archive import SolidArchive, create_solid_archive
+from ui.cli.command_line import CommandLineUI
+
+
+class TestArchive(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(__file__).parent / "test_files_archive"
+        self.test_dir.mkdir(exist_ok=True)
+        self.archive_file = self.test_dir / "files.fca"
+
+    def tearDown(self):
+        for file in sorted(self.test_dir.rglob("*"), reverse=True):
+            file.rmdir() if file.is_dir() else file.unlink()
+        self.test_dir.rmdir()
+
+    def create_file(self, name, content: bytes, mtime=None):
+        path = self.test_dir / name
+        path.write_bytes(content)
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        return path
+
+    def test_add_list_and_extract(self):
+        archive = Archive(self.archive_file)
+        archive.add_file(self.create_file("runs.bin", b'A' * 5000 + b'B' * 5000, mtime=1700000000), algorithm='rle')
+        archive.add_file(self.create_file("text.txt", b'hello world ' * 1000), algorithm='lzw')
+
+        reopened = Archive(self.archive_file)
+        self.assertEqual([(entry['name'], entry['algorithm']) for entry in reopened.list()],
+                         [("runs.bin", 'rle'), ("text.txt", 'lzw')])
+
+        output_file = self.test_dir / "out.bin"
+        reopened.extract("runs.bin", output_file)
+        self.assertEqual(output_file.read_bytes(), b'A' * 5000 + b'B' * 5000)
+        self.assertEqual(output_file.stat().st_mtime, 1700000000)
+
+    def test_append_keeps_existing_entries(self):
+        archive = Archive(self.archive_file)
+        archive.add_file(self.create_file("first.txt", b'first ' * 500))
+        first_entry = dict(archive.entries["first.txt"])
+        with open(self.archive_file, 'rb') as f:
+            f.seek(first_entry['offset'])
+            first_data = f.read(first_entry['compressed_size'])
+
+        appended = Archive(self.archive_file)
+        appended.add_file(self.create_file("second.bin", os.urandom(3000)))
+
+        reopened = Archive(self.archive_file)
+        self.assertEqual(reopened.entries["first.txt"], first_entry)
+        with open(self.archive_file, 'rb') as f:
+            f.seek(first_entry['offset'])
+            self.assertEqual(f.read(first_entry['compressed_size']), first_data)
+
+        reopened.extract_all(self.test_dir / "restored")
+        self.assertEqual((self.test_dir / "restored" / "second.bin").read_bytes(),
+                         (self.test_dir / "second.bin").read_bytes())
+
+        with self.assertRaises(ValueError):
+            reopened.add_file(self.test_dir / "first.txt")
+
+    def test_corrupted_entry_detected(self):
+        archive = Archive(self.archive_file)
+        archive.add_file(self.create_file("data.txt", b'abcabcabc' * 300), algorithm='rle')
+        entry = archive.entries["data.txt"]
+
+        data = bytearray(self.archive_file.read_bytes())
+        data[entry['offset'] + 1] ^= 0x01
+        self.archive_file.write_bytes(bytes(data))
+
+        with self.assertRaises(ValueError):
+            Archive(self.archive_file).extract("data.txt", self.test_dir / "out.txt")
+
+    def test_cli_extracts_incompressible_entry(self):
+        content = os.urandom(20000)
+        Archive(self.archive_file).add_file(self.create_file("random.bin", content), algorithm='rle')
+        output_file = self.test_dir / "out.bin"
+        cli = CommandLineUI()
+
+        errors = []
+        cli.show_error = errors.append
+        cli.show_stats = lambda stats: None
+        cli._handle_extract(f"extract {self.archive_file} random.bin {output_file}")
+        self.assertEqual(errors, [])
+        self.assertEqual(output_file.read_bytes(), content)
+
+        output_file.unlink()
+        data = bytearray(self.archive_file.read_bytes())
+        data[Archive(self.archive_file).entries["random.bin"]['offset'] + 1] ^= 0x01
+        self.archive_file.write_bytes(bytes(data))
+        cli._handle_extract(f"extract {self.archive_file} random.bin {output_file}")
+        self.assertEqual(len(errors), 1)
+        self.assertFalse(output_file.exists())
+
+    def test_open_archive_detects_format(self):
+        self.create_file("a.txt", b'aaaa')
+        Archive(self.archive_file).add_files([self.test_dir / "a.txt"])
+        create_solid_archive(self.test_dir / "files.solid", [self.test_dir / "a.txt"])
+
+        self.assertIsInstance(open_archive(self.archive_file), Archive)
+        self.assertIsInstance(open_archive(self.test_dir / "files.solid"), SolidArchive)
+        with self.assertRaises(ValueError):
+            open_archive(self.test_dir / "a.txt")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import asyncio
+import os
+import unittest
+from pathlib import Path
+from core.async_engine import (AsyncCompressionStream, AsyncDecompressionStream, compress_async,
+                               create_executor, decompress_async)
+from core.block_format import is_block_stream
+
+
+class TestAsyncEngine(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.test_dir = Path(__file__).parent / "test_files_async"
+        self.test_dir.mkdir(exist_ok=True)
+        self.input_file = self.test_dir / "input.bin"
+        self.data = b'hello world ' * 3000 + os.urandom(5000) + b'A' * 4000
+        self.input_file.write_bytes(self.data)
+
+    def tearDown(self):
+        for file in self.test_dir.glob("*"):
+            file.unlink()
+        self.test_dir.rmdir()
+
+    async def test_compress_decompress_roundtrip(self):
+        compressed_file = self.test_dir / "out.fcbk"
+        output_file = self.test_dir / "out.bin"
+
+        for algorithm in ('rle', 'lzw'):
+            with self.subTest(algorithm=algorithm):
+                stats = await compress_async(self.input_file, compressed_file, algorithm, block_size=8192)
+                self.assertTrue(is_block_stream(compressed_file))
+                self.assertEqual(stats['original_size'], len(self.data))
+
+                stats = await decompress_async(compressed_file, output_file)
+                self.assertEqual(output_file.read_bytes(), self.data)
+                self.assertEqual(stats['decompressed_size'], len(self.data))
+
+    async def test_concurrent_jobs_with_shared_executor(self):
+        with create_executor('thread', max_workers=2) as executor:
+            jobs = [compress_async(self.input_file, self.test_dir / f"out{i}.fcbk", 'lzw', executor, block_size=4096)
+                    for i in range(4)]
+            results = await asyncio.gather(*jobs)
+
+        self.assertEqual(len(results), 4)
+        for i in range(4):
+            await decompress_async(self.test_dir / f"out{i}.fcbk", self.test_dir / f"out{i}.bin")
+            self.assertEqual((self.test_dir / f"out{i}.bin").read_bytes(), self.data)
+
+    async def test_cancellation_removes_output(self):
+        compressed_file = self.test_dir / "cancelled.fcbk"
+        task = asyncio.create_task(compress_async(self.input_file, compressed_file, 'lzw', block_size=1024))
+        await asyncio.sleep(0)
+        task.cancel()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertFalse(compressed_file.exists())
+
+    async def test_stream_roundtrip(self):
+        compressed = bytearray()
+        async with AsyncCompressionStream('lzw', block_size=5000, max_pending=2) as stream:
+            for i in range(0, len(self.data), 1777):
+                compressed.extend(await stream.write(self.data[i:i + 1777]))
+            compressed.extend(await stream.close())
+
+        restored = bytearray()
+        decoder = AsyncDecompressionStream()
+        for i in range(0, len(compressed), 999):
+            restored.extend(await decoder.write(bytes(compressed[i:i + 999])))
+        restored.extend(await decoder.close())
+
+        self.assertTrue(decoder.finished)
+        self.assertEqual(bytes(restored), self.data)
+
+    async def test_stream_truncated(self):
+        stream = AsyncCompressionStream('rle', block_size=1000)
+        compressed = await stream.write(self.data[:5000]) + await stream.close()
+
+        decoder = AsyncDecompressionStream()
+        await decoder.write(compressed[:-12])
+        with self.assertRaises(ValueError):
+            await decoder.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock
+from core.block_format import is_block_stream
+from core.checkpoint import checkpoint_path, compress_resumable, load_checkpoint, partial_path, resume_compression
+from core.compression_engine import CompressionEngine
+
+
+class Interrupted(Exception):
+    pass
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(__file__).parent / "test_files_checkpoint"
+        self.test_dir.mkdir(exist_ok=True)
+        self.engine = CompressionEngine()
+        self.input_file = self.test_dir / "input.log"
+        self.data = b''.join(f"event {i} ok\n".encode() + os.urandom(i % 40) for i in range(20000))
+        self.input_file.write_bytes(self.data)
+        self.output_file = self.test_dir / "input.lzw"
+
+    def tearDown(self):
+        for file in self.test_dir.glob("*"):
+            file.unlink()
+        self.test_dir.rmdir()
+
+    def codec(self, algorithm):
+        return self.engine.get_compressor(None, algorithm)
+
+    def interrupt_after(self, blocks, block_size):
+        tracker = MagicMock()
+
+        def update(offset):
+            if offset >= blocks * block_size:
+                raise Interrupted()
+        tracker.update.side_effect = update
+        return tracker
+
+    def test_interrupted_compression_resumes(self):
+        with self.assertRaises(Interrupted):
+            compress_resumable(self.input_file, self.output_file, self.codec('lzw'), 'lzw',
+                               self.interrupt_after(7, 32768), block_size=32768, checkpoint_interval=2)
+
+        self.assertFalse(self.output_file.exists())
+        self.assertTrue(partial_path(self.output_file).exists())
+        self.assertEqual(load_checkpoint(self.output_file)['input_offset'], 6 * 32768)
+
+        codec = self.codec('lzw')
+        codec.compress_data = MagicMock(wraps=codec.compress_data)
+        stats = resume_compression(self.output_file, lambda algorithm: codec)
+        self.assertEqual(stats['resumed_from'], 6 * 32768)
+        self.assertEqual(codec.compress_data.call_count, -(-len(self.data) // 32768) - 6)
+
+        self.assertFalse(partial_path(self.output_file).exists())
+        self.assertFalse(checkpoint_path(self.output_file).exists())
+        self.assertTrue(is_block_stream(self.output_file))
+
+        restored = self.test_dir / "restored.log"
+        self.engine.decompress_file(self.output_file, restored, None)
+        self.assertEqual(restored.read_bytes(), self.data)
+
+    def test_interrupted_before_first_interval_resumes(self):
+        with self.assertRaises(Interrupted):
+            compress_resumable(self.input_file, self.output_file, self.codec('rle'), 'rle',
+                               self.interrupt_after(1, 32768), block_size=32768)
+        self.assertEqual(load_checkpoint(self.output_file)['input_offset'], 0)
+
+        stats = resume_compression(self.output_file, self.codec)
+        self.assertEqual(stats['resumed_from'], 0)
+        restored = self.test_dir / "restored.log"
+        self.engine.decompress_file(self.output_file, restored, None)
+        self.assertEqual(restored.read_bytes(), self.data)
+
+    def test_changed_input_restarts(self):
+        with self.assertRaises(Interrupted):
+            compress_resumable(self.input_file, self.output_file, self.codec('rle'), 'rle',
+                               self.interrupt_after(3, 16384), block_size=16384, checkpoint_interval=1)
+
+        self.input_file.write_bytes(self.data[::-1])
+        with self.assertRaises(ValueError):
+            resume_compression(self.output_file, self.codec)
+
+        stats = compress_resumable(self.input_file, self.output_file, self.codec('rle'), 'rle', block_size=16384)
+        self.assertEqual(stats['resumed_from'], 0)
+        restored = self.test_dir / "restored.log"
+        self.engine.decompress_file(self.output_file, restored, None)
+        self.assertEqual(restored.read_bytes(), self.data[::-1])
+
+    def test_engine_checkpoints_large_inputs(self):
+        engine = CompressionEngine(checkpoint_threshold=1024)
+        engine.compress_file(self.input_file, self.output_file, 'rle')
+        self.assertTrue(is_block_stream(self.output_file, engine.available_algorithms))
+
+        restored = self.test_dir / "restored.log"
+        engine.decompress_file(self.output_file, restored, None)
+        self.assertEqual(restored.read_bytes(), self.data)
+
+    def test_missing_checkpoint(self):
+        with self.assertRaises(ValueError):
+            resume_compression(self.output_file, self.codec)
+
+
+if __name__ == '__main__':
+    unittest.main()
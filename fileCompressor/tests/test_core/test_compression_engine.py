@@ -0,0 +1,156 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+from compressors.lzw import LZWCompressor
+from compressors.lzw_dictionary import STREAM_MAGIC, _registry, register_dictionary, train_dictionary
+from compressors.rle import RLECompressor
+from core.block_format import BlockReader, is_block_stream
+from core.compression_engine import CompressionEngine
+from utils.file_handler import FileHandler
+from utils.metrics_log import MetricsLog
+from utils.progress_tracker import CancellationToken, OperationCancelled, ProgressTracker
+from utils.result_cache import ResultCache
+
+
+class TestCompressionEngine(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(__file__).parent / "test_files_engine"
+        self.test_dir.mkdir(exist_ok=True)
+        self.input_file = self.test_dir / "input.txt"
+        self.input_file.write_bytes(b"abcabcabc" * 200 + b"z" * 300)
+        self.engine = CompressionEngine()
+
+    def tearDown(self):
+        for file in sorted(self.test_dir.rglob("*"), reverse=True):
+            file.rmdir() if file.is_dir() else file.unlink()
+        self.test_dir.rmdir()
+
+    def test_get_compressor(self):
+        self.assertIsInstance(self.engine.get_compressor(self.input_file, 'lzw'), LZWCompressor)
+        self.assertIsInstance(self.engine.get_compressor(self.input_file, None), RLECompressor)
+        with self.assertRaises(ValueError):
+            self.engine.get_compressor(self.input_file, 'unknown')
+
+    def test_compress_decompress_file(self):
+        compressed_file = self.test_dir / "out.lzw"
+        output_file = self.test_dir / "out.txt"
+
+        self.engine.compress_file(self.input_file, compressed_file, 'lzw')
+        self.engine.decompress_file(compressed_file, output_file, 'lzw')
+
+        self.assertEqual(output_file.read_bytes(), self.input_file.read_bytes())
+
+    def test_decompress_detects_algorithm(self):
+        # The size heuristic alone would pick RLE for this small file.
+        for algorithm in ('lzw', 'rle'):
+            compressed_file = self.test_dir / f"out.{algorithm}"
+            output_file = self.test_dir / "out.txt"
+            self.engine.compress_file(self.input_file, compressed_file, algorithm)
+            self.engine.decompress_file(compressed_file, output_file, None)
+            self.assertEqual(output_file.read_bytes(), self.input_file.read_bytes())
+
+        renamed = self.test_dir / "out.bin"
+        (self.test_dir / "out.lzw").rename(renamed)
+        self.engine.decompress_file(renamed, self.test_dir / "out.txt", 'rle')
+        self.assertEqual((self.test_dir / "out.txt").read_bytes(), self.input_file.read_bytes())
+
+    def test_rle_output_never_looks_like_another_format(self):
+        # Runs that spell out the LZW magic: Z*76 is count 'L', F*87 is count 'W', then 0x01 once.
+        self.input_file.write_bytes(b'Z' * 76 + b'F' * 87 + b'\x01' + b'hello world')
+        compressed_file = self.test_dir / "out.rle"
+        output_file = self.test_dir / "out.txt"
+
+        self.engine.compress_file(self.input_file, compressed_file, 'rle')
+        for algorithm in ('rle', None):
+            self.engine.decompress_file(compressed_file, output_file, algorithm)
+            self.assertEqual(output_file.read_bytes(), self.input_file.read_bytes())
+
+    def test_cache_hit_skips_compression(self):
+        self.engine.cache = ResultCache(self.test_dir / "cache")
+        first = self.test_dir / "first.lzw"
+        second = self.test_dir / "second.lzw"
+
+        stats = self.engine.compress_file(self.input_file, first, 'lzw')
+        self.assertFalse(stats['cache_hit'])
+
+        with patch.object(LZWCompressor, 'compress') as mock_compress:
+            stats = self.engine.compress_file(self.input_file, second, 'lzw')
+            mock_compress.assert_not_called()
+
+        self.assertTrue(stats['cache_hit'])
+        self.assertEqual(stats['original_size'], self.input_file.stat().st_size)
+        self.assertEqual(second.read_bytes(), first.read_bytes())
+
+        stats = self.engine.compress_file(self.input_file, self.test_dir / "third.rle", 'rle')
+        self.assertFalse(stats['cache_hit'])
+
+    def test_cancelled_operation_removes_output(self):
+        self.input_file.write_bytes(b"abcabcabc" * 20000)
+        output_file = self.test_dir / "out.rle"
+        token = CancellationToken()
+        tracker = ProgressTracker(self.input_file.stat().st_size,
+                                  lambda stats: token.cancel() if stats.bytes_processed > 16384 else None,
+                                  token=token)
+
+        with self.assertRaises(OperationCancelled) as context:
+            self.engine.compress_file(self.input_file, output_file, 'rle', tracker)
+
+        self.assertFalse(output_file.exists())
+        stats = context.exception.stats
+        self.assertTrue(stats['cancelled'])
+        self.assertEqual(stats['reason'], 'cancelled')
+        self.assertGreater(stats['bytes_processed'], 16384)
+        self.assertLess(stats['bytes_processed'], stats['total_size'])
+
+    def test_executor_keeps_engine_settings(self):
+        self.input_file.write_bytes(b'{"sensor": 7, "status": "nominal"}\n' * 20000)
+        dictionary = train_dictionary([b'{"sensor": %d, "status": "nominal"}' % i for i in range(200)],
+                                      max_entries=256)
+        register_dictionary(dictionary)
+        self.addCleanup(_registry.pop, dictionary.dictionary_id, None)
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        metrics_log = MetricsLog(self.test_dir / "metrics.jsonl")
+        engine = CompressionEngine(instrument=True, lzw_dictionary=dictionary, metrics_log=metrics_log,
+                                   max_memory=64 * 1024 ** 2, executor=executor)
+        compressed_file = self.test_dir / "out.lzw"
+        output_file = self.test_dir / "out.txt"
+
+        stats = engine.compress_file(self.input_file, compressed_file, 'lzw')
+        self.assertTrue(is_block_stream(compressed_file))
+        self.assertIn('encode', stats['stages'])
+        self.assertIn('peak_memory', stats)
+        with FileHandler() as fh:
+            fh.open_file(compressed_file, 'rb')
+            reader = BlockReader(fh)
+            reader.read_header()
+            self.assertTrue(all(block.startswith(STREAM_MAGIC) for _, _, block in reader))
+
+        engine.decompress_file(compressed_file, output_file, None)
+        self.assertEqual(output_file.read_bytes(), self.input_file.read_bytes())
+        self.assertEqual([(record['operation'], record['mode']) for record in metrics_log.records()],
+                         [('compress', 'blocks'), ('decompress', 'blocks')])
+
+    def test_executor_cancellation_reports_stats(self):
+        self.input_file.write_bytes(bytes(range(256)) * 8192)
+        engine = CompressionEngine(executor=ThreadPoolExecutor(max_workers=2))
+        self.addCleanup(engine.executor.shutdown)
+        output_file = self.test_dir / "out.lzw"
+        token = CancellationToken()
+        tracker = ProgressTracker(self.input_file.stat().st_size,
+                                  lambda stats: token.cancel() if stats.bytes_processed > 0 else None,
+                                  token=token)
+
+        with self.assertRaises(OperationCancelled) as context:
+            engine.compress_file(self.input_file, output_file, 'lzw', tracker)
+
+        self.assertFalse(output_file.exists())
+        stats = context.exception.stats
+        self.assertTrue(stats['cancelled'])
+        self.assertGreater(stats['bytes_processed'], 0)
+        self.assertLess(stats['bytes_processed'], stats['total_size'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import unittest
+from pathlib import Path
+from core.dedup_store import DedupStore
+from utils.chunker import ContentDefinedChunker
+
+
+class TestDedupStore(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(__file__).parent / "test_files_dedup"
+        self.test_dir.mkdir(exist_ok=True)
+        chunker = ContentDefinedChunker(min_size=256, average_size=1024, max_size=4096)
+        self.store = DedupStore(self.test_dir / "store", 'lzw', chunker)
+        self.data = os.urandom(64 * 1024) + b'log line\n' * 2000
+
+    def tearDown(self):
+        for file in sorted(self.test_dir.rglob("*"), reverse=True):
+            file.rmdir() if file.is_dir() else file.unlink()
+        self.test_dir.rmdir()
+
+    def create_file(self, name, content: bytes):
+        path = self.test_dir / name
+        path.write_bytes(content)
+        return path
+
+    def test_store_and_restore(self):
+        stats = self.store.store_file(self.create_file("v1.bin", self.data))
+        self.assertEqual(stats['chunks'], stats['new_chunks'])
+
+        output_file = self.test_dir / "restored.bin"
+        self.store.restore_file("v1.bin", output_file)
+        self.assertEqual(output_file.read_bytes(), self.data)
+
+    def test_near_identical_versions_share_chunks(self):
+        first = self.store.store_file(self.create_file("v1.bin", self.data))
+        edited = self.data[:30000] + b'patched' + self.data[30000:]
+        second = self.store.store_file(self.create_file("v2.bin", edited))
+
+        self.assertLess(second['new_chunks'], 4)
+        self.assertLess(second['compressed_size'], first['compressed_size'] / 5)
+
+        output_file = self.test_dir / "restored.bin"
+        self.store.restore_file("v2.bin", output_file)
+        self.assertEqual(output_file.read_bytes(), edited)
+
+    def test_garbage_collection(self):
+        self.store.store_file(self.create_file("v1.bin", self.data))
+        self.store.store_file(self.create_file("v2.bin", os.urandom(20000)))
+
+        self.assertEqual(self.store.collect_garbage()['removed_chunks'], 0)
+        self.store.remove("v2.bin")
+        stats = self.store.collect_garbage()
+
+        self.assertGreater(stats['removed_chunks'], 0)
+        self.store.restore_file("v1.bin", self.test_dir / "restored.bin")
+        self.assertEqual(self.store.manifests(), ["v1.bin"])
+
+    def test_corrupted_chunk_detected(self):
+        self.store.store_file(self.create_file("v1.bin", self.data))
+        digest, _ = self.store.load_manifest("v1.bin")['chunks'][0]
+        chunk_path = self.test_dir / "store" / "chunks" / digest[:2] / digest
+        chunk_path.write_bytes(b'rle\0\x05A')
+
+        with self.assertRaises(ValueError):
+            self.store.restore_file("v1.bin", self.test_dir / "restored.bin")
+
+    def test_invalid_manifest_name(self):
+        with self.assertRaises(ValueError):
+            self.store.load_manifest("../escape")
+
+
+if __name__ == '__main__':
+    unittest.main()
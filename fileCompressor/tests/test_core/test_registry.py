@@ -0,0 +1,65 @@
+import unittest
+from importlib import metadata
+from unittest.mock import patch
+from compressors.rle import RLECompressor
+from core.compression_engine import CompressionEngine
+from core.registry import ENTRY_POINT_GROUP, AlgorithmRegistry, AlgorithmSpec
+
+
+class TestAlgorithmRegistry(unittest.TestCase):
+    def test_builtins_load_on_first_use(self):
+        registry = AlgorithmRegistry(discover=False)
+        self.assertEqual(registry.names(), ['rle', 'lzw', 'range', 'rle-range', 'lzw-range'])
+        self.assertFalse(registry.is_loaded('rle'))
+
+        self.assertIs(registry.load('rle'), RLECompressor)
+        self.assertTrue(registry.is_loaded('rle'))
+        self.assertFalse(registry.is_loaded('lzw'))
+        self.assertEqual(registry.name_of(RLECompressor()), 'rle')
+
+    def test_capabilities(self):
+        registry = AlgorithmRegistry(discover=False)
+        registry.register(AlgorithmSpec('stream-only', 'compressors.rle:RLECompressor', frozenset(['streaming'])))
+
+        self.assertEqual(registry.names('in_memory'), ['rle', 'lzw', 'range', 'rle-range', 'lzw-range'])
+        self.assertIn('stream-only', registry.names('streaming'))
+        with self.assertRaises(ValueError):
+            registry.register(AlgorithmSpec('bad', 'x:Y', frozenset(['gpu'])))
+
+    def test_entry_point_discovery(self):
+        entry_points = [
+            metadata.EntryPoint('fastrle', 'compressors.rle:RLECompressor [streaming, block_parallel]',
+                                ENTRY_POINT_GROUP),
+            metadata.EntryPoint('missing', 'no_such_module:Compressor', ENTRY_POINT_GROUP)
+        ]
+        with patch('importlib.metadata.entry_points', return_value=entry_points) as discover:
+            registry = AlgorithmRegistry()
+            self.assertIn('fastrle', registry.names())
+            registry.names()
+        discover.assert_called_once_with(group=ENTRY_POINT_GROUP)
+
+        spec = registry.spec('fastrle')
+        self.assertEqual(spec.capabilities, frozenset(['streaming', 'block_parallel']))
+        self.assertFalse(registry.is_loaded('fastrle'))
+        self.assertIs(registry.load('fastrle'), RLECompressor)
+
+        with self.assertRaises(ValueError):
+            registry.load('missing')
+        with self.assertRaises(ValueError):
+            registry.spec('unknown')
+
+    def test_engine_uses_registry(self):
+        registry = AlgorithmRegistry(discover=False)
+        registry.register(AlgorithmSpec('alias', 'compressors.rle:RLECompressor'))
+        engine = CompressionEngine(registry=registry)
+
+        self.assertIn('alias', engine.available_algorithms)
+        compressor = engine.get_compressor(None, 'alias')
+        self.assertIsInstance(compressor, RLECompressor)
+        self.assertEqual(engine.algorithm_name(compressor), 'alias')
+        with self.assertRaises(ValueError):
+            engine.get_compressor(None, 'unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
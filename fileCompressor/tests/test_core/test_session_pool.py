@@ -0,0 +1,72 @@
+import io
+import time
+import unittest
+from contextlib import redirect_stdout
+from pathlib import Path
+from compressors.lzw import LZWCompressor
+from compressors.lzw_dictionary import _registry, register_dictionary, train_dictionary
+from core.block_format import is_block_stream
+from core.compression_engine import CompressionEngine, decompress_block
+from core.session_pool import SessionPool
+from ui.cli.command_line import CommandLineUI
+
+
+class TestSessionPool(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(__file__).parent / "test_files_session_pool"
+        self.test_dir.mkdir(exist_ok=True)
+        self.pool = SessionPool(max_workers=2)
+
+    def tearDown(self):
+        self.pool.shutdown()
+        for file in self.test_dir.glob("*"):
+            file.unlink()
+        self.test_dir.rmdir()
+
+    def test_workers_stay_warm_across_commands(self):
+        input_file = self.test_dir / "input.txt"
+        input_file.write_bytes(b"warm workers " * 50000)
+        cli = CommandLineUI()
+        cli.engine = CompressionEngine()
+        cli.pool = self.pool
+        with redirect_stdout(io.StringIO()):
+            cli._handle_parallel('parallel on')
+        self.assertFalse(self.pool.running)
+
+        pids = set()
+        for name in ("first", "second"):
+            compressed_file = self.test_dir / f"{name}.lzw"
+            output_file = self.test_dir / f"{name}.txt"
+            cli.process_file('compress', input_file, compressed_file, 'lzw')
+            self.assertTrue(is_block_stream(compressed_file))
+            cli.process_file('decompress', compressed_file, output_file, 'lzw')
+            self.assertEqual(output_file.read_bytes(), input_file.read_bytes())
+            pids.update(self.pool.warm_up())
+        # No worker was forked again after the first command.
+        self.assertLessEqual(len(pids), 2)
+        self.assertEqual(self.pool.starts, 1)
+
+    def test_idle_workers_shut_down(self):
+        self.pool.idle_timeout = 0.1
+        self.assertTrue(self.pool.warm_up())
+        deadline = time.time() + 5
+        while self.pool.running and time.time() < deadline:
+            time.sleep(0.05)
+        self.assertFalse(self.pool.running)
+
+        self.pool.warm_up()
+        self.assertEqual(self.pool.starts, 2)
+
+    def test_workers_preload_registered_dictionaries(self):
+        dictionary = train_dictionary([b'{"sensor": %d, "status": "nominal"}' % i for i in range(200)],
+                                      max_entries=256)
+        message = b'{"sensor": 7, "status": "nominal"}'
+        compressed = LZWCompressor(dictionary).compress_data(message)
+        register_dictionary(dictionary)
+        self.addCleanup(_registry.pop, dictionary.dictionary_id, None)
+
+        self.assertEqual(self.pool.submit(decompress_block, 'lzw', compressed).result(), message)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from core.compression_engine import CompressionEngine
+from core.solid_archive import SolidArchive, create_solid_archive
+
+
+class TestSolidArchive(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(__file__).parent / "test_files_solid"
+        self.input_dir = self.test_dir / "docs"
+        self.input_dir.mkdir(parents=True, exist_ok=True)
+        self.archive_file = self.test_dir / "docs.solid"
+        self.files = {}
+        for i in range(200):
+            content = f'{{"id": {i}, "status": "ok", "message": "request handled"}}\n'.encode() * (i % 7 + 1)
+            self.files[f"docs/file_{i:03d}.json"] = content
+            (self.input_dir / f"file_{i:03d}.json").write_bytes(content)
+
+    def tearDown(self):
+        for file in sorted(self.test_dir.rglob("*"), reverse=True):
+            file.rmdir() if file.is_dir() else file.unlink()
+        self.test_dir.rmdir()
+
+    def test_create_list_and_extract(self):
+        stats = create_solid_archive(self.archive_file, [self.input_dir], 'lzw', block_size=16384)
+        self.assertEqual(stats['files'], 200)
+        self.assertEqual(stats['original_size'], sum(len(content) for content in self.files.values()))
+        self.assertLess(stats['compressed_size'], stats['original_size'] / 3)
+
+        archive = SolidArchive(self.archive_file)
+        self.assertEqual([entry['name'] for entry in archive.list()], sorted(self.files))
+
+        output_file = self.test_dir / "out.json"
+        archive.extract("docs/file_123.json", output_file)
+        self.assertEqual(output_file.read_bytes(), self.files["docs/file_123.json"])
+
+    def test_extract_decodes_only_overlapping_blocks(self):
+        create_solid_archive(self.archive_file, [self.input_dir], 'rle', block_size=1024)
+        archive = SolidArchive(self.archive_file)
+        codec = CompressionEngine().get_compressor(None, 'rle')
+
+        with patch.object(CompressionEngine, 'get_compressor', return_value=codec), \
+                patch.object(codec, 'decompress_data', wraps=codec.decompress_data) as decompress:
+            archive.extract("docs/file_150.json", self.test_dir / "out.json")
+
+        self.assertLessEqual(decompress.call_count, 2)
+        self.assertEqual((self.test_dir / "out.json").read_bytes(), self.files["docs/file_150.json"])
+
+    def test_extract_all(self):
+        (self.input_dir / "empty.txt").write_bytes(b'')
+        large = os.urandom(10000)
+        (self.test_dir / "large.bin").write_bytes(large)
+        create_solid_archive(self.archive_file, [self.input_dir, self.test_dir / "large.bin"], block_size=4096)
+
+        output_dir = self.test_dir / "restored"
+        self.assertEqual(SolidArchive(self.archive_file).extract_all(output_dir), 202)
+        self.assertEqual((output_dir / "large.bin").read_bytes(), large)
+        self.assertEqual((output_dir / "docs" / "empty.txt").read_bytes(), b'')
+        self.assertEqual((output_dir / "docs" / "file_000.json").read_bytes(), self.files["docs/file_000.json"])
+
+    def test_invalid_archive(self):
+        self.archive_file.write_bytes(b'not an archive at all')
+        with self.assertRaises(ValueError):
+            SolidArchive(self.archive_file)
+
+        create_solid_archive(self.archive_file, [self.input_dir])
+        with self.assertRaises(ValueError):
+            SolidArchive(self.archive_file).extract("missing.txt", self.test_dir / "out")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import asyncio
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+from core.archive import Archive
+from core.async_engine import compress_async
+from core.compression_engine import CompressionEngine
+from core.solid_archive import create_solid_archive
+from core.verify import verify_file
+
+
+class TestVerify(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(__file__).parent / "test_files_verify"
+        self.test_dir.mkdir(exist_ok=True)
+        self.engine = CompressionEngine()
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.input_file = self.test_dir / "input.log"
+        self.input_file.write_bytes(b''.join(f"line {i}\n".encode() + os.urandom(i % 16) for i in range(20000)))
+
+    def tearDown(self):
+        self.executor.shutdown()
+        for file in self.test_dir.glob("*"):
+            file.unlink()
+        self.test_dir.rmdir()
+
+    def corrupt(self, file_path: Path, offset):
+        data = bytearray(file_path.read_bytes())
+        data[offset] ^= 0x20
+        file_path.write_bytes(bytes(data))
+
+    def test_block_stream(self):
+        compressed_file = self.test_dir / "input.fcbk"
+        asyncio.run(compress_async(self.input_file, compressed_file, 'lzw', block_size=16384))
+
+        with patch('core.verify.FileHandler.write_chunk') as write_chunk:
+            stats = verify_file(compressed_file, executor=self.executor)
+        write_chunk.assert_not_called()
+        self.assertTrue(stats['checksum_verified'])
+        self.assertEqual(stats['decompressed_size'], self.input_file.stat().st_size)
+        self.assertEqual(stats['blocks'], -(-self.input_file.stat().st_size // 16384))
+
+        self.corrupt(compressed_file, compressed_file.stat().st_size // 2)
+        with self.assertRaises(ValueError):
+            verify_file(compressed_file, executor=self.executor)
+
+    def test_archive_entries(self):
+        archive = Archive(self.test_dir / "files.fca")
+        archive.add_file(self.input_file, algorithm='lzw')
+        archive.add_file(self.input_file, "copy.log", algorithm='rle')
+
+        stats = verify_file(archive.archive_file, executor=self.executor)
+        self.assertEqual(stats['blocks'], 2)
+        self.assertEqual(stats['decompressed_size'], 2 * self.input_file.stat().st_size)
+
+        entry = archive.entries["copy.log"]
+        self.corrupt(archive.archive_file, entry['offset'] + 11)
+        with self.assertRaises(ValueError):
+            verify_file(archive.archive_file, executor=self.executor)
+
+    def test_solid_archive_and_plain_stream(self):
+        create_solid_archive(self.test_dir / "files.solid", [self.input_file], block_size=32768)
+        stats = verify_file(self.test_dir / "files.solid", executor=self.executor)
+        self.assertFalse(stats['checksum_verified'])
+        self.assertEqual(stats['decompressed_size'], self.input_file.stat().st_size)
+
+        compressed_file = self.test_dir / "input.lzw"
+        self.engine.compress_file(self.input_file, compressed_file, 'lzw')
+        stats = verify_file(compressed_file, 'lzw')
+        self.assertEqual(stats['decompressed_size'], self.input_file.stat().st_size)
+        self.assertTrue(stats['checksum_verified'])
+
+    def test_plain_stream_codec_detection(self):
+        small_file = self.test_dir / "small.txt"
+        small_file.write_bytes(b"abcabcabc" * 20)
+        for algorithm in ('lzw', 'rle'):
+            compressed_file = self.test_dir / f"small.{algorithm}"
+            self.engine.compress_file(small_file, compressed_file, algorithm)
+            stats = verify_file(compressed_file)
+            self.assertEqual(stats['decompressed_size'], small_file.stat().st_size)
+            self.assertTrue(stats['checksum_verified'])
+
+    def test_rle_runs_spelling_a_magic(self):
+        self.input_file.write_bytes(b'Z' * 76 + b'F' * 87 + b'\x01' + b'hello world')
+        compressed_file = self.test_dir / "input.rle"
+        self.engine.compress_file(self.input_file, compressed_file, 'rle')
+        for algorithm in ('rle', None):
+            stats = verify_file(compressed_file, algorithm)
+            self.assertEqual(stats['decompressed_size'], self.input_file.stat().st_size)
+            self.assertTrue(stats['checksum_verified'])
+
+    def test_delta_needs_reference(self):
+        reference = self.test_dir / "old.log"
+        reference.write_bytes(self.input_file.read_bytes()[1000:])
+        compressed_file = self.test_dir / "input.delta"
+        self.engine.compress_file(self.input_file, compressed_file, 'lzw', reference=reference)
+
+        with self.assertRaises(ValueError):
+            verify_file(compressed_file)
+        self.assertTrue(verify_file(compressed_file, reference=reference)['checksum_verified'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from service.client import CompressionClient, LocalCompressionClient, ServiceError
+from service.server import CompressionServer
+
+
+class TestCompressionService(unittest.TestCase):
+    def setUp(self):
+        self.data = b'abcabcabc' * 500 + os.urandom(1000)
+        self.executor = ThreadPoolExecutor(max_workers=2)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_local_client_roundtrip(self):
+        with LocalCompressionClient(self.executor) as client:
+            for algorithm in ('rle', 'lzw'):
+                with self.subTest(algorithm=algorithm):
+                    compressed = client.compress(self.data, algorithm)
+                    self.assertEqual(client.last_stats['original_size'], len(self.data))
+                    self.assertEqual(client.decompress(compressed, algorithm), self.data)
+
+    def test_local_client_errors(self):
+        client = LocalCompressionClient()
+        with self.assertRaises(ServiceError):
+            client.compress(self.data, 'unknown')
+        with self.assertRaises(ServiceError):
+            client.decompress(b'\x00\x00\x00\x09', 'lzw')
+
+    def test_expired_deadline(self):
+        client = LocalCompressionClient(self.executor)
+        with self.assertRaises(ServiceError):
+            client.compress(self.data, 'lzw', timeout=0)
+        self.assertTrue(client.last_stats['cancelled'])
+        self.assertEqual(client.last_stats['reason'], 'deadline exceeded')
+
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            client = LocalCompressionClient(executor)
+            with self.assertRaises(ServiceError):
+                client.compress(self.data, 'lzw', timeout=0)
+        self.assertEqual(client.last_stats['total_size'], len(self.data))
+
+    def test_unix_socket_server(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            address = str(Path(tmp) / "compressor.sock")
+            with CompressionServer(address, workers=2, executor=self.executor):
+                with CompressionClient(address) as client:
+                    self.assertTrue(client.ping())
+                    compressed = client.compress(self.data, 'lzw')
+                    self.assertIn('worker_pid', client.last_stats)
+                    self.assertEqual(client.decompress(compressed, 'lzw'), self.data)
+
+    def test_tcp_server(self):
+        with CompressionServer(('127.0.0.1', 0), workers=1, executor=self.executor) as server:
+            with CompressionClient(server.address) as client:
+                compressed = client.compress(self.data, 'rle')
+                self.assertEqual(client.decompress(compressed, 'rle'), self.data)
+
+    def test_rejects_non_local_host(self):
+        server = CompressionServer(('0.0.0.0', 0), workers=1, executor=self.executor)
+        with self.assertRaises(ValueError):
+            server.start()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,8 @@
-import time
 import unittest
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
 import io
 from contextlib import redirect_stdout, redirect_stderr
-from utils.progress_tracker import ProgressStats, ProgressTracker
 from ui.cli.command_line import CommandLineUI
 from datetime import datetime
 
@@ -29,6 +27,8 @@ class TestCommandLineUI(unittest.TestCase):
             "time_taken": 1.5
         }
         self.cli.engine.get_compressor.return_value = self.mock_compressor
+        self.cli.engine.compress_file.return_value = self.mock_compressor.compress.return_value
+        self.cli.engine.decompress_file.return_value = self.mock_compressor.decompress.return_value
 
     def capture_output(self, func, *args, **kwargs):
         out = io.StringIO()
@@ -41,20 +41,20 @@ class TestCommandLineUI(unittest.TestCase):
         out, err = self.capture_output(self.cli.show_error, "Test error")
         self.assertEqual(err, "Error: Test error")
 
-    def test_progress_callback(self):
-        stats = ProgressStats(
-            bytes_processed=500,
-            total_bytes=1000,
-            start_time=time.time() - 1,
-            current_time=time.time()
-        )
+    def test_progress_not_drawn_without_tty(self):
+        input_file = Path(__file__).parent / "progress_input.txt"
+        input_file.write_bytes(b"x" * 1000)
+        self.addCleanup(input_file.unlink)
 
-        out, err = self.capture_output(self.cli._progress_callback, stats)
+        def compress(input_file, output_file, algorithm, tracker, reference=None):
+            tracker.update(500)
+            tracker.update(1000)
+            return self.mock_compressor.compress.return_value
 
-        self.assertIn("50.0%", out)
-        self.assertIn("500/1000", out)
-        self.assertIn("bytes/sec", out)
-        self.assertIn("Remaining:", out)
+        self.cli.engine.compress_file.side_effect = compress
+        out, err = self.capture_output(self.cli.process_file, 'compress', input_file, Path("out.lzw"), 'lzw')
+        self.assertEqual(out, "")
+        self.assertFalse(self.cli.progress.running)
 
     def test_show_stats(self):
         stats = {
@@ -69,6 +69,40 @@ class TestCommandLineUI(unittest.TestCase):
         self.assertIn("Compression Ratio: 50.00%", out)
         self.assertIn("Time Taken: 1.50 seconds", out)
 
+    def test_show_stats_with_stages(self):
+        stats = {
+            "original_size": 1000,
+            "time_taken": 1.5,
+            "stages": {"read": {"time": 0.25, "bytes": 1024, "calls": 2}},
+            "counters": {"codes_emitted": 10, "average_phrase_length": 2.5},
+            "histograms": {"run_length": {"1": 3, "2-3": 4}}
+        }
+        out, err = self.capture_output(self.cli.show_stats, stats)
+        self.assertIn("Read: 0.2500 seconds, 1.00 KB, 2 calls", out)
+        self.assertIn("Codes Emitted: 10", out)
+        self.assertIn("Average Phrase Length: 2.50", out)
+        self.assertIn("Run Length: 1: 3, 2-3: 4", out)
+
+    @patch("sys.exit", side_effect=SystemExit)
+    @patch("builtins.input", side_effect=["instrument on", "exit"])
+    def test_instrument_command(self, mock_input, mock_exit):
+        with self.assertRaises(SystemExit):
+            self.capture_output(self.cli.start)
+        self.assertTrue(self.cli.engine.instrument)
+
+    def test_profile_command(self):
+        with patch.object(self.cli, '_handle_compression') as mock_compression:
+            out, err = self.capture_output(self.cli._handle_profile, "profile --top=3 cf input.txt output.txt")
+        mock_compression.assert_called_once_with("cf input.txt output.txt")
+        self.assertIn("Top hotspots", out)
+        self.assertIn("Peak traced memory", out)
+
+    def test_profile_command_invalid(self):
+        out, err = self.capture_output(self.cli._handle_profile, "profile --bogus cf a b")
+        self.assertIn("Usage: profile", err)
+        out, err = self.capture_output(self.cli._handle_profile, "profile stat a")
+        self.assertIn("Usage: profile", err)
+
     def test_format_size(self):
         test_cases = [
             (500, "500.00 B"),
@@ -116,6 +150,15 @@ class TestCommandLineUI(unittest.TestCase):
                 'rle'
             )
 
+    @patch("pathlib.Path.exists", return_value=True)
+    @patch("pathlib.Path.stat")
+    def test_failure_reported_once(self, mock_stat, mock_exists):
+        mock_stat.return_value = MagicMock(st_size=1000)
+        self.cli.engine.compress_file.side_effect = ValueError("boom")
+
+        out, err = self.capture_output(self.cli._handle_compression, "cf test.txt test.compressed")
+        self.assertEqual(err, "Error: Compression failed: boom")
+
     def test_process_file_invalid_operation(self):
         with self.assertRaises(ValueError):
             self.cli.process_file("invalid", Path("input.txt"), Path("output.txt"), None)
@@ -130,6 +173,23 @@ class TestCommandLineUI(unittest.TestCase):
         self.cli.current_compressor = None
         self.assertEqual(self.cli._get_compressed_file_extension(), '.compressed')
 
+    @patch("builtins.input", side_effect=["parallel 3", "parallel many", "parallel off", "exit"])
+    @patch("sys.exit", side_effect=SystemExit)
+    def test_parallel_settings(self, mock_exit, mock_input):
+        self.cli.pool = Mock(workers=3)
+        with self.assertRaises(SystemExit):
+            out, err = self.capture_output(self.cli.start)
+        self.assertEqual(self.cli.pool.max_workers, 3)
+        self.assertFalse(self.cli.parallel)
+        self.assertEqual(self.cli.pool.shutdown.call_count, 3)
+
+    def test_pool_created_on_first_use(self):
+        cli = CommandLineUI()
+        out, err = self.capture_output(cli._handle_memory, 'memory 256m')
+        self.assertIsNone(cli._pool)
+        self.assertEqual(cli.pool.max_memory, 256 * 1024 ** 2)
+        self.assertFalse(cli.pool.running)
+
     @patch("builtins.input", side_effect=["rle", "exit"])
     @patch("sys.exit", side_effect=SystemExit)
     def test_select_algorithm_rle(self, mock_exit, mock_input):
@@ -0,0 +1,65 @@
+import io
+import threading
+import time
+import unittest
+from ui.cli.progress_renderer import ProgressRenderer, format_bar, format_job
+from utils.progress_tracker import ProgressStats, ProgressTracker
+
+
+class _Terminal(io.StringIO):
+    def isatty(self):
+        return True
+
+
+class TestProgressRenderer(unittest.TestCase):
+    def test_format_job(self):
+        stats = ProgressStats(bytes_processed=500, total_bytes=1000,
+                              start_time=time.time() - 1, current_time=time.time())
+        line = format_job("input.txt", stats)
+
+        self.assertTrue(line.startswith(format_bar(50.0)))
+        self.assertIn(" 50.0% input.txt", line)
+        self.assertIn("500/1000", line)
+        self.assertIn("bytes/sec", line)
+        self.assertIn("Remaining:", line)
+        self.assertEqual(format_bar(150, width=4), "[====]")
+
+    def test_disabled_without_tty(self):
+        renderer = ProgressRenderer(io.StringIO())
+        tracker = ProgressTracker(100)
+        with renderer.job("input.txt", tracker):
+            tracker.update(100)
+        self.assertFalse(renderer.running)
+        self.assertEqual(renderer.output.getvalue(), "")
+
+    def test_samples_jobs_from_renderer_thread(self):
+        terminal = _Terminal()
+        writers = set()
+        write = terminal.write
+
+        def record_write(text):
+            writers.add(threading.current_thread().name)
+            return write(text)
+
+        terminal.write = record_write
+        renderer = ProgressRenderer(terminal, refresh_rate=200)
+        first, second = ProgressTracker(1000), ProgressTracker(1000)
+        with renderer.job("first.txt", first):
+            with renderer.job("second.txt", second):
+                self.assertTrue(renderer.running)
+                first.update(250)
+                second.update(750)
+                time.sleep(0.05)
+                self.assertIn("\x1b[1F", terminal.getvalue())
+            first.update(1000)
+        self.assertFalse(renderer.running)
+
+        self.assertIn("progress-renderer", writers)
+        output = terminal.getvalue()
+        self.assertIn(" 75.0% second.txt", output)
+        self.assertIn("100.0% first.txt", output)
+        self.assertTrue(output.endswith("\n"))
+
+
+if __name__ == '__main__':
+    unittest.main()
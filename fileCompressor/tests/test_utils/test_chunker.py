@@ -0,0 +1,46 @@
+import io
+import os
+import unittest
+from utils.chunker import ContentDefinedChunker
+
+
+class _Reader:
+    def __init__(self, data):
+        self._stream = io.BytesIO(data)
+
+    def read_chunk(self, size):
+        return self._stream.read(size)
+
+
+class TestContentDefinedChunker(unittest.TestCase):
+    def setUp(self):
+        self.chunker = ContentDefinedChunker(min_size=256, average_size=1024, max_size=4096, read_size=5000)
+        self.data = os.urandom(200 * 1024)
+
+    def test_chunks_cover_input(self):
+        chunks = list(self.chunker.chunks(self.data))
+        self.assertEqual(b''.join(chunks), self.data)
+        for chunk in chunks[:-1]:
+            self.assertGreaterEqual(len(chunk), 256)
+            self.assertLessEqual(len(chunk), 4096)
+
+    def test_boundaries_are_content_defined(self):
+        original = list(self.chunker.chunks(self.data))
+        edited = list(self.chunker.chunks(self.data[:5000] + b'inserted' + self.data[5000:]))
+
+        shared = set(original) & set(edited)
+        self.assertGreater(len(shared), len(original) - 5)
+
+    def test_iter_file_matches_in_memory(self):
+        self.assertEqual(list(self.chunker.iter_file(_Reader(self.data))), list(self.chunker.chunks(self.data)))
+        self.assertEqual(list(self.chunker.iter_file(_Reader(b''))), [])
+
+    def test_invalid_sizes(self):
+        with self.assertRaises(ValueError):
+            ContentDefinedChunker(min_size=4096, average_size=1024, max_size=8192)
+        with self.assertRaises(ValueError):
+            ContentDefinedChunker(min_size=100, average_size=1000, max_size=8192)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,7 @@ import unittest
 from pathlib import Path
 import os
 from utils.file_handler import FileHandler
+from utils.instrumentation import Instrumentation
 
 
 class TestFileHandler(unittest.TestCase):
@@ -118,6 +119,19 @@ class TestFileHandler(unittest.TestCase):
         with self.assertRaises(IOError):
             self.handler.open_file(Path('nonexistent.txt'), 'rb')
 
+    def test_instrumentation(self):
+        instrumentation = Instrumentation()
+        handler = FileHandler(chunk_size=4096, instrumentation=instrumentation)
+        handler.open_file(self.test_file, 'rb')
+        while handler.read_chunk(None):
+            pass
+        handler.close_file()
+
+        read = instrumentation.stages['read']
+        self.assertEqual(read['bytes'], 13000)
+        self.assertEqual(read['calls'], 5)
+        self.assertNotIn('write', instrumentation.stages)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+from utils.instrumentation import Instrumentation
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.instrumentation = Instrumentation()
+
+    def test_record_stages(self):
+        self.instrumentation.record('read', 0.5, 100)
+        self.instrumentation.record('read', 0.25, 50)
+        self.instrumentation.record('encode', 1.0)
+
+        stages = self.instrumentation.report()['stages']
+        self.assertEqual(stages['read'], {'time': 0.75, 'bytes': 150, 'calls': 2})
+        self.assertEqual(stages['encode']['calls'], 1)
+
+    def test_counters(self):
+        self.instrumentation.count('codes')
+        self.instrumentation.count('codes', 4)
+        self.instrumentation.set_counter('resets', 0)
+
+        self.assertEqual(self.instrumentation.report()['counters'], {'codes': 5, 'resets': 0})
+
+    def test_histogram_labels(self):
+        histogram = self.instrumentation.histogram('run_length')
+        for length in (1, 2, 3, 4, 255):
+            histogram[length.bit_length()] += 1
+
+        report = self.instrumentation.report()
+        self.assertEqual(report['histograms']['run_length'], {'1': 1, '2-3': 2, '4-7': 1, '128-255': 1})
+
+    def test_reset(self):
+        self.instrumentation.record('read', 1.0, 10)
+        self.instrumentation.count('codes')
+        self.instrumentation.reset()
+
+        self.assertEqual(self.instrumentation.report(), {'stages': {}, 'counters': {}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import asyncio
+import unittest
+from pathlib import Path
+from core.async_engine import compress_async
+from core.block_format import BlockReader
+from core.calibration import calibrate
+from utils.file_handler import FileHandler
+from utils.io_tuning import DEFAULT_CHUNK_SIZE, IOTuning, get_tuning, mount_point, set_tuning
+
+
+class TestIOTuning(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(__file__).parent / "test_files_io_tuning"
+        self.test_dir.mkdir(exist_ok=True)
+        self.previous = get_tuning()
+        self.tuning = IOTuning(self.test_dir / "io_tuning.json")
+        set_tuning(self.tuning)
+        self.input_file = self.test_dir / "input.txt"
+        self.input_file.write_bytes(b"tuned io " * 5000)
+
+    def tearDown(self):
+        set_tuning(self.previous)
+        for file in self.test_dir.glob("*"):
+            file.unlink()
+        self.test_dir.rmdir()
+
+    def test_file_handler_uses_tuned_chunk_size(self):
+        with FileHandler() as fh:
+            fh.open_file(self.input_file, 'rb')
+            self.assertEqual(fh.chunk_size, DEFAULT_CHUNK_SIZE)
+
+        self.tuning.store(mount_point(self.test_dir), {'chunk_size': 65536, 'block_size': 16384})
+        self.assertEqual(IOTuning(self.tuning.config_file).mounts, self.tuning.mounts)
+        with FileHandler() as fh:
+            fh.open_file(self.input_file, 'rb')
+            self.assertEqual(fh.chunk_size, 65536)
+        with FileHandler(chunk_size=100) as fh:
+            fh.open_file(self.input_file, 'rb')
+            self.assertEqual(fh.chunk_size, 100)
+
+        compressed_file = self.test_dir / "input.blk"
+        asyncio.run(compress_async(self.input_file, compressed_file, 'rle'))
+        with FileHandler() as fh:
+            fh.open_file(compressed_file, 'rb')
+            self.assertEqual(BlockReader(fh).read_header(), ('rle', 16384))
+
+    def test_calibrate_stores_best_parameters(self):
+        results = []
+        mount, parameters = calibrate(self.test_dir, chunk_sizes=(1024, 4096), block_sizes=(4096, 16384),
+                                      algorithm='rle', io_sample_size=64 * 1024, block_sample_size=32 * 1024,
+                                      log=results.append)
+
+        self.assertEqual(mount, mount_point(self.test_dir))
+        self.assertEqual(len(results), 4)
+        self.assertIn(parameters['chunk_size'], (1024, 4096))
+        self.assertIn(parameters['block_size'], (4096, 16384))
+        self.assertEqual(IOTuning(self.tuning.config_file).mounts[mount]['chunk_size'], parameters['chunk_size'])
+        self.assertEqual(sorted(file.name for file in self.test_dir.iterdir()), ['input.txt', 'io_tuning.json'])
+
+        with self.assertRaises(ValueError):
+            calibrate(self.input_file)
+
+
+if __name__ == '__main__':
+    unittest.main()
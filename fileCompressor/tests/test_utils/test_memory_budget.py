@@ -0,0 +1,81 @@
+import asyncio
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from compressors.lzw import LZWCompressor
+from core.async_engine import compress_async
+from core.block_format import BlockReader
+from core.compression_engine import CompressionEngine
+from service.server import handle_request
+from utils.file_handler import FileHandler
+from utils.memory_budget import MIN_BLOCK_SIZE, MemoryBudget, parse_memory
+
+
+def _run_inline(function, *args):
+    return function(*args)
+
+
+class TestMemoryBudget(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(__file__).parent / "test_files_memory_budget"
+        self.test_dir.mkdir(exist_ok=True)
+        self.input_file = self.test_dir / "input.txt"
+        self.input_file.write_bytes(b"a" * 200000 + b"budgeted memory " * 5000)
+
+    def tearDown(self):
+        for file in self.test_dir.glob("*"):
+            file.unlink()
+        self.test_dir.rmdir()
+
+    def test_derived_parameters(self):
+        self.assertEqual(parse_memory('256M'), 256 * 1024 ** 2)
+        self.assertEqual(parse_memory('1.5g'), int(1.5 * 1024 ** 3))
+        with self.assertRaises(ValueError):
+            parse_memory('lots')
+        with self.assertRaises(ValueError):
+            MemoryBudget(1024)
+
+        small, large = MemoryBudget(16 * 1024 ** 2), MemoryBudget(4 * 1024 ** 3)
+        self.assertEqual(small.block_size(4 * 1024 ** 2), 2 * 1024 ** 2)
+        self.assertEqual(large.block_size(4 * 1024 ** 2), 4 * 1024 ** 2)
+        self.assertEqual(small.block_size(4 * 1024 ** 2, in_flight=1024), MIN_BLOCK_SIZE)
+        self.assertEqual(small.parallel_plan(1024 ** 2, 64), (MIN_BLOCK_SIZE, 32))
+        self.assertEqual(small.workers(8), 1)
+        self.assertGreater(large.workers(64), small.workers(64))
+        self.assertGreater(small.delta_block_size(1024 ** 3, 64), large.delta_block_size(1024 ** 3, 64))
+
+    def test_engine_reports_peak_and_bounds_lzw_table(self):
+        engine = CompressionEngine(max_memory=64 * 1024 ** 2)
+        compressed_file = self.test_dir / "input.lzw"
+        output_file = self.test_dir / "output.txt"
+
+        stats = engine.compress_file(self.input_file, compressed_file, 'lzw')
+        self.assertGreater(stats['peak_memory'], 0)
+        self.assertEqual(engine.get_compressor(None, 'lzw').max_memory, 64 * 1024 ** 2)
+        # Force the phrase cache to spill so most long phrases are rebuilt from their prefixes.
+        with patch('utils.memory_budget.MemoryBudget.lzw_table_bytes', return_value=4096):
+            stats = engine.decompress_file(compressed_file, output_file, 'lzw')
+        self.assertEqual(output_file.read_bytes(), self.input_file.read_bytes())
+        self.assertIn('peak_memory', stats)
+
+        self.assertEqual(LZWCompressor().decompress_data(LZWCompressor().compress_data(b"x" * 5000)), b"x" * 5000)
+        self.assertNotIn('peak_memory', CompressionEngine().compress_file(self.input_file, compressed_file, 'rle'))
+
+    def test_parallel_engine_and_service_honor_budget(self):
+        compressed_file = self.test_dir / "input.blk"
+        asyncio.run(compress_async(self.input_file, compressed_file, 'rle', block_size=1024 ** 2,
+                                   max_pending=64, max_memory=16 * 1024 ** 2))
+        with FileHandler() as fh:
+            fh.open_file(compressed_file, 'rb')
+            self.assertEqual(BlockReader(fh).read_header(), ('rle', MIN_BLOCK_SIZE))
+
+        budget = {'max_memory': 64 * 1024 ** 2, 'max_payload': 1000}
+        response, _ = handle_request({'op': 'compress', 'algorithm': 'rle'}, b"x" * 1001, _run_inline, budget=budget)
+        self.assertEqual(response['status'], 'error')
+        self.assertIn('memory budget', response['error'])
+        response, _ = handle_request({'op': 'compress', 'algorithm': 'lzw'}, b"x" * 1000, _run_inline, budget=budget)
+        self.assertEqual(response['status'], 'ok')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from pathlib import Path
+from core.compression_engine import CompressionEngine
+from utils.metrics_log import MetricsLog, size_bucket
+
+
+class TestMetricsLog(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(__file__).parent / "test_files_metrics"
+        self.test_dir.mkdir(exist_ok=True)
+        self.log = MetricsLog(self.test_dir / "metrics.jsonl")
+        self.engine = CompressionEngine(instrument=True, metrics_log=self.log)
+        self.input_file = self.test_dir / "input.txt"
+        self.input_file.write_bytes(b"hello metrics " * 2000)
+
+    def tearDown(self):
+        for file in self.test_dir.glob("*"):
+            file.unlink()
+        self.test_dir.rmdir()
+
+    def test_operations_are_recorded(self):
+        compressed_file = self.test_dir / "input.lzw"
+        self.engine.compress_file(self.input_file, compressed_file, 'lzw')
+        self.engine.decompress_file(compressed_file, self.test_dir / "output.txt", 'lzw')
+
+        compress, decompress = list(self.log.records())
+        self.assertEqual((compress['operation'], compress['algorithm'], compress['mode']), ('compress', 'lzw', 'file'))
+        self.assertEqual(compress['file_type'], 'txt')
+        self.assertEqual(compress['magic'], b'hell'.hex())
+        self.assertEqual(compress['input_size'], self.input_file.stat().st_size)
+        self.assertEqual(compress['output_size'], compressed_file.stat().st_size)
+        self.assertIn('encode', compress['stages'])
+        self.assertTrue(compress['host'])
+        self.assertTrue(compress['version'])
+
+        self.assertEqual(decompress['operation'], 'decompress')
+        self.assertEqual(decompress['output_size'], self.input_file.stat().st_size)
+
+    def test_summarize(self):
+        self.engine.compress_file(self.input_file, self.test_dir / "a.rle", 'rle')
+        self.engine.compress_file(self.input_file, self.test_dir / "b.rle", 'rle')
+        self.engine.compress_file(self.input_file, self.test_dir / "c.lzw", 'lzw')
+        with open(self.log.path, 'a') as f:
+            f.write('{"torn": ')
+
+        summary = self.log.summarize(['algorithm', 'size'], operation='compress')
+        self.assertEqual([(row['algorithm'], row['size'], row['operations']) for row in summary],
+                         [('lzw', '<64K', 1), ('rle', '<64K', 2)])
+        self.assertEqual(summary[1]['total_size'], 2 * self.input_file.stat().st_size)
+        self.assertGreater(summary[0]['compression_ratio'], summary[1]['compression_ratio'])
+
+        with self.assertRaises(ValueError):
+            self.log.summarize(['colour'])
+
+    def test_size_bucket(self):
+        self.assertEqual(size_bucket(0), '<64K')
+        self.assertEqual(size_bucket(5 * 1024 ** 2), '1M-16M')
+        self.assertEqual(size_bucket(2 * 1024 ** 3), '>=1G')
+
+
+if __name__ == '__main__':
+    unittest.main()
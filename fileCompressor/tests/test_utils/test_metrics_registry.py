@@ -0,0 +1,96 @@
+import unittest
+import urllib.request
+from pathlib import Path
+from core.compression_engine import CompressionEngine
+from service.server import handle_request
+from utils.metrics_registry import CompressionMetrics, MetricsRegistry
+from utils.progress_tracker import ProgressTracker
+
+
+def _run_inline(function, *args):
+    return function(*args)
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(__file__).parent / "test_files_metrics_registry"
+        self.test_dir.mkdir(exist_ok=True)
+        self.metrics = CompressionMetrics()
+        self.engine = CompressionEngine(metrics=self.metrics)
+        self.input_file = self.test_dir / "input.txt"
+        self.input_file.write_bytes(b"live metrics " * 4000)
+
+    def tearDown(self):
+        for file in self.test_dir.glob("*"):
+            file.unlink()
+        self.test_dir.rmdir()
+
+    def test_render_text_format(self):
+        registry = MetricsRegistry()
+        registry.counter('jobs_total', "Jobs.", ('kind',)).inc(3, kind='a"b')
+        latency = registry.histogram('job_seconds', "Latency.", buckets=(0.1, 1.0))
+        latency.observe(0.05)
+        latency.observe(2.0)
+
+        text = registry.render()
+        self.assertIn('# TYPE jobs_total counter', text)
+        self.assertIn('jobs_total{kind="a\\"b"} 3', text)
+        self.assertIn('job_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('job_seconds_bucket{le="1.0"} 1', text)
+        self.assertIn('job_seconds_bucket{le="+Inf"} 2', text)
+        self.assertIn('job_seconds_count 2', text)
+
+        with self.assertRaises(ValueError):
+            registry.counter('jobs_total', "Jobs.", ('other',))
+        with self.assertRaises(ValueError):
+            registry.counter('jobs_total', "Jobs.", ('kind',)).inc(1)
+
+    def test_engine_operations_are_counted(self):
+        compressed_file = self.test_dir / "input.lzw"
+        tracker = ProgressTracker(self.input_file.stat().st_size)
+        self.engine.compress_file(self.input_file, compressed_file, 'lzw', tracker)
+        self.engine.decompress_file(compressed_file, self.test_dir / "output.txt", 'lzw')
+        with self.assertRaises(ValueError):
+            self.engine.compress_file(self.input_file, self.test_dir / "bad.out", 'missing')
+
+        m = self.metrics
+        self.assertEqual(m.operations.value(operation='compress', algorithm='lzw'), 1)
+        self.assertEqual(m.bytes_in.value(operation='compress', algorithm='lzw'), self.input_file.stat().st_size)
+        self.assertEqual(m.bytes_out.value(operation='compress', algorithm='lzw'), compressed_file.stat().st_size)
+        self.assertEqual(m.bytes_out.value(operation='decompress', algorithm='lzw'),
+                         self.input_file.stat().st_size)
+        self.assertEqual(m.progress.value(operation='compress'), self.input_file.stat().st_size)
+        self.assertEqual(m.latency.count(operation='decompress', algorithm='lzw'), 1)
+        self.assertEqual(m.errors.value(operation='compress', algorithm='missing', reason='ValueError'), 1)
+        self.assertEqual(m.in_flight.value(operation='compress'), 0)
+
+    def test_service_requests_are_counted(self):
+        header = {'op': 'compress', 'algorithm': 'rle', 'id': 1}
+        handle_request(header, b"aaaabbbb", _run_inline, self.metrics)
+        handle_request({'op': 'compress', 'algorithm': 'rle', 'timeout': -1}, b"x", _run_inline, self.metrics)
+
+        self.assertEqual(self.metrics.bytes_in.value(operation='compress', algorithm='rle'), 8)
+        self.assertEqual(self.metrics.errors.value(operation='compress', algorithm='rle',
+                                                   reason='deadline exceeded'), 1)
+
+    def test_http_endpoint_and_dump(self):
+        self.engine.compress_file(self.input_file, self.test_dir / "input.rle", 'rle')
+        server = self.metrics.registry.serve(0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read().decode('utf-8')
+                self.assertTrue(response.headers['Content-Type'].startswith('text/plain'))
+        finally:
+            server.shutdown()
+            server.server_close()
+        self.assertIn('filecompressor_operations_total{operation="compress",algorithm="rle"} 1', body)
+
+        dump_file = self.metrics.registry.dump(self.test_dir / "metrics.prom")
+        self.assertEqual(dump_file.read_text(), self.metrics.registry.render())
+        with self.assertRaises(ValueError):
+            self.metrics.registry.serve(0, host='0.0.0.0')
+
+
+if __name__ == '__main__':
+    unittest.main()
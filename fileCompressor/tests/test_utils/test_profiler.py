@@ -0,0 +1,53 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from utils.profiler import OperationProfiler
+
+
+def _busy_work(duration):
+    end = time.perf_counter() + duration
+    data = []
+    while time.perf_counter() < end:
+        data.append(bytes(1000))
+    return len(data)
+
+
+class TestOperationProfiler(unittest.TestCase):
+    def test_deterministic_profile(self):
+        with OperationProfiler() as profiler:
+            _busy_work(0.05)
+
+        functions = [entry['function'] for entry in profiler.hotspots(20)]
+        self.assertTrue(any('_busy_work' in function for function in functions))
+        self.assertGreater(profiler.peak_memory, 0)
+        self.assertIn("Top hotspots", profiler.format_report())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            output_file = Path(tmp) / "out.pstats"
+            profiler.dump_stats(output_file)
+            self.assertGreater(output_file.stat().st_size, 0)
+
+    def test_sampling_profile(self):
+        with OperationProfiler(sample_interval=0.002) as profiler:
+            _busy_work(0.1)
+
+        hotspots = profiler.hotspots()
+        self.assertGreater(len(hotspots), 0)
+        self.assertTrue(any('_busy_work' in entry['function'] for entry in hotspots))
+        with self.assertRaises(ValueError):
+            profiler.dump_stats(Path("unused.pstats"))
+
+    def test_allocation_sites(self):
+        with OperationProfiler(memory_poll_interval=0.01) as profiler:
+            _busy_work(0.05)
+
+        self.assertGreater(len(profiler.allocation_sites()), 0)
+
+    def test_invalid_interval(self):
+        with self.assertRaises(ValueError):
+            OperationProfiler(sample_interval=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 import time
-from utils.progress_tracker import ProgressTracker, ProgressStats
+from utils.progress_tracker import CancellationToken, OperationCancelled, ProgressTracker, ProgressStats
 
 
 class TestProgressTracker(unittest.TestCase):
@@ -85,6 +85,23 @@ class TestProgressTracker(unittest.TestCase):
         self.assertIn("bytes/sec", progress_str)
         self.assertIn("sec", progress_str)
 
+    def test_cancellation_token(self):
+        token = CancellationToken()
+        tracker = ProgressTracker(1000, token=token)
+        tracker.update(100)
+
+        token.cancel('user request')
+        with self.assertRaises(OperationCancelled) as context:
+            tracker.update(300)
+        self.assertEqual(context.exception.reason, 'user request')
+        self.assertEqual(context.exception.bytes_processed, 300)
+
+    def test_deadline(self):
+        tracker = ProgressTracker(1000, deadline=time.time() - 1)
+        with self.assertRaises(OperationCancelled) as context:
+            tracker.update(10)
+        self.assertEqual(context.exception.reason, 'deadline exceeded')
+
     def test_context_manager(self):
         with ProgressTracker(1000) as tracker:
             tracker.update(500)
@@ -0,0 +1,85 @@
+import os
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from utils.result_cache import ResultCache, clone_file
+
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = Path(__file__).parent / "test_files_cache"
+        self.cache_dir = self.test_dir / "cache"
+        self.test_dir.mkdir(exist_ok=True)
+        self.cache = ResultCache(self.cache_dir, max_bytes=1000)
+
+    def tearDown(self):
+        for file in sorted(self.test_dir.rglob("*"), reverse=True):
+            file.rmdir() if file.is_dir() else file.unlink()
+        self.test_dir.rmdir()
+
+    def create_file(self, name, content: bytes):
+        path = self.test_dir / name
+        path.write_bytes(content)
+        return path
+
+    def test_content_hash_uses_fingerprint(self):
+        path = self.create_file("input.txt", b"hello")
+        digest = self.cache.content_hash(path)
+
+        with patch("utils.result_cache.hash_file") as mock_hash:
+            self.assertEqual(self.cache.content_hash(path), digest)
+            mock_hash.assert_not_called()
+
+        path.write_bytes(b"world!")
+        self.assertNotEqual(self.cache.content_hash(path), digest)
+
+    def test_store_and_lookup(self):
+        compressed = self.create_file("out.rle", b"\x05A")
+        key = self.cache.make_key("digest", "rle", {})
+
+        self.assertIsNone(self.cache.lookup(key))
+        self.assertTrue(self.cache.store(key, compressed, {'original_size': 5, 'stages': {}}))
+
+        cached_file, stats = self.cache.lookup(key)
+        self.assertEqual(cached_file.read_bytes(), b"\x05A")
+        self.assertEqual(stats, {'original_size': 5})
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+        reopened = ResultCache(self.cache_dir, max_bytes=1000)
+        self.assertIsNotNone(reopened.lookup(key))
+
+    def test_keys_depend_on_algorithm_and_parameters(self):
+        keys = {
+            self.cache.make_key("digest", "rle", {}),
+            self.cache.make_key("digest", "lzw", {}),
+            self.cache.make_key("digest", "lzw", {'max_dict_size': 4096}),
+        }
+        self.assertEqual(len(keys), 3)
+
+    def test_lru_eviction(self):
+        for name in ("a", "b", "c"):
+            self.cache.store(name, self.create_file(f"{name}.bin", os.urandom(400)), {})
+            time.sleep(0.01)
+            if name == "b":
+                self.cache.lookup("a")
+
+        self.assertIsNotNone(self.cache.lookup("a"))
+        self.assertIsNone(self.cache.lookup("b"))
+        self.assertIsNotNone(self.cache.lookup("c"))
+        self.assertLessEqual(self.cache.total_bytes, 1000)
+
+    def test_oversized_entry_not_stored(self):
+        self.assertFalse(self.cache.store("big", self.create_file("big.bin", os.urandom(2000)), {}))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_clone_file(self):
+        source = self.create_file("source.bin", b"data" * 100)
+        destination = self.test_dir / "destination.bin"
+
+        self.assertIn(clone_file(source, destination), ('reflink', 'copy'))
+        self.assertEqual(destination.read_bytes(), source.read_bytes())
+
+
+if __name__ == '__main__':
+    unittest.main()
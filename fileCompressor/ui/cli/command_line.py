@@ -1,15 +1,46 @@
 from pathlib import Path
 import sys
+import time
 from datetime import datetime
 from core.interfaces.ui import BaseUI
 from core.compression_engine import CompressionEngine
-from utils.progress_tracker import ProgressStats, ProgressTracker
+from core.dedup_store import DedupStore
+from core.adaptive import OBJECTIVES, AdaptiveSelector
+from core.archive import Archive, open_archive
+from core.checkpoint import load_checkpoint, resume_compression
+from core.solid_archive import create_solid_archive
+from compressors.lzw_dictionary import load_dictionary, train_dictionary
+from utils.progress_tracker import OperationCancelled, ProgressTracker
+from utils.metrics_log import DEFAULT_LOG, GROUP_FIELDS, MetricsLog
+from utils.memory_budget import parse_memory
+from utils.metrics_registry import CompressionMetrics
+from utils.profiler import OperationProfiler
+from utils.result_cache import ResultCache
+from ui.cli.progress_renderer import ProgressRenderer, format_bar
 
 
 class CommandLineUI(BaseUI):
     def __init__(self):
         self.engine = CompressionEngine()
         self.current_compressor = None
+        self.timeout = None
+        self._exporter = None
+        self.progress = ProgressRenderer()
+        self._pool = None
+        self.parallel = False
+
+    @property
+    def pool(self):
+        # Worker processes for parallel cf/dcf and verify, kept warm across commands. Created (and
+        # multiprocessing imported) on first use so commands that never need workers start quickly.
+        if self._pool is None:
+            from core.session_pool import SessionPool
+            self._pool = SessionPool(max_memory=self.engine.max_memory)
+        return self._pool
+
+    @pool.setter
+    def pool(self, pool):
+        self._pool = pool
 
     def start(self):
         print("File Compression Tool - Type 'help' for a list of commands.")
@@ -29,9 +60,59 @@ class CommandLineUI(BaseUI):
                     self._select_algorithm('rle')
                 elif command == 'lzw':
                     self._select_algorithm('lzw')
+                elif command.startswith('use '):
+                    self._select_algorithm(command.split(maxsplit=1)[1])
+                elif command == 'algorithms':
+                    self._list_algorithms()
                 elif command.startswith('stat '):
                     self._display_file_info(command)
+                elif command.startswith('profile '):
+                    self._handle_profile(command)
+                elif command.startswith('dedup '):
+                    self._handle_dedup(command)
+                elif command.startswith('restore '):
+                    self._handle_restore(command)
+                elif command.startswith('gc '):
+                    self._handle_gc(command)
+                elif command.startswith('verify '):
+                    self._handle_verify(command)
+                elif command.startswith('resume '):
+                    self._handle_resume(command)
+                elif command.startswith('archive '):
+                    self._handle_archive(command)
+                elif command.startswith('solid '):
+                    self._handle_solid(command)
+                elif command.startswith('ls '):
+                    self._handle_list(command)
+                elif command.startswith('extract '):
+                    self._handle_extract(command)
+                elif command.startswith('calibrate '):
+                    self._handle_calibrate(command)
+                elif command.startswith('train '):
+                    self._handle_train(command)
+                elif command.startswith('dict '):
+                    self._handle_dictionary(command)
+                elif command.startswith('cache '):
+                    self._handle_cache(command)
+                elif command.startswith('metrics '):
+                    self._handle_metrics(command)
+                elif command.startswith('exporter '):
+                    self._handle_exporter(command)
+                elif command.startswith('adaptive '):
+                    self._handle_adaptive(command)
+                elif command == 'history' or command.startswith('history '):
+                    self._handle_history(command)
+                elif command.startswith('memory '):
+                    self._handle_memory(command)
+                elif command.startswith('timeout '):
+                    self._handle_timeout(command)
+                elif command.startswith('parallel '):
+                    self._handle_parallel(command)
+                elif command.startswith('instrument'):
+                    self._handle_instrumentation(command)
                 elif command == 'exit':
+                    if self._pool is not None:
+                        self._pool.shutdown(cancel_futures=True)
                     sys.exit(0)
                 else:
                     print("Invalid command. Type 'help' for a list of commands.")
@@ -40,11 +121,42 @@ class CommandLineUI(BaseUI):
 
     def _print_help(self):
         print("\nAvailable commands:")
-        print("  cf <input_file> <output_file> - Compress a file")
-        print("  dcf <input_file> <output_file> - Decompress a file")
+        print("  cf [--ref <reference_file>] <input_file> <output_file> - Compress a file"
+              " (as a delta against the reference if given)")
+        print("  dcf [--ref <reference_file>] <input_file> <output_file> - Decompress a file")
         print("  rle - Select Run-Length Encoding (RLE) algorithm")
         print("  lzw - Select Lempel-Ziv-Welch (LZW) algorithm")
+        print("  use <algorithm> - Select any registered algorithm, including plugins")
+        print("  algorithms - List registered algorithms and their capabilities")
         print("  stat <file_path> - Display file information")
+        print("  profile [--sample=<ms>] [--pstats=<file>] [--top=<n>] cf|dcf <input_file> <output_file>"
+              " - Profile an operation")
+        print("  dedup <input_file> <store_dir> - Store a file as deduplicated chunks")
+        print("  restore <store_dir> <name> <output_file> - Rebuild a file from a dedup store")
+        print("  gc <store_dir> - Remove chunks no longer referenced by any manifest")
+        print("  verify [--ref <reference_file>] <compressed_file> - Check that a file decodes correctly"
+              " without writing output")
+        print("  resume <output_file> - Continue an interrupted compression from its last checkpoint")
+        print("  archive <archive_file> <file_or_dir>... - Add files to an archive, creating it if needed")
+        print("  solid <archive_file> <file_or_dir>... - Pack many small files into one solid archive")
+        print("  ls <archive_file> - List the files in an archive")
+        print("  extract <archive_file> <name> <output_file> - Extract a single file from an archive")
+        print("  calibrate <directory> - Measure I/O chunk and codec block sizes on the directory's filesystem"
+              " and use the best ones for that mount")
+        print("  train <dictionary_file> <sample_file>... - Train a shared LZW dictionary from sample files")
+        print("  dict <dictionary_file> | dict off - Start LZW from a pre-trained dictionary")
+        print("  cache <directory> [max_mb] | cache off - Reuse compressed outputs for unchanged inputs")
+        print("  metrics on|off|<log_file> - Append the statistics of every cf/dcf to a JSONL metrics log")
+        print("  exporter <port> | exporter dump <file> | exporter off - Expose live Prometheus metrics"
+              " on a localhost port or write them to a file")
+        print("  history [" + "|".join(GROUP_FIELDS) + "]... - Summarize throughput and ratio from the metrics log")
+        print("  adaptive " + "|".join(OBJECTIVES) + "|off - Pick the algorithm for cf from past results"
+              " on similar files when none is selected")
+        print("  memory <size> | memory off - Limit the memory of cf/dcf (e.g. 256M) and report the peak")
+        print("  timeout <seconds> | timeout off - Stop cf/dcf operations that run longer than the limit")
+        print("  parallel on|off|<workers> - Compress and decompress block streams on worker processes"
+              " that stay warm between commands")
+        print("  instrument on|off - Toggle per-stage timing and codec counters in statistics")
         print("  exit - Exit the program")
         print("  help - Display this help message")
 
@@ -55,10 +167,458 @@ class CommandLineUI(BaseUI):
         else:
             print(f"Invalid algorithm: {algorithm}")
 
-    def _handle_compression(self, command: str):
+    def _list_algorithms(self):
+        registry = self.engine.registry
+        for name in registry.names():
+            spec = registry.spec(name)
+            state = 'loaded' if registry.is_loaded(name) else 'not loaded'
+            print(f"  {name:<12} {', '.join(sorted(spec.capabilities)):<36} {spec.import_path} ({state})")
+
+    def _handle_profile(self, command: str):
+        usage = "Usage: profile [--sample=<ms>] [--pstats=<file>] [--top=<n>] cf|dcf <input_file> <output_file>"
+        parts = command.split()[1:]
+        sample_interval = None
+        pstats_file = None
+        top = 10
+
+        while parts and parts[0].startswith('--'):
+            option, _, value = parts.pop(0).partition('=')
+            try:
+                if option == '--sample':
+                    sample_interval = (float(value) if value else 1.0) / 1000
+                elif option == '--pstats' and value:
+                    pstats_file = Path(value)
+                elif option == '--top' and value:
+                    top = int(value)
+                else:
+                    raise ValueError(option)
+            except ValueError:
+                self.show_error(usage)
+                return
+
+        if not parts or parts[0] not in ('cf', 'dcf'):
+            self.show_error(usage)
+            return
+
+        handler = self._handle_compression if parts[0] == 'cf' else self._handle_decompression
+        with OperationProfiler(sample_interval) as profiler:
+            handler(' '.join(parts))
+
+        print(profiler.format_report(top), end='')
+        if pstats_file:
+            if profiler.sampling:
+                self.show_error("Sampling mode does not produce .pstats output")
+            else:
+                profiler.dump_stats(pstats_file)
+                print(f"Profile written to {pstats_file}")
+
+    def _handle_dedup(self, command: str):
         parts = command.split()
         if len(parts) != 3:
-            self.show_error("Usage: cf <input_file> <output_file>")
+            self.show_error("Usage: dedup <input_file> <store_dir>")
+            return
+
+        input_file = Path(parts[1])
+        if not input_file.exists():
+            self.show_error(f"File not found: {parts[1]}")
+            return
+
+        try:
+            store = DedupStore(Path(parts[2]), self.current_compressor or 'lzw')
+            size = input_file.stat().st_size
+            tracker = ProgressTracker(size) if size > 0 else None
+            with self.progress.job(input_file.name, tracker):
+                stats = store.store_file(input_file, tracker=tracker)
+            self.show_stats(stats)
+        except Exception as e:
+            self.show_error(f"Deduplication failed: {str(e)}")
+
+    def _handle_restore(self, command: str):
+        parts = command.split()
+        if len(parts) != 4:
+            self.show_error("Usage: restore <store_dir> <name> <output_file>")
+            return
+
+        store_dir = Path(parts[1])
+        if not store_dir.is_dir():
+            self.show_error(f"Store not found: {parts[1]}")
+            return
+
+        try:
+            store = DedupStore(store_dir)
+            size = store.load_manifest(parts[2])['size']
+            tracker = ProgressTracker(size) if size > 0 else None
+            with self.progress.job(parts[2], tracker):
+                stats = store.restore_file(parts[2], Path(parts[3]), tracker)
+            self.show_stats(stats)
+        except Exception as e:
+            self.show_error(f"Restore failed: {str(e)}")
+
+    def _handle_gc(self, command: str):
+        parts = command.split()
+        if len(parts) != 2:
+            self.show_error("Usage: gc <store_dir>")
+            return
+
+        store_dir = Path(parts[1])
+        if not store_dir.is_dir():
+            self.show_error(f"Store not found: {parts[1]}")
+            return
+
+        try:
+            self.show_stats(DedupStore(store_dir).collect_garbage())
+        except Exception as e:
+            self.show_error(f"Garbage collection failed: {str(e)}")
+
+    def _handle_verify(self, command: str):
+        reference, parts = self._extract_reference(command.split())
+        if len(parts) != 2:
+            self.show_error("Usage: verify [--ref <reference_file>] <compressed_file>")
+            return
+
+        input_file = Path(parts[1])
+        if not input_file.exists():
+            self.show_error(f"File not found: {parts[1]}")
+            return
+
+        # Deferred with the pool: verification is the only other command that needs multiprocessing.
+        from core.verify import verify_file
+        try:
+            stats = verify_file(input_file, self.current_compressor, reference, executor=self.pool,
+                                engine=self.engine)
+        except Exception as e:
+            self.show_error(f"Verification failed: {str(e)}")
+            return
+        self.show_stats(stats)
+        if stats['checksum_verified']:
+            print(f"{parts[1]}: OK")
+        else:
+            print(f"{parts[1]}: decoded without errors (no stored checksum)")
+
+    def _handle_resume(self, command: str):
+        parts = command.split()
+        if len(parts) != 2:
+            self.show_error("Usage: resume <output_file>")
+            return
+
+        output_file = Path(parts[1])
+        try:
+            size = Path(load_checkpoint(output_file)['input']).stat().st_size
+            tracker = ProgressTracker(size) if size > 0 else None
+            with self.progress.job(output_file.name, tracker):
+                stats = resume_compression(
+                    output_file, lambda algorithm: self.engine.get_compressor(None, algorithm), tracker)
+            self.show_stats(stats)
+        except Exception as e:
+            self.show_error(f"Resume failed: {str(e)}")
+
+    def _handle_archive(self, command: str):
+        parts = command.split()
+        if len(parts) < 3:
+            self.show_error("Usage: archive <archive_file> <file_or_dir>...")
+            return
+
+        try:
+            archive = Archive(Path(parts[1]), self.engine)
+            self.show_stats(archive.add_files(parts[2:], self.current_compressor))
+        except Exception as e:
+            self.show_error(f"Archiving failed: {str(e)}")
+
+    def _handle_solid(self, command: str):
+        parts = command.split()
+        if len(parts) < 3:
+            self.show_error("Usage: solid <archive_file> <file_or_dir>...")
+            return
+
+        try:
+            self.show_stats(create_solid_archive(Path(parts[1]), parts[2:], self.current_compressor or 'lzw',
+                                                 engine=self.engine))
+        except Exception as e:
+            self.show_error(f"Archiving failed: {str(e)}")
+
+    def _handle_list(self, command: str):
+        parts = command.split()
+        if len(parts) != 2:
+            self.show_error("Usage: ls <archive_file>")
+            return
+
+        try:
+            entries = open_archive(Path(parts[1]), self.engine).list()
+        except Exception as e:
+            self.show_error(f"Listing failed: {str(e)}")
+            return
+
+        for entry in entries:
+            modified = datetime.fromtimestamp(entry['mtime']).strftime('%Y-%m-%d %H:%M:%S')
+            print(f"{self._format_size(entry['size']):>12}  {modified}  {entry['name']}")
+        print(f"{len(entries)} file(s)")
+
+    def _handle_extract(self, command: str):
+        parts = command.split()
+        if len(parts) != 4:
+            self.show_error("Usage: extract <archive_file> <name> <output_file>")
+            return
+
+        try:
+            archive = open_archive(Path(parts[1]), self.engine)
+            size = archive.entries[parts[2]]['size'] if parts[2] in archive.entries else 0
+            tracker = ProgressTracker(size) if size > 0 else None
+            with self.progress.job(parts[2], tracker):
+                stats = archive.extract(parts[2], Path(parts[3]), tracker)
+            self.show_stats(stats)
+        except Exception as e:
+            self.show_error(f"Extraction failed: {str(e)}")
+
+    def _calibration_result(self, result):
+        if 'chunk_size' in result:
+            print(f"  chunk {self._format_size(result['chunk_size']):>10}: read {result['read_mbps']:8.2f} MB/s"
+                  f"  write {result['write_mbps']:8.2f} MB/s")
+        else:
+            print(f"  block {self._format_size(result['block_size']):>10}: compress {result['compress_mbps']:8.2f} MB/s")
+
+    def _handle_calibrate(self, command: str):
+        parts = command.split()
+        if len(parts) != 2:
+            self.show_error("Usage: calibrate <directory>")
+            return
+
+        # Deferred so asyncio and the async engine only load when a calibration actually runs.
+        from core.calibration import calibrate
+
+        print(f"Calibrating {parts[1]}...")
+        mount, parameters = calibrate(Path(parts[1]), log=self._calibration_result)
+        print(f"Tuned {mount}: chunk size {self._format_size(parameters['chunk_size'])}, "
+              f"block size {self._format_size(parameters['block_size'])}")
+
+    def _handle_train(self, command: str):
+        parts = command.split()
+        if len(parts) < 3:
+            self.show_error("Usage: train <dictionary_file> <sample_file>...")
+            return
+
+        samples = [Path(path) for path in parts[2:]]
+        missing = [str(path) for path in samples if not path.is_file()]
+        if missing:
+            self.show_error(f"File not found: {', '.join(missing)}")
+            return
+
+        try:
+            dictionary = train_dictionary(sample.read_bytes() for sample in samples)
+            dictionary.save(Path(parts[1]))
+        except Exception as e:
+            self.show_error(f"Training failed: {str(e)}")
+            return
+        print(f"Trained dictionary {dictionary.dictionary_id} with {len(dictionary)} phrases -> {parts[1]}")
+
+    def _handle_dictionary(self, command: str):
+        parts = command.split()
+        if len(parts) != 2:
+            self.show_error("Usage: dict <dictionary_file> | dict off")
+            return
+
+        if parts[1] == 'off':
+            self.engine.lzw_dictionary = None
+            print("LZW dictionary disabled")
+            return
+
+        try:
+            dictionary = load_dictionary(Path(parts[1]))
+        except Exception as e:
+            self.show_error(f"Failed to load dictionary: {str(e)}")
+            return
+        self.engine.lzw_dictionary = dictionary
+        print(f"Using LZW dictionary {dictionary.dictionary_id} ({len(dictionary)} phrases)")
+
+    def _handle_cache(self, command: str):
+        parts = command.split()
+        if len(parts) == 2 and parts[1] == 'off':
+            self.engine.cache = None
+            print("Result cache disabled")
+            return
+
+        if len(parts) not in (2, 3):
+            self.show_error("Usage: cache <directory> [max_mb] | cache off")
+            return
+
+        try:
+            max_bytes = int(parts[2]) * 1024 * 1024 if len(parts) == 3 else None
+            cache = ResultCache(Path(parts[1]), max_bytes) if max_bytes else ResultCache(Path(parts[1]))
+        except ValueError as e:
+            self.show_error(f"Invalid cache settings: {str(e)}")
+            return
+
+        self.engine.cache = cache
+        print(f"Result cache enabled at {parts[1]} ({self._format_size(cache.max_bytes)} budget)")
+
+    def _handle_metrics(self, command: str):
+        parts = command.split()
+        if len(parts) != 2:
+            self.show_error("Usage: metrics on|off|<log_file>")
+            return
+
+        if parts[1] == 'off':
+            self.engine.metrics_log = None
+            print("Metrics log disabled")
+            return
+
+        self.engine.metrics_log = MetricsLog(DEFAULT_LOG if parts[1] == 'on' else Path(parts[1]))
+        print(f"Recording operation metrics to {self.engine.metrics_log.path}")
+
+    def _handle_exporter(self, command: str):
+        parts = command.split()
+        if len(parts) == 2 and parts[1] == 'off':
+            if self._exporter is not None:
+                self._exporter.shutdown()
+                self._exporter.server_close()
+                self._exporter = None
+            self.engine.metrics = None
+            print("Metrics exporter disabled")
+            return
+
+        if len(parts) == 3 and parts[1] == 'dump':
+            if self.engine.metrics is None:
+                self.show_error("No live metrics collected yet. Use: exporter <port>")
+                return
+            print(f"Metrics written to {self.engine.metrics.registry.dump(Path(parts[2]))}")
+            return
+
+        if len(parts) != 2 or not parts[1].isdigit():
+            self.show_error("Usage: exporter <port> | exporter dump <file> | exporter off")
+            return
+        if self.engine.metrics is None:
+            self.engine.metrics = CompressionMetrics()
+        if self._exporter is not None:
+            self._exporter.shutdown()
+            self._exporter.server_close()
+        self._exporter = self.engine.metrics.registry.serve(int(parts[1]))
+        print(f"Metrics available at http://127.0.0.1:{self._exporter.server_address[1]}/metrics")
+
+    def _handle_history(self, command: str):
+        group_by = command.split()[1:] or ['algorithm', 'type', 'size']
+        metrics_log = self.engine.metrics_log or MetricsLog()
+
+        try:
+            summary = metrics_log.summarize(group_by)
+        except ValueError as e:
+            self.show_error(str(e))
+            return
+        if not summary:
+            print(f"No operations recorded in {metrics_log.path}")
+            return
+
+        print("  ".join(f"{name.title():<12}" for name in group_by) +
+              f"{'Operations':>12}{'Total Size':>14}{'Speed':>14}{'Ratio':>10}")
+        for row in summary:
+            print("  ".join(f"{str(row[name]):<12}" for name in group_by) +
+                  f"{row['operations']:>12}{self._format_size(row['total_size']):>14}"
+                  f"{row['throughput']:>9.2f} MB/s{row['compression_ratio']:>9.2f}%")
+
+    def _handle_adaptive(self, command: str):
+        parts = command.split()
+        if len(parts) == 2 and parts[1] == 'off':
+            self.engine.selector = None
+            print("Adaptive selection disabled")
+            return
+        if len(parts) != 2 or parts[1] not in OBJECTIVES:
+            self.show_error("Usage: adaptive " + "|".join(OBJECTIVES) + "|off")
+            return
+
+        metrics_log = self.engine.metrics_log or MetricsLog()
+        self.engine.selector = AdaptiveSelector(metrics_log, objective=parts[1])
+        print(f"Adaptive selection by {parts[1]}, learning from {metrics_log.path}")
+
+    def _handle_memory(self, command: str):
+        parts = command.split()
+        if len(parts) == 2 and parts[1] == 'off':
+            self.engine.max_memory = None
+            if self._pool is not None:
+                self._resize_pool(max_memory=None)
+            print("Memory budget disabled")
+            return
+
+        try:
+            if len(parts) != 2:
+                raise ValueError(command)
+            self.engine.max_memory = parse_memory(parts[1])
+        except ValueError as e:
+            self.show_error(f"Usage: memory <size> | memory off ({str(e)})")
+            return
+        # A pool created later reads the budget from the engine.
+        if self._pool is not None:
+            self._resize_pool(max_memory=self.engine.max_memory)
+        print(f"Memory budget set to {self._format_size(self.engine.max_memory)}")
+
+    def _handle_parallel(self, command: str):
+        parts = command.split()
+        if len(parts) != 2:
+            self.show_error("Usage: parallel on|off|<workers>")
+            return
+
+        if parts[1] == 'off':
+            self.parallel = False
+            self.engine.executor = None
+            if self._pool is not None:
+                self._pool.shutdown()
+            print("Parallel mode disabled")
+            return
+        if parts[1] != 'on':
+            try:
+                workers = int(parts[1])
+                if workers <= 0:
+                    raise ValueError(parts[1])
+            except ValueError:
+                self.show_error("Usage: parallel on|off|<workers>")
+                return
+            self._resize_pool(max_workers=workers)
+        self.parallel = True
+        # The engine splits block-parallel codecs across the pool; other formats stay sequential.
+        self.engine.executor = self.pool
+        print(f"Parallel mode enabled ({self.pool.workers} workers)")
+
+    def _resize_pool(self, **settings):
+        # Running workers keep their size; the next command starts a pool with the new settings.
+        self.pool.shutdown()
+        for name, value in settings.items():
+            setattr(self.pool, name, value)
+
+    def _handle_timeout(self, command: str):
+        parts = command.split()
+        if len(parts) == 2 and parts[1] == 'off':
+            self.timeout = None
+            print("Timeout disabled")
+            return
+
+        try:
+            if len(parts) != 2 or float(parts[1]) <= 0:
+                raise ValueError(command)
+        except ValueError:
+            self.show_error("Usage: timeout <seconds> | timeout off")
+            return
+        self.timeout = float(parts[1])
+        print(f"Operations will stop after {self.timeout:g} seconds")
+
+    def _handle_instrumentation(self, command: str):
+        parts = command.split()
+        if len(parts) != 2 or parts[1] not in ('on', 'off'):
+            self.show_error("Usage: instrument on|off")
+            return
+
+        self.engine.instrument = parts[1] == 'on'
+        print(f"Instrumentation {'enabled' if self.engine.instrument else 'disabled'}")
+
+    def _extract_reference(self, parts):
+        if len(parts) > 2 and parts[1] == '--ref':
+            return Path(parts[2]), [parts[0]] + parts[3:]
+        return None, parts
+
+    def _handle_compression(self, command: str):
+        reference, parts = self._extract_reference(command.split())
+        if len(parts) != 3:
+            self.show_error("Usage: cf [--ref <reference_file>] <input_file> <output_file>")
+            return
+
+        if reference is not None and not reference.exists():
+            self.show_error(f"Reference file not found: {reference}")
             return
 
         input_path, output_path = parts[1], parts[2]
@@ -69,20 +629,37 @@ class CommandLineUI(BaseUI):
             self.show_error(f"File not found: {input_path}")
             return
 
-        extension = self._get_compressed_file_extension()
+        algorithm = self.current_compressor
+        if reference is not None:
+            extension = '.delta'
+        elif algorithm is None and self.engine.selector is not None:
+            # Resolve the choice here so the output extension names the algorithm; dcf falls back to it for
+            # formats without a magic.
+            algorithm = self.engine.choose_algorithm(input_file)
+            extension = f".{algorithm}"
+            print(f"Adaptive selection chose: {algorithm.upper()}")
+        else:
+            extension = self._get_compressed_file_extension()
         output_file = output_file.with_suffix(extension)
 
         try:
-            stats = self.process_file('compress', input_file, output_file, self.current_compressor)
+            if reference is not None:
+                stats = self.process_file('compress', input_file, output_file, algorithm, reference=reference)
+            else:
+                stats = self.process_file('compress', input_file, output_file, algorithm)
             if stats:
                 self.show_stats(stats)
         except Exception as e:
             self.show_error(f"Compression failed: {str(e)}")
 
     def _handle_decompression(self, command: str):
-        parts = command.split()
+        reference, parts = self._extract_reference(command.split())
         if len(parts) != 3:
-            self.show_error("Usage: dcf <input_file> <output_file>")
+            self.show_error("Usage: dcf [--ref <reference_file>] <input_file> <output_file>")
+            return
+
+        if reference is not None and not reference.exists():
+            self.show_error(f"Reference file not found: {reference}")
             return
 
         input_path, output_path = parts[1], parts[2]
@@ -94,7 +671,11 @@ class CommandLineUI(BaseUI):
             return
 
         try:
-            stats = self.process_file('decompress', input_file, output_file, self.current_compressor)
+            if reference is not None:
+                stats = self.process_file('decompress', input_file, output_file, self.current_compressor,
+                                          reference=reference)
+            else:
+                stats = self.process_file('decompress', input_file, output_file, self.current_compressor)
             if stats:
                 self.show_stats(stats)
         except Exception as e:
@@ -127,45 +708,33 @@ class CommandLineUI(BaseUI):
                 return '.rle'
             elif self.current_compressor == 'lzw':
                 return '.lzw'
+            return f".{self.current_compressor}"
         else:
             return '.compressed'
 
-    def _progress_callback(self, stats: ProgressStats):
-        progress_str = (
-            f"\rProgress: {stats.progress_percentage:.1f}% "
-            f"({stats.bytes_processed}/{stats.total_bytes} bytes) | "
-            f"Speed: {stats.processing_speed:.1f} bytes/sec | "
-            f"Remaining: {stats.estimated_time_remaining:.1f} sec"
-        )
-        print(progress_str, end='')
-        if stats.progress_percentage >= 100:
-            print()
-
-    def process_file(self, operation, input_file: Path, output_file: Path, algorithm):
+    def process_file(self, operation, input_file: Path, output_file: Path, algorithm, reference=None):
         if operation not in ['compress', 'decompress']:
-            self.show_error(f"Invalid operation: {operation}")
             raise ValueError(f"Invalid operation: {operation}")
 
         try:
-            compressor = self.engine.get_compressor(input_file, algorithm)
-
-            tracker = ProgressTracker(input_file.stat().st_size, self._progress_callback)
+            deadline = time.time() + self.timeout if self.timeout else None
+            tracker = ProgressTracker(input_file.stat().st_size, deadline=deadline)
 
-            if operation == 'compress':
-                stats = compressor.compress(input_file, output_file, tracker)
-            else:
-                stats = compressor.decompress(input_file, output_file, tracker)
+            with self.progress.job(input_file.name, tracker):
+                if operation == 'compress':
+                    stats = self.engine.compress_file(input_file, output_file, algorithm, tracker, reference=reference)
+                else:
+                    stats = self.engine.decompress_file(input_file, output_file, algorithm, tracker,
+                                                        reference=reference)
 
             return stats
-        except Exception as e:
-            self.show_error(str(e))
+        except OperationCancelled as e:
+            # The caller reports the error itself; only the partial statistics are shown here.
+            self.show_stats(e.stats)
             raise
 
     def update_progress(self, progress, status):
-        bar_width = 50
-        filled = int(bar_width * progress / 100)
-        bar = '=' * filled + '-' * (bar_width - filled)
-        print(f'Progress: [{bar}] {progress:.1f}% {status}', end='')
+        print(f'\rProgress: {format_bar(progress, 50)} {progress:.1f}% {status}', end='')
         if progress >= 100:
             print()
 
@@ -180,7 +749,7 @@ class CommandLineUI(BaseUI):
         print("\nOperation Statistics:")
         for key, value in stats.items():
             if isinstance(value, (int, float)):
-                if 'size' in key:
+                if 'size' in key or 'memory' in key:
                     print(f"{key.replace('_', ' ').title()}: {self._format_size(value)}")
                 elif 'ratio' in key:
                     print(f"{key.replace('_', ' ').title()}: {value:.2f}%")
@@ -188,6 +757,22 @@ class CommandLineUI(BaseUI):
                     print(f"{key.replace('_', ' ').title()}: {value:.2f} seconds")
                 else:
                     print(f"{key.replace('_', ' ').title()}: {value}")
+            elif isinstance(value, dict) and value:
+                self._show_stats_section(key, value)
+
+    def _show_stats_section(self, name, section):
+        print(f"{name.replace('_', ' ').title()}:")
+        for key, value in section.items():
+            label = key.replace('_', ' ').title()
+            if isinstance(value, dict) and 'time' in value:
+                print(f"  {label}: {value['time']:.4f} seconds, "
+                      f"{self._format_size(value.get('bytes', 0))}, {value.get('calls', 0)} calls")
+            elif isinstance(value, dict):
+                print(f"  {label}: " + ", ".join(f"{bucket}: {count}" for bucket, count in value.items()))
+            elif isinstance(value, float):
+                print(f"  {label}: {value:.2f}")
+            else:
+                print(f"  {label}: {value}")
 
     def _format_size(self, size):
         for unit in ['B', 'KB', 'MB', 'GB']:
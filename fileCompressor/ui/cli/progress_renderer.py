@@ -0,0 +1,93 @@
+import sys
+import threading
+from contextlib import contextmanager
+
+REFRESH_RATE = 10
+BAR_WIDTH = 30
+
+
+def format_bar(percentage, width=BAR_WIDTH):
+    filled = int(width * min(max(percentage, 0), 100) / 100)
+    return '[' + '=' * filled + '-' * (width - filled) + ']'
+
+
+def format_job(name, stats):
+    return (
+        f"{format_bar(stats.progress_percentage)} {stats.progress_percentage:5.1f}% {name} "
+        f"({stats.bytes_processed}/{stats.total_bytes} bytes) | "
+        f"Speed: {stats.processing_speed:.1f} bytes/sec | "
+        f"Remaining: {stats.estimated_time_remaining:.1f} sec"
+    )
+
+
+class ProgressRenderer:
+    # Trackers only update their ProgressStats; this thread samples them, so codecs never wait on the terminal.
+    def __init__(self, stream=None, refresh_rate=REFRESH_RATE):
+        self.stream = stream
+        self.interval = 1 / refresh_rate
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._stop = None
+        self._thread = None
+        self._lines = 0
+
+    @property
+    def output(self):
+        # Resolved on use so a redirected sys.stdout is honored.
+        return self.stream or sys.stdout
+
+    @property
+    def enabled(self):
+        isatty = getattr(self.output, 'isatty', None)
+        return bool(isatty and isatty())
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    @contextmanager
+    def job(self, name, tracker):
+        if tracker is None or not self.enabled:
+            yield tracker
+            return
+
+        with self._lock:
+            self._jobs[id(tracker)] = (name, tracker.stats)
+            if self._thread is None:
+                self._stop = threading.Event()
+                self._thread = threading.Thread(target=self._run, args=(self._stop,),
+                                                name='progress-renderer', daemon=True)
+                self._thread.start()
+        try:
+            yield tracker
+        finally:
+            thread = None
+            with self._lock:
+                name, stats = self._jobs.pop(id(tracker))
+                self._draw([format_job(name, stats)])
+                if not self._jobs:
+                    thread, self._thread = self._thread, None
+                    self._stop.set()
+            if thread is not None:
+                thread.join()
+
+    def _run(self, stop):
+        while not stop.wait(self.interval):
+            with self._lock:
+                if not stop.is_set():
+                    self._draw()
+
+    def _draw(self, finished=()):
+        # Finished jobs are printed once above the live block, which is redrawn in place.
+        parts = []
+        if self._lines > 1:
+            parts.append(f'\x1b[{self._lines - 1}F')
+        parts.append('\r\x1b[J')
+        parts.extend(line + '\n' for line in finished)
+        lines = [format_job(name, stats) for name, stats in self._jobs.values()]
+        parts.append('\n'.join(lines))
+        self._lines = len(lines)
+
+        output = self.output
+        output.write(''.join(parts))
+        output.flush()
@@ -0,0 +1,60 @@
+import random
+
+_MASK64 = (1 << 64) - 1
+_GEAR_RANDOM = random.Random(0x6765617268617368)
+_GEAR = tuple(_GEAR_RANDOM.getrandbits(64) for _ in range(256))
+
+
+class ContentDefinedChunker:
+    def __init__(self, min_size=2048, average_size=8192, max_size=65536, read_size=1024 * 1024):
+        if not 0 < min_size <= average_size <= max_size:
+            raise ValueError("Chunk sizes must satisfy 0 < min_size <= average_size <= max_size")
+        if average_size & (average_size - 1):
+            raise ValueError("Average chunk size must be a power of two")
+        self.min_size = min_size
+        self.average_size = average_size
+        self.max_size = max_size
+        self.read_size = max(read_size, max_size)
+        self._mask = (average_size - 1) << (64 - average_size.bit_length() + 1)
+
+    def cut_point(self, data):
+        length = len(data)
+        if length <= self.min_size:
+            return length
+
+        limit = min(length, self.max_size)
+        mask = self._mask
+        gear = _GEAR
+        fingerprint = 0
+        for i in range(self.min_size, limit):
+            fingerprint = ((fingerprint << 1) + gear[data[i]]) & _MASK64
+            if not fingerprint & mask:
+                return i + 1
+        return limit
+
+    def chunks(self, data: bytes):
+        view = memoryview(data)
+        while view:
+            cut = self.cut_point(view)
+            yield bytes(view[:cut])
+            view = view[cut:]
+
+    def iter_file(self, file_handler):
+        buffer = b''
+        start = 0
+        eof = False
+        while True:
+            if not eof and len(buffer) - start < self.max_size:
+                chunk = file_handler.read_chunk(self.read_size)
+                if chunk:
+                    buffer = buffer[start:] + chunk
+                    start = 0
+                    continue
+                eof = True
+
+            if start >= len(buffer):
+                return
+            view = memoryview(buffer)[start:]
+            cut = self.cut_point(view)
+            yield bytes(view[:cut])
+            start += cut
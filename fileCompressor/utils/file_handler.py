@@ -1,10 +1,14 @@
 import os
 from pathlib import Path
+from utils.io_tuning import DEFAULT_CHUNK_SIZE, tuned_chunk_size
 
 
 class FileHandler:
-    def __init__(self, chunk_size=8192):
-        self.chunk_size = chunk_size
+    def __init__(self, chunk_size=None, instrumentation=None):
+        # Without an explicit size, each opened file uses the calibrated chunk size of its mount.
+        self.chunk_size = DEFAULT_CHUNK_SIZE if chunk_size is None else chunk_size
+        self._auto_chunk_size = chunk_size is None
+        self.instrumentation = instrumentation
         self._current_file = None
         self._file_size = 0
 
@@ -17,6 +21,7 @@ class FileHandler:
         if value <= 0:
             raise ValueError("Chunk size must be positive")
         self._chunk_size = value
+        self._auto_chunk_size = False
 
     @property
     def file_size(self):
@@ -29,6 +34,8 @@ class FileHandler:
     def open_file(self, file_path: Path, mode='rb'):
         if self.is_open:
             self.close_file()
+        if self._auto_chunk_size:
+            self._chunk_size = tuned_chunk_size(file_path)
         try:
             self._current_file = open(file_path, mode)
             if 'r' in mode:
@@ -51,7 +58,12 @@ class FileHandler:
         if size is None:
             size = self.chunk_size
         try:
-            return self._current_file.read(size)
+            if self.instrumentation is None:
+                return self._current_file.read(size)
+            start_time = self.instrumentation.clock()
+            chunk = self._current_file.read(size)
+            self.instrumentation.record('read', self.instrumentation.clock() - start_time, len(chunk))
+            return chunk
         except Exception as e:
             raise IOError(f"Failed to read from file: {str(e)}")
 
@@ -59,11 +71,33 @@ class FileHandler:
         if not self.is_open or 'w' not in self._current_file.mode:
             raise IOError("File not open for writing")
         try:
+            if self.instrumentation is None:
+                self._current_file.write(chunk)
+                self._current_file.flush()
+                return
+            start_time = self.instrumentation.clock()
             self._current_file.write(chunk)
             self._current_file.flush()
+            self.instrumentation.record('write', self.instrumentation.clock() - start_time, len(chunk))
         except Exception as e:
             raise IOError(f"Failed to write to file: {str(e)}")
 
+    def seek(self, offset):
+        if not self.is_open:
+            raise IOError("File not open")
+        try:
+            return self._current_file.seek(offset)
+        except Exception as e:
+            raise IOError(f"Failed to seek in file: {str(e)}")
+
+    def truncate(self, size):
+        if not self.is_open or 'w' not in self._current_file.mode:
+            raise IOError("File not open for writing")
+        try:
+            self._current_file.truncate(size)
+        except Exception as e:
+            raise IOError(f"Failed to truncate file: {str(e)}")
+
     def __enter__(self):
         return self
 
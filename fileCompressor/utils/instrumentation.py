@@ -0,0 +1,59 @@
+import time
+
+
+def _bucket_label(bit_length):
+    if bit_length <= 1:
+        return '1'
+    return f"{1 << (bit_length - 1)}-{(1 << bit_length) - 1}"
+
+
+class Instrumentation:
+    clock = staticmethod(time.perf_counter)
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._stages = {}
+        self._counters = {}
+        self._histograms = {}
+
+    @property
+    def stages(self):
+        return self._stages
+
+    @property
+    def counters(self):
+        return self._counters
+
+    def record(self, stage, elapsed, num_bytes=0):
+        entry = self._stages.get(stage)
+        if entry is None:
+            entry = self._stages[stage] = {'time': 0.0, 'bytes': 0, 'calls': 0}
+        entry['time'] += elapsed
+        entry['bytes'] += num_bytes
+        entry['calls'] += 1
+
+    def count(self, name, value=1):
+        self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_counter(self, name, value):
+        self._counters[name] = value
+
+    def histogram(self, name, buckets=9):
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms[name] = [0] * buckets
+        return histogram
+
+    def report(self):
+        report = {
+            'stages': {stage: dict(entry) for stage, entry in self._stages.items()},
+            'counters': dict(self._counters)
+        }
+        if self._histograms:
+            report['histograms'] = {
+                name: {_bucket_label(bit_length): count for bit_length, count in enumerate(histogram) if count}
+                for name, histogram in self._histograms.items()
+            }
+        return report
@@ -0,0 +1,106 @@
+import json
+import os
+import time
+from pathlib import Path
+
+DEFAULT_CONFIG = Path.home() / '.filecompressor' / 'io_tuning.json'
+DEFAULT_CHUNK_SIZE = 8192
+CONFIG_VERSION = 1
+
+_mounts = {}
+_tuning = None
+
+
+def mount_point(path: Path):
+    path = Path(path).absolute()
+    while not path.exists():
+        path = path.parent
+    try:
+        device = path.stat().st_dev
+    except OSError:
+        return None
+    if device not in _mounts:
+        while not os.path.ismount(path) and path.parent != path:
+            path = path.parent
+        _mounts[device] = str(path)
+    return _mounts[device]
+
+
+class IOTuning:
+    def __init__(self, config_file: Path = DEFAULT_CONFIG):
+        self.config_file = Path(config_file)
+        self.mounts = {}
+        if self.config_file.exists():
+            try:
+                config = json.loads(self.config_file.read_text())
+            except (OSError, ValueError):
+                config = {}
+            if config.get('version') == CONFIG_VERSION:
+                self.mounts = config.get('mounts', {})
+
+    def lookup(self, path: Path, name, default):
+        if not self.mounts:
+            return default
+        return self.mounts.get(mount_point(path), {}).get(name, default)
+
+    def store(self, mount, parameters):
+        self.mounts[mount] = dict(parameters, calibrated_at=time.time())
+        self.config_file.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = self.config_file.with_name(f".{self.config_file.name}.{os.getpid()}.tmp")
+        temp_file.write_text(json.dumps({'version': CONFIG_VERSION, 'mounts': self.mounts}, indent=2))
+        os.replace(temp_file, self.config_file)
+
+
+def get_tuning():
+    # Loaded once per process; calibrate() stores new parameters into this instance, so later lookups see them.
+    global _tuning
+    if _tuning is None:
+        _tuning = IOTuning(os.environ.get('FILECOMPRESSOR_IO_TUNING', DEFAULT_CONFIG))
+    return _tuning
+
+
+def set_tuning(tuning):
+    global _tuning
+    _tuning = tuning
+
+
+def tuned_chunk_size(path: Path, default=DEFAULT_CHUNK_SIZE):
+    return get_tuning().lookup(path, 'chunk_size', default)
+
+
+def tuned_block_size(path: Path, default):
+    return get_tuning().lookup(path, 'block_size', default)
+
+
+def _drop_cache(fd):
+    if hasattr(os, 'posix_fadvise'):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+def measure_io(directory: Path, chunk_size, sample_size=16 * 1024 ** 2):
+    sample_file = Path(directory) / f".io_calibration.{os.getpid()}"
+    chunk = os.urandom(chunk_size)
+    try:
+        start_time = time.perf_counter()
+        with open(sample_file, 'wb') as f:
+            for _ in range(max(1, sample_size // chunk_size)):
+                f.write(chunk)
+                f.flush()
+            os.fsync(f.fileno())
+            _drop_cache(f.fileno())
+        write_time = time.perf_counter() - start_time
+        written = sample_file.stat().st_size
+
+        start_time = time.perf_counter()
+        with open(sample_file, 'rb') as f:
+            while f.read(chunk_size):
+                pass
+        read_time = time.perf_counter() - start_time
+    finally:
+        sample_file.unlink(missing_ok=True)
+
+    return {
+        'chunk_size': chunk_size,
+        'write_mbps': written / write_time / 1024 ** 2 if write_time > 0 else 0.0,
+        'read_mbps': written / read_time / 1024 ** 2 if read_time > 0 else 0.0
+    }
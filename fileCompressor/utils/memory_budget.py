@@ -0,0 +1,110 @@
+import os
+import re
+import sys
+
+MIN_MEMORY = 16 * 1024 ** 2
+MIN_BLOCK_SIZE = 64 * 1024
+# Rough working-set estimates: a block in flight holds the raw bytes, the encoded bytes and codec state
+# (LZW keeps a Python int per code), and each worker process pays for the interpreter and imports.
+BLOCK_OVERHEAD = 8
+WORKER_OVERHEAD = 32 * 1024 ** 2
+DELTA_INDEX_ENTRY = 128
+LZW_TABLE_SHARE = 4
+
+_UNITS = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+
+def parse_memory(value: str):
+    value = value.strip().upper().rstrip('B')
+    multiplier = _UNITS.get(value[-1:], 1)
+    number = value[:-1] if value[-1:] in _UNITS else value
+    try:
+        return int(float(number) * multiplier)
+    except ValueError:
+        raise ValueError(f"Invalid memory size: {value}")
+
+
+def _floor_power_of_two(value):
+    return 1 << (max(1, value).bit_length() - 1)
+
+
+def _ceil_power_of_two(value):
+    return 1 << max(0, (value - 1).bit_length())
+
+
+class MemoryBudget:
+    def __init__(self, max_memory):
+        if max_memory < MIN_MEMORY:
+            raise ValueError(f"Memory budget must be at least {MIN_MEMORY // 1024 ** 2} MB")
+        self.max_memory = max_memory
+
+    def block_size(self, default, in_flight=1):
+        limit = _floor_power_of_two(self.max_memory // (BLOCK_OVERHEAD * in_flight))
+        return max(MIN_BLOCK_SIZE, min(default, limit))
+
+    def max_pending(self, block_size, default):
+        return max(1, min(default, self.max_memory // (BLOCK_OVERHEAD * block_size)))
+
+    def parallel_plan(self, block_size, max_pending):
+        block_size = self.block_size(block_size, max_pending)
+        return block_size, self.max_pending(block_size, max_pending)
+
+    def workers(self, default=None):
+        default = default or os.cpu_count() or 1
+        return max(1, min(default, self.max_memory // (WORKER_OVERHEAD + BLOCK_OVERHEAD * MIN_BLOCK_SIZE)))
+
+    def max_payload(self, workers):
+        # Service requests are coded whole in memory, one per worker.
+        per_worker = self.max_memory // workers - WORKER_OVERHEAD
+        return max(MIN_BLOCK_SIZE, per_worker // BLOCK_OVERHEAD)
+
+    def lzw_table_bytes(self):
+        return self.max_memory // LZW_TABLE_SHARE
+
+    def delta_block_size(self, reference_size, default):
+        # One index entry per reference block; coarser blocks keep the index within a quarter of the budget.
+        needed = reference_size * DELTA_INDEX_ENTRY * 4 // self.max_memory
+        return max(default, _ceil_power_of_two(needed))
+
+
+def _status_peak():
+    try:
+        with open('/proc/self/status') as f:
+            match = re.search(r'VmHWM:\s+(\d+) kB', f.read())
+    except OSError:
+        return None
+    return int(match.group(1)) * 1024 if match else None
+
+
+def peak_rss():
+    peak = _status_peak()
+    if peak is not None:
+        return peak
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def reset_peak_rss():
+    # Linux lets a process reset its own high-water mark; elsewhere the peak covers the process lifetime.
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+class PeakMemory:
+    def __init__(self):
+        self.peak = None
+
+    def __enter__(self):
+        reset_peak_rss()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.peak = peak_rss()
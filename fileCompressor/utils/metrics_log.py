@@ -0,0 +1,138 @@
+import functools
+import json
+import os
+import socket
+import subprocess
+import time
+from pathlib import Path
+
+DEFAULT_LOG = Path.home() / '.filecompressor' / 'metrics.jsonl'
+GROUP_FIELDS = {'algorithm': 'algorithm', 'type': 'file_type', 'size': 'size_bucket', 'mode': 'mode',
+                'operation': 'operation', 'host': 'host', 'version': 'version'}
+SIZE_BUCKETS = ((64 * 1024, '<64K'), (1024 ** 2, '64K-1M'), (16 * 1024 ** 2, '1M-16M'),
+                (256 * 1024 ** 2, '16M-256M'), (1024 ** 3, '256M-1G'))
+
+
+def size_bucket(size):
+    for limit, label in SIZE_BUCKETS:
+        if size < limit:
+            return label
+    return '>=1G'
+
+
+def file_type(file_path: Path):
+    return Path(file_path).suffix.lower().lstrip('.') or '(none)'
+
+
+def file_magic(file_path: Path, length=4):
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read(length).hex()
+    except OSError:
+        return ''
+
+
+@functools.lru_cache(maxsize=None)
+def code_version():
+    version = os.environ.get('FILECOMPRESSOR_VERSION')
+    if version:
+        return version
+    try:
+        result = subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=Path(__file__).parent,
+                                capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return 'unknown'
+    return result.stdout.strip() if result.returncode == 0 and result.stdout.strip() else 'unknown'
+
+
+class MetricsLog:
+    def __init__(self, path: Path = DEFAULT_LOG):
+        self.path = Path(path)
+
+    def build_record(self, operation, algorithm, mode, input_file: Path, stats):
+        input_size = stats.get('original_size', 0) if operation == 'compress' else \
+            stats.get('compressed_size', stats.get('original_size', 0))
+        output_size = stats.get('compressed_size', 0) if operation == 'compress' else \
+            stats.get('decompressed_size', 0)
+        time_taken = stats.get('time_taken', 0)
+        raw_size = stats.get('original_size', 0) if operation == 'compress' else output_size
+
+        record = {
+            'timestamp': time.time(),
+            'host': socket.gethostname(),
+            'version': code_version(),
+            'operation': operation,
+            'algorithm': algorithm or 'auto',
+            'mode': mode,
+            'file_type': file_type(input_file),
+            'magic': file_magic(input_file) if operation == 'compress' else '',
+            'size_bucket': size_bucket(raw_size),
+            'input_size': input_size,
+            'output_size': output_size,
+            'compression_ratio': stats.get('compression_ratio', 0),
+            'time_taken': time_taken,
+            'throughput': raw_size / time_taken / 1024 ** 2 if time_taken > 0 else 0.0
+        }
+        for key in ('cache_hit', 'cancelled', 'reason', 'stages'):
+            if key in stats:
+                record[key] = stats[key]
+        return record
+
+    def append(self, record):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One write per line on an O_APPEND file keeps concurrent writers from interleaving records.
+        line = (json.dumps(record, separators=(',', ':')) + '\n').encode('utf-8')
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+
+    def record(self, operation, algorithm, mode, input_file: Path, stats):
+        record = self.build_record(operation, algorithm, mode, input_file, stats)
+        self.append(record)
+        return record
+
+    def records(self):
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a torn last line from a crashed writer
+
+    def summarize(self, group_by=('algorithm', 'type', 'size'), operation=None):
+        fields = []
+        for name in group_by:
+            if name not in GROUP_FIELDS:
+                raise ValueError(f"Unknown history grouping: {name}")
+            fields.append(GROUP_FIELDS[name])
+
+        groups = {}
+        for record in self.records():
+            if record.get('cancelled') or (operation and record.get('operation') != operation):
+                continue
+            key = tuple(record.get(field, '') for field in fields)
+            group = groups.setdefault(key, {'operations': 0, 'bytes': 0, 'time': 0.0, 'ratio': 0.0})
+            group['operations'] += 1
+            raw_size = record['input_size'] if record['operation'] == 'compress' else record['output_size']
+            group['bytes'] += raw_size
+            group['time'] += record.get('time_taken', 0)
+            group['ratio'] += record.get('compression_ratio', 0)
+
+        summary = []
+        for key, group in sorted(groups.items()):
+            row = dict(zip(group_by, key))
+            row.update({
+                'operations': group['operations'],
+                'total_size': group['bytes'],
+                'throughput': group['bytes'] / group['time'] / 1024 ** 2 if group['time'] > 0 else 0.0,
+                'compression_ratio': group['ratio'] / group['operations']
+            })
+            summary.append(row)
+        return summary
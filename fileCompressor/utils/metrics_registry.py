@@ -0,0 +1,243 @@
+import bisect
+import os
+import threading
+from pathlib import Path
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.005, 0.025, 0.1, 0.5, 1.0, 5.0, 30.0, 120.0, 600.0)
+LOCAL_HOSTS = ('127.0.0.1', 'localhost', '::1')
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield self.name, list(zip(self.label_names, key)), value
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def count(self, **labels):
+        counts, _ = self._values.get(self._key(labels), ((), 0.0))
+        return sum(counts)
+
+    def samples(self):
+        with self._lock:
+            items = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        for key, (counts, total) in items:
+            labels = list(zip(self.label_names, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                yield f"{self.name}_bucket", labels + [('le', _format_value(bound))], cumulative
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, cumulative
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, metric_class, name, help_text, labels, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = metric_class(name, help_text, labels, **kwargs)
+                self._metrics[name] = metric
+            elif type(metric) is not metric_class or metric.label_names != tuple(labels):
+                raise ValueError(f"Metric {name} is already registered with a different type or labels")
+            return metric
+
+    def counter(self, name, help_text, labels=()):
+        return self._get_or_create(Counter, name, help_text, labels)
+
+    def gauge(self, name, help_text, labels=()):
+        return self._get_or_create(Gauge, name, help_text, labels)
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_LATENCY_BUCKETS):
+        return self._get_or_create(Histogram, name, help_text, labels, buckets=buckets)
+
+    def render(self):
+        lines = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+    def dump(self, file_path: Path):
+        file_path = Path(file_path)
+        temp_path = file_path.with_name(f".{file_path.name}.{os.getpid()}.tmp")
+        temp_path.write_text(self.render())
+        os.replace(temp_path, file_path)
+        return file_path
+
+    def dump_every(self, file_path: Path, interval=15.0):
+        stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                try:
+                    self.dump(file_path)
+                except OSError:
+                    pass  # the next interval retries; the exporter must not take the process down
+            self.dump(file_path)
+        threading.Thread(target=run, daemon=True).start()
+        return stop
+
+    def serve(self, port=9464, host='127.0.0.1'):
+        if host not in LOCAL_HOSTS:
+            raise ValueError(f"Metrics endpoint must listen on localhost, got: {host}")
+        # Imported here so loading the registry does not pull http.server into every CLI start.
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+class CompressionMetrics:
+    def __init__(self, registry=None):
+        self.registry = registry or MetricsRegistry()
+        operation_labels = ('operation', 'algorithm')
+        self.operations = self.registry.counter(
+            'filecompressor_operations_total', "Completed operations.", operation_labels)
+        self.errors = self.registry.counter(
+            'filecompressor_errors_total', "Failed or cancelled operations.", operation_labels + ('reason',))
+        self.bytes_in = self.registry.counter(
+            'filecompressor_bytes_in_total', "Bytes read by completed operations.", operation_labels)
+        self.bytes_out = self.registry.counter(
+            'filecompressor_bytes_out_total', "Bytes written by completed operations.", operation_labels)
+        self.latency = self.registry.histogram(
+            'filecompressor_operation_seconds', "Operation latency.", operation_labels)
+        self.cache_requests = self.registry.counter(
+            'filecompressor_cache_requests_total', "Result cache lookups.", ('result',))
+        self.progress = self.registry.counter(
+            'filecompressor_progress_bytes_total', "Input bytes processed, including running operations.",
+            ('operation',))
+        self.in_flight = self.registry.gauge(
+            'filecompressor_operations_in_flight', "Operations currently running.", ('operation',))
+
+    def progress_listener(self, operation):
+        # Called once per chunk or block by ProgressTracker, never per byte.
+        last = [0]
+
+        def listener(stats):
+            delta = stats.bytes_processed - last[0]
+            last[0] = stats.bytes_processed
+            if delta > 0:
+                self.progress.inc(delta, operation=operation)
+        return listener
+
+    def observe(self, operation, algorithm, stats):
+        algorithm = algorithm or 'auto'
+        if operation == 'compress':
+            bytes_in, bytes_out = stats.get('original_size', 0), stats.get('compressed_size', 0)
+        else:
+            bytes_in = stats.get('compressed_size', stats.get('original_size', 0))
+            bytes_out = stats.get('decompressed_size', 0)
+        self.operations.inc(operation=operation, algorithm=algorithm)
+        self.bytes_in.inc(bytes_in, operation=operation, algorithm=algorithm)
+        self.bytes_out.inc(bytes_out, operation=operation, algorithm=algorithm)
+        self.latency.observe(stats.get('time_taken', 0), operation=operation, algorithm=algorithm)
+        if 'cache_hit' in stats:
+            self.cache_requests.inc(result='hit' if stats['cache_hit'] else 'miss')
+
+    def error(self, operation, algorithm, reason):
+        self.errors.inc(operation=operation, algorithm=algorithm or 'auto', reason=reason)
@@ -0,0 +1,168 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+
+class OperationProfiler:
+    def __init__(self, sample_interval: Optional[float] = None, memory_poll_interval=0.05, trace_frames=1):
+        if sample_interval is not None and sample_interval <= 0:
+            raise ValueError("Sample interval must be positive")
+        self.sample_interval = sample_interval
+        self.memory_poll_interval = memory_poll_interval
+        self.trace_frames = trace_frames
+
+        self._profile = None
+        self._samples = Counter()
+        self._inclusive_samples = Counter()
+        self._sample_count = 0
+        self._peak_snapshot = None
+        self._peak_memory = 0
+        self._stop_event = threading.Event()
+        self._threads = []
+        self._target_thread = None
+        self._started_tracemalloc = False
+
+    @property
+    def sampling(self):
+        return self.sample_interval is not None
+
+    @property
+    def peak_memory(self):
+        return self._peak_memory
+
+    def start(self):
+        self._target_thread = threading.get_ident()
+        self._stop_event.clear()
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.trace_frames)
+            self._started_tracemalloc = True
+        tracemalloc.reset_peak()
+        self._start_thread(self._poll_memory)
+
+        if self.sampling:
+            self._start_thread(self._sample_stacks)
+        else:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def stop(self):
+        if self._profile is not None:
+            self._profile.disable()
+
+        self._stop_event.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads.clear()
+
+        self._peak_memory = max(self._peak_memory, tracemalloc.get_traced_memory()[1])
+        if self._peak_snapshot is None:
+            self._peak_snapshot = tracemalloc.take_snapshot()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def _start_thread(self, target):
+        thread = threading.Thread(target=target, daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    def _poll_memory(self):
+        snapshot_level = 0
+        while not self._stop_event.wait(self.memory_poll_interval):
+            current, peak = tracemalloc.get_traced_memory()
+            self._peak_memory = max(self._peak_memory, peak)
+            if current > snapshot_level * 1.1:
+                self._peak_snapshot = tracemalloc.take_snapshot()
+                snapshot_level = current
+
+    def _sample_stacks(self):
+        while not self._stop_event.wait(self.sample_interval):
+            frame = sys._current_frames().get(self._target_thread)
+            if frame is None:
+                continue
+            self._sample_count += 1
+            self._samples[self._frame_label(frame)] += 1
+            seen = set()
+            while frame is not None:
+                label = self._frame_label(frame)
+                if label not in seen:
+                    self._inclusive_samples[label] += 1
+                    seen.add(label)
+                frame = frame.f_back
+
+    def _frame_label(self, frame):
+        code = frame.f_code
+        return f"{os.path.basename(code.co_filename)}:{code.co_firstlineno}({code.co_name})"
+
+    def hotspots(self, top=10):
+        if self.sampling:
+            total = self._sample_count or 1
+            return [
+                {'function': label, 'samples': count, 'self_percent': count / total * 100,
+                 'total_percent': self._inclusive_samples[label] / total * 100}
+                for label, count in self._samples.most_common(top)
+            ]
+
+        if self._profile is None:
+            return []
+        stats = pstats.Stats(self._profile)
+        entries = []
+        for (filename, line, name), (_, calls, self_time, cumulative, _) in stats.stats.items():
+            entries.append({'function': f"{os.path.basename(filename)}:{line}({name})", 'calls': calls,
+                            'self_time': self_time, 'cumulative_time': cumulative})
+        entries.sort(key=lambda entry: entry['self_time'], reverse=True)
+        return entries[:top]
+
+    def allocation_sites(self, top=10):
+        if self._peak_snapshot is None:
+            return []
+        snapshot = self._peak_snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, threading.__file__),
+        ))
+        return [
+            {'location': f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+             'size': stat.size, 'count': stat.count}
+            for stat in snapshot.statistics('lineno')[:top]
+        ]
+
+    def dump_stats(self, output_file: Path):
+        if self._profile is None:
+            raise ValueError("Profile statistics are only available without sampling")
+        self._profile.dump_stats(str(output_file))
+
+    def format_report(self, top=10):
+        output = io.StringIO()
+        if self.sampling:
+            output.write(f"\nTop hotspots ({self._sample_count} samples every "
+                         f"{self.sample_interval * 1000:.0f} ms):\n")
+            for entry in self.hotspots(top):
+                output.write(f"  {entry['self_percent']:6.2f}% self {entry['total_percent']:6.2f}% total  "
+                             f"{entry['function']}\n")
+        else:
+            output.write("\nTop hotspots (by self time):\n")
+            for entry in self.hotspots(top):
+                output.write(f"  {entry['self_time']:8.4f}s self {entry['cumulative_time']:8.4f}s cumulative "
+                             f"{entry['calls']:>9} calls  {entry['function']}\n")
+
+        output.write(f"\nPeak traced memory: {self._peak_memory} bytes\n")
+        output.write("Top allocation sites near peak:\n")
+        for entry in self.allocation_sites(top):
+            output.write(f"  {entry['size']:>12} bytes {entry['count']:>8} blocks  {entry['location']}\n")
+        return output.getvalue()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
@@ -1,8 +1,36 @@
+import threading
 import time
 from typing import Optional, Callable
 from dataclasses import dataclass
 
 
+class OperationCancelled(Exception):
+    def __init__(self, reason, bytes_processed, total_bytes):
+        super().__init__(f"Operation stopped ({reason}) after {bytes_processed}/{total_bytes} bytes")
+        self.reason = reason
+        self.bytes_processed = bytes_processed
+        self.total_bytes = total_bytes
+        self.stats = {}
+
+    def __reduce__(self):
+        return OperationCancelled, (self.reason, self.bytes_processed, self.total_bytes)
+
+
+class CancellationToken:
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason = None
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self, reason='cancelled'):
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+
 @dataclass
 class ProgressStats:
     bytes_processed: int = 0
@@ -35,7 +63,8 @@ class ProgressStats:
 
 
 class ProgressTracker:
-    def __init__(self, total_bytes, callback: Optional[Callable] = None):
+    def __init__(self, total_bytes, callback: Optional[Callable] = None,
+                 token: Optional[CancellationToken] = None, deadline: Optional[float] = None):
         if total_bytes <= 0:
             raise ValueError("Total bytes must be positive")
 
@@ -45,11 +74,18 @@ class ProgressTracker:
             current_time=time.time()
         )
         self._callback = callback
+        self.token = token
+        self.deadline = deadline
+        self._listeners = []
 
     @property
     def stats(self):
         return self._stats
 
+    def add_listener(self, listener: Callable):
+        # Listeners see every update alongside the display callback, e.g. to feed live metrics.
+        self._listeners.append(listener)
+
     def update(self, bytes_processed):
         if bytes_processed < 0:
             raise ValueError("Bytes processed cannot be negative")
@@ -61,6 +97,19 @@ class ProgressTracker:
 
         if self._callback:
             self._callback(self._stats)
+        for listener in self._listeners:
+            listener(self._stats)
+        self.check()
+
+    def check(self):
+        # Codecs report progress once per chunk or block, so this is where they stop cooperatively.
+        if self.token is not None and self.token.cancelled:
+            reason = self.token.reason
+        elif self.deadline is not None and time.time() >= self.deadline:
+            reason = 'deadline exceeded'
+        else:
+            return
+        raise OperationCancelled(reason, self._stats.bytes_processed, self._stats.total_bytes)
 
     def format_progress(self):
         stats = self.stats
@@ -0,0 +1,138 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+INDEX_FILE = 'index.json'
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_FICLONE = 0x40049409
+
+
+def clone_file(source: Path, destination: Path):
+    try:
+        import fcntl
+        with open(source, 'rb') as src, open(destination, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+        return 'reflink'
+    except (ImportError, OSError):
+        shutil.copyfile(source, destination)
+        return 'copy'
+
+
+def hash_file(file_path: Path):
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, 'rb') as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory: Path, max_bytes=DEFAULT_MAX_BYTES):
+        if max_bytes <= 0:
+            raise ValueError("Cache size must be positive")
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._index_path = self.directory / INDEX_FILE
+        self._entries = {}
+        self._fingerprints = {}
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    @property
+    def total_bytes(self):
+        return sum(entry['size'] for entry in self._entries.values())
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _load(self):
+        if not self._index_path.exists():
+            return
+        try:
+            index = json.loads(self._index_path.read_text())
+            self._entries = index.get('entries', {})
+            self._fingerprints = index.get('fingerprints', {})
+        except (OSError, ValueError):
+            self._entries = {}
+            self._fingerprints = {}
+
+    def _save(self):
+        temp_path = self._index_path.with_suffix('.tmp')
+        temp_path.write_text(json.dumps({'entries': self._entries, 'fingerprints': self._fingerprints}))
+        os.replace(temp_path, self._index_path)
+
+    def content_hash(self, file_path: Path):
+        stat = file_path.stat()
+        fingerprint = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+        path_key = str(file_path.resolve())
+
+        known = self._fingerprints.get(path_key)
+        if known is not None and known['fingerprint'] == fingerprint:
+            return known['digest']
+
+        digest = hash_file(file_path)
+        self._fingerprints[path_key] = {'fingerprint': fingerprint, 'digest': digest}
+        return digest
+
+    def make_key(self, digest, algorithm, parameters=None):
+        description = json.dumps([digest, algorithm, parameters or {}], sort_keys=True)
+        return hashlib.blake2b(description.encode('utf-8'), digest_size=20).hexdigest()
+
+    def lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None or not (self.directory / entry['file']).exists():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        entry['last_access'] = time.time()
+        self.hits += 1
+        self._save()
+        return self.directory / entry['file'], dict(entry['stats'])
+
+    def store(self, key, compressed_file: Path, stats: dict):
+        size = compressed_file.stat().st_size
+        if size > self.max_bytes:
+            self._save()
+            return False
+
+        file_name = f"{key}.bin"
+        clone_file(compressed_file, self.directory / file_name)
+        self._entries[key] = {
+            'file': file_name,
+            'size': size,
+            'last_access': time.time(),
+            'stats': {name: value for name, value in stats.items() if isinstance(value, (int, float, str))}
+        }
+        self._evict(keep=key)
+        self._save()
+        return True
+
+    def _evict(self, keep=None):
+        total = self.total_bytes
+        for key, entry in sorted(self._entries.items(), key=lambda item: item[1]['last_access']):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            (self.directory / entry['file']).unlink(missing_ok=True)
+            del self._entries[key]
+            total -= entry['size']
+
+    def clear(self):
+        for entry in self._entries.values():
+            (self.directory / entry['file']).unlink(missing_ok=True)
+        self._entries = {}
+        self._fingerprints = {}
+        self._save()
@@ -0,0 +1,52 @@
+import errno
+import os
+from pathlib import Path
+
+SEEK_DATA = getattr(os, 'SEEK_DATA', None)
+SEEK_HOLE = getattr(os, 'SEEK_HOLE', None)
+
+
+def has_holes(file_path: Path):
+    if SEEK_HOLE is None:
+        return False
+    stat = os.stat(file_path)
+    # Fewer allocated blocks than bytes is only a hint: compressing and deduplicating filesystems (btrfs, zfs)
+    # report it for ordinary files too. A hole before EOF confirms it.
+    if getattr(stat, 'st_blocks', None) is None or stat.st_blocks * 512 >= stat.st_size:
+        return False
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        return os.lseek(fd, 0, SEEK_HOLE) < stat.st_size
+    except OSError:
+        return False  # the filesystem does not report holes
+    finally:
+        os.close(fd)
+
+
+def data_extents(file_path: Path):
+    size = os.path.getsize(file_path)
+    if SEEK_DATA is None:
+        if size:
+            yield 0, size
+        return
+
+    fd = os.open(file_path, os.O_RDONLY)
+    try:
+        offset = 0
+        while offset < size:
+            try:
+                start = os.lseek(fd, offset, SEEK_DATA)
+                end = min(os.lseek(fd, start, SEEK_HOLE), size)
+            except OSError as e:
+                if e.errno == errno.ENXIO:
+                    return  # only a trailing hole is left
+                if e.errno != errno.EINVAL:
+                    raise
+                # The filesystem does not report holes; treat the rest as data.
+                yield offset, size - offset
+                return
+            if end > start:
+                yield start, end - start
+            offset = end
+    finally:
+        os.close(fd)